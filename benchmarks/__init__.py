@@ -0,0 +1 @@
+"""OpenBB Swaps Benchmarks."""
@@ -0,0 +1,101 @@
+"""Scaled-Up Benchmark Datasets.
+
+A dataset of `scale` times the history is the bundled data repeated `scale` times,
+each copy shifted back in time by the date range of its currency, so the copies
+follow each other without overlapping. It is written as a snapshot, built from the
+bundled archive, and reused while the archive is unchanged.
+"""
+
+from pathlib import Path
+from typing import Iterator
+
+
+def _scale_frames(frames: dict, scale: int) -> Iterator:
+    """Repeat the sheets of a currency back in time, oldest copy first."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_swaps.data.frames import normalize_frame
+    from pandas import Timedelta, concat
+
+    date_columns = {
+        sheet_name: [col for col in df.columns if df[col].dtype.kind == "M"]
+        for sheet_name, df in frames.items()
+    }
+    dates = [
+        df[col].dropna()
+        for sheet_name, df in frames.items()
+        for col in date_columns[sheet_name]
+    ]
+    dates = [values for values in dates if len(values) > 0]
+    span = (
+        max(values.max() for values in dates)
+        - min(values.min() for values in dates)
+        + Timedelta(days=1)
+        if dates
+        else Timedelta(0)
+    )
+
+    for sheet_name, df in frames.items():
+        copies = [
+            df.assign(**{col: df[col] - span * i for col in date_columns[sheet_name]})
+            for i in range(scale - 1, -1, -1)
+        ]
+        yield sheet_name, normalize_frame(concat(copies, ignore_index=True))
+
+
+def scaled_snapshot(scale: int, output: Path) -> Path:
+    """Build the snapshot of the bundled data at `scale` times its history, if missing.
+
+    Parameters
+    ----------
+    scale : int
+        The number of copies of the history.
+    output : Path
+        The directory of the snapshot.
+
+    Returns
+    -------
+    Path
+        The directory of the snapshot.
+    """
+    # pylint: disable=import-outside-toplevel
+    import json
+
+    from openbb_store.store import Store
+    from openbb_swaps.data.frames import normalize_frame
+    from openbb_swaps.data.snapshot import (
+        MANIFEST_NAME,
+        archive_digest,
+        archive_path,
+        write_snapshot,
+    )
+
+    output = Path(output)
+    source = {
+        "name": archive_path.name,
+        "sha256": archive_digest(archive_path),
+        "modified": archive_path.stat().st_mtime,
+        "scale": scale,
+    }
+    try:
+        with open(output / MANIFEST_NAME, encoding="utf-8") as f:
+            built = json.load(f)["source"]
+        if built == source:
+            return output
+    except (OSError, ValueError, KeyError):
+        pass
+
+    store = Store(str(archive_path.with_suffix("")))
+
+    def sheets() -> Iterator:
+        for store_key in store.list_stores:
+            frames = {
+                sheet_name: normalize_frame(
+                    store.get_store(store_key, sheet_name=sheet_name)
+                )
+                for sheet_name in store.get_store(store_key).sheet_names
+            }
+            for sheet_name, df in _scale_frames(frames, scale):
+                yield store_key, sheet_name, df
+
+    write_snapshot(output, source, sheets())
+    return output
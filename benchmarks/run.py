@@ -0,0 +1,388 @@
+"""Benchmark the data endpoints in-process, through the ASGI app.
+
+Each endpoint is requested over the full grid of its parameters: every currency,
+swap type, period, tenor, bucket and stat, and the latest dates of the date options.
+The time series are also requested over their whole history at every frequency.
+The grid is requested once to load the data, then timed over `--repeat` rounds.
+A last round traces the memory allocated by each request.
+
+Reports, per endpoint, the p50 and p99 latency, the peak bytes allocated by a request,
+and the peak RSS of the process after the endpoint ran.
+
+Run from the repository root:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scale 10 --output results.json
+    python -m benchmarks.run --baseline results.json
+
+With `--baseline`, the results are compared to a saved run and the command exits
+with status 1 when a metric regressed by more than `--threshold`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import product
+from pathlib import Path
+from typing import get_args
+
+COMPARED_METRICS = ["p50_ms", "p99_ms", "alloc_peak_bytes"]
+
+
+def _choices(annotation) -> list:
+    """Get the choices of a Literal query parameter type."""
+    return list(get_args(get_args(annotation)[0]))
+
+
+def _percentile(values: list, q: float) -> float:
+    """Get a percentile of a list of values, by linear interpolation."""
+    # pylint: disable=import-outside-toplevel
+    from numpy import percentile
+
+    return float(percentile(values, q)) if values else 0.0
+
+
+def _peak_rss() -> int:
+    """Get the peak resident set size of the process, in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+async def _options(client, path: str, params: dict, limit: int) -> list:
+    """Get the first values of an options endpoint."""
+    response = await client.get(path, params=params)
+    if response.status_code != 200:
+        return []
+    return [option["value"] for option in response.json()][:limit]
+
+
+async def build_grid(client, dates: int) -> dict:
+    """Build the requests of each endpoint, as (path, params) pairs."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_swaps.data.options import SWAP_VOLUME_BUCKETS
+    from openbb_swaps.models.query_params import (
+        SWAP_TENOR_CHOICES,
+        SwapCurrency,
+        SwapCurveMeasures,
+        SwapCurveMethods,
+        SwapCurveTypes,
+        SwapRateFrequency,
+        SwapRatePeriod,
+        SwapTypes,
+        SwapVolumeTypes,
+    )
+
+    currencies = _choices(SwapCurrency)
+    swap_types = _choices(SwapTypes)
+    curve_types = _choices(SwapCurveTypes)
+    periods = _choices(SwapRatePeriod)
+    stats = _choices(SwapVolumeTypes)
+    # The whole history, downsampled, like a long-range chart requests it.
+    frequencies = _choices(SwapRateFrequency)
+    history = {"start_date": "1900-01-01"}
+    tenors = [choice["value"] for choice in SWAP_TENOR_CHOICES] + [
+        "2s10s,1s5s",
+        "1,2,5,10,30",
+        "3s7s",
+    ]
+    buckets = SWAP_VOLUME_BUCKETS + ["7-10,10-15", ",".join(SWAP_VOLUME_BUCKETS)]
+
+    grid: dict = {
+        "/swap_rate_levels/tenors": [
+            ("/swap_rate_levels/tenors", {"currency": c, "swap_type": s})
+            for c, s in product(currencies, swap_types)
+        ],
+        "/swap_rate_volume/buckets": [
+            ("/swap_rate_volume/buckets", {"currency": c}) for c in currencies
+        ],
+        "/trade_distribution/dates": [
+            ("/trade_distribution/dates", {"currency": c, "swap_type": s})
+            for c, s in product(currencies, swap_types)
+        ],
+        "/swap_trades/dates": [
+            ("/swap_trades/dates", {"currency": c}) for c in currencies
+        ],
+        "/swap_curve/dates": [
+            ("/swap_curve/dates", {"currency": c, "swap_type": s})
+            for c, s in product(currencies, curve_types)
+        ],
+        "/swap_rate_levels": [
+            (
+                "/swap_rate_levels",
+                {"currency": c, "swap_type": s, "tenor": t, "period": p},
+            )
+            for c, s, t, p in product(currencies, swap_types, tenors, periods)
+        ]
+        + [
+            (
+                "/swap_rate_levels",
+                {"currency": c, "swap_type": s, "tenor": "2s10s,1s5s", "frequency": f}
+                | history,
+            )
+            for c, s, f in product(currencies, swap_types, frequencies)
+        ],
+        "/swap_rate_volume": [
+            (
+                "/swap_rate_volume",
+                {"currency": c, "stat": s, "bucket": b, "period": p},
+            )
+            for c, s, b, p in product(currencies, stats, buckets, periods)
+        ]
+        + [
+            (
+                "/swap_rate_volume",
+                {"currency": c, "stat": s, "bucket": "7-10", "frequency": f} | history,
+            )
+            for c, s, f in product(currencies, stats, frequencies)
+        ],
+        "/trade_distribution": [],
+        "/swap_trades": [],
+        "/swap_curve": [],
+    }
+
+    for c, s in product(currencies, swap_types):
+        for date in await _options(
+            client, "/trade_distribution/dates", {"currency": c, "swap_type": s}, dates
+        ):
+            grid["/trade_distribution"].extend(
+                (
+                    "/trade_distribution",
+                    {"currency": c, "swap_type": s, "stat": stat, "date": date},
+                )
+                for stat in stats
+            )
+
+    for c in currencies:
+        for date in await _options(
+            client, "/swap_trades/dates", {"currency": c}, dates
+        ):
+            grid["/swap_trades"].extend(
+                (
+                    "/swap_trades",
+                    {
+                        "currency": c,
+                        "date": date,
+                        "cleared_only": cleared,
+                        "include_starting": starting,
+                    },
+                )
+                for cleared, starting in product([True, False], repeat=2)
+            )
+
+    for c, s in product(currencies, curve_types):
+        curve_dates = await _options(
+            client, "/swap_curve/dates", {"currency": c, "swap_type": s}, dates
+        )
+        if curve_dates:
+            grid["/swap_curve"].extend(
+                (
+                    "/swap_curve",
+                    {
+                        "currency": c,
+                        "swap_type": s,
+                        "date": ",".join(curve_dates),
+                        "method": m,
+                        "measure": r,
+                        "points": 1000,
+                    },
+                )
+                for m, r in product(
+                    _choices(SwapCurveMethods), _choices(SwapCurveMeasures)
+                )
+            )
+
+    return grid
+
+
+async def run_endpoint(client, requests: list, repeat: int) -> dict:
+    """Request an endpoint over its grid, and measure its latency and allocations."""
+    for path, params in requests:
+        await client.get(path, params=params)
+
+    latencies: list = []
+    errors = 0
+    for _ in range(repeat):
+        for path, params in requests:
+            start = time.perf_counter()
+            response = await client.get(path, params=params)
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += response.status_code != 200
+
+    allocations: list = []
+    tracemalloc.start()
+    try:
+        for path, params in requests:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            await client.get(path, params=params)
+            allocations.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "mean_ms": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+        "p50_ms": round(_percentile(latencies, 50), 4),
+        "p99_ms": round(_percentile(latencies, 99), 4),
+        "alloc_peak_bytes": int(max(allocations, default=0)),
+        "alloc_p50_bytes": int(_percentile(allocations, 50)),
+        "peak_rss_bytes": _peak_rss(),
+    }
+
+
+async def run_benchmarks(args) -> dict:
+    """Run the benchmarks of the selected endpoints."""
+    # pylint: disable=import-outside-toplevel
+    from httpx import ASGITransport, AsyncClient
+    from openbb_swaps.app.app import app
+    from openbb_swaps.app.compute import executors
+    from openbb_swaps.data.store import get_swaps_store
+
+    transport = ASGITransport(app=app, raise_app_exceptions=False)
+    results: dict = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "repeat": args.repeat,
+            "dates": args.dates,
+            "data_version": get_swaps_store().data_version,
+        },
+        "endpoints": {},
+    }
+
+    try:
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            grid = await build_grid(client, args.dates)
+            for endpoint, requests in grid.items():
+                if args.endpoint and endpoint not in args.endpoint:
+                    continue
+                if not requests:
+                    continue
+                result = await run_endpoint(client, requests, args.repeat)
+                results["endpoints"][endpoint] = result
+                print(  # noqa: T201
+                    f"{endpoint:<28} {result['requests']:>6} requests"
+                    f"  p50 {result['p50_ms']:>9.3f} ms"
+                    f"  p99 {result['p99_ms']:>9.3f} ms"
+                    f"  alloc {result['alloc_peak_bytes'] / (1 << 20):>8.2f} MB"
+                    f"  rss {result['peak_rss_bytes'] / (1 << 20):>8.1f} MB"
+                    + (f"  errors {result['errors']}" if result["errors"] else "")
+                )
+    finally:
+        for executor in executors.values():
+            executor.shutdown()
+
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Compare the results to a baseline, and list the metrics that regressed."""
+    regressions: list = []
+    for key in ["scale", "repeat", "dates"]:
+        if baseline.get("meta", {}).get(key) != results["meta"][key]:
+            print(  # noqa: T201
+                f"The baseline was run with {key} {baseline.get('meta', {}).get(key)},"
+                f" not {results['meta'][key]}."
+            )
+    for endpoint, result in results["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(endpoint)
+        if base is None:
+            continue
+        for metric in COMPARED_METRICS:
+            before, after = base.get(metric), result.get(metric)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            flag = "REGRESSED" if change > threshold else ""
+            print(  # noqa: T201
+                f"{endpoint:<28} {metric:<18} {before:>14.3f} -> {after:>14.3f}"
+                f"  {change:>+8.1%} {flag}"
+            )
+            if flag:
+                regressions.append((endpoint, metric, before, after))
+    return regressions
+
+
+def main():
+    """Run the benchmarks from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the OpenBB Swaps endpoints through the ASGI app."
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=1,
+        help="Times the bundled history to serve, like 10 or 100. Default is 1.",
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=str(Path(tempfile.gettempdir()) / "openbb-swaps-benchmarks"),
+        help="Directory of the scaled-up snapshots, reused between runs.",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed rounds over the grid."
+    )
+    parser.add_argument(
+        "--dates",
+        type=int,
+        default=3,
+        help="Latest dates requested from each date options list. Default is 3.",
+    )
+    parser.add_argument(
+        "--endpoint",
+        action="append",
+        help="Benchmark only this endpoint path. Can be repeated.",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Keep the response cache enabled. It is disabled by default.",
+    )
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare to the results in this JSON file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Relative increase of a metric counted as a regression. Default is 0.25.",
+    )
+    args = parser.parse_args()
+
+    # The data and the app are configured from the environment on import.
+    if not args.cache:
+        os.environ["OPENBB_SWAPS_RESPONSE_CACHE_SIZE"] = "0"
+    if args.scale > 1:
+        # pylint: disable=import-outside-toplevel
+        from benchmarks.datasets import scaled_snapshot
+
+        data_path = Path(args.data_dir) / f"scale-{args.scale}"
+        os.environ["OPENBB_SWAPS_SNAPSHOT_PATH"] = str(data_path)
+        scaled_snapshot(args.scale, data_path)
+
+    results = asyncio.run(run_benchmarks(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metrics regressed.")  # noqa: T201
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,59 @@
 """Main application and entry point."""
 
-from dateutil.relativedelta import relativedelta
+import asyncio
+import hmac
 import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from itertools import chain
 from pathlib import Path
+from typing import Annotated, Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from openbb_core.app.model.abstract.error import OpenBBError
-from openbb_swaps.data.store import SwapsStore
+from openbb_swaps.app import handlers
+from openbb_swaps.app.batch import run_batch
+from openbb_swaps.app.cache import ResponseCacheMiddleware, cache_from_environment
+from openbb_swaps.app.compute import event_loop_lag, executors, get_executor
+from openbb_swaps.app.responses import (
+    ndjson_response,
+    negotiate_format,
+    records_response,
+    require_pyarrow,
+    table_content,
+    table_response,
+)
+from openbb_swaps.app.timing import (
+    TIMING_ENABLED,
+    TimingMiddleware,
+    span,
+    stage_histograms,
+)
+from openbb_swaps.data.store import (
+    SwapsStore,
+    get_swaps_store,
+    refresh_swaps_store,
+    store_handle,
+)
+from openbb_swaps.data.volume import SwapVolumeCube
 from openbb_swaps.models.query_params import (
-    SWAP_TENOR_CHOICES,
+    BatchQueries,
+    ResponseFormat,
     SwapCurrency,
+    SwapCurveDates,
+    SwapCurveMaturities,
+    SwapCurveMeasures,
+    SwapCurveMethods,
+    SwapCurvePoints,
+    SwapCurveTypes,
     SwapRateTenors,
     SwapTypes,
+    SwapRateEndDate,
+    SwapRateFrequency,
     SwapRatePeriod,
+    SwapRateStartDate,
     SwapTenorBuckets,
     SwapTradeDistributionDates,
     SwapTradesClearedOnly,
@@ -21,15 +62,110 @@ from openbb_swaps.models.query_params import (
     SwapVolumeTypes,
 )
 from openbb_swaps.models.response_models import (
+    BatchResult,
+    SwapCurveResponseModel,
     SwapRateLevelsResponseModel,
     SwapRateVolumeResponseModel,
     SwapTradesResponseModel,
     TradeDistributionResponseModel,
 )
-from numpy import nan
-from pandas import concat, to_datetime
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+async def poll_swaps_data(interval: float):
+    """Reload the swaps store when the data on disk changes, every `interval` seconds."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(refresh_swaps_store)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error("Failed to refresh the swaps data: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Sample the event loop lag and poll for new data while serving.
+
+    Stop the compute pools on exit.
+    """
+    refresh_interval = float(os.environ.get("OPENBB_SWAPS_REFRESH_INTERVAL", 60))
+    tasks = [asyncio.create_task(event_loop_lag.run())]
+    if refresh_interval > 0:
+        tasks.append(asyncio.create_task(poll_swaps_data(refresh_interval)))
+    yield
+    for task in tasks:
+        task.cancel()
+    for executor in executors.values():
+        executor.shutdown()
+
+
+def date_window(start_date, end_date, frequency: str) -> dict:
+    """Get the date window options of a time series query.
+
+    Raises
+    ------
+    HTTPException
+        With status 422, when the start date is after the end date.
+    """
+    if start_date is not None and end_date is not None and start_date > end_date:
+        raise HTTPException(
+            status_code=422,
+            detail=f"The start date, {start_date}, is after the end date, {end_date}.",
+        )
+    return {"start_date": start_date, "end_date": end_date, "frequency": frequency}
+
+
+def parse_maturities(maturities: Optional[str]) -> Optional[list]:
+    """Parse the comma-separated maturities of a curve query, in years.
+
+    Raises
+    ------
+    HTTPException
+        With status 422, when a maturity is not a positive, finite number.
+    """
+    # pylint: disable=import-outside-toplevel
+    from math import isfinite
+
+    if maturities is None:
+        return None
+    try:
+        values = [float(m) for m in maturities.split(",") if m.strip()]
+    except ValueError:
+        values = []
+    if not values or not all(isfinite(m) and m > 0 for m in values):
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid maturities: {maturities}."
+            + " Maturities are positive numbers of years, like 0.5,2.5,12.",
+        )
+    return values
+
+
+DATA_PATHS = {
+    "/swap_rate_levels",
+    "/swap_rate_levels/tenors",
+    "/swap_rate_volume",
+    "/swap_rate_volume/buckets",
+    "/trade_distribution",
+    "/trade_distribution/dates",
+    "/swap_trades",
+    "/swap_trades/dates",
+    "/swap_curve",
+    "/swap_curve/dates",
+}
+
+app = FastAPI(lifespan=lifespan)
+response_cache = cache_from_environment()
+app.add_middleware(
+    ResponseCacheMiddleware,
+    cache=response_cache,
+    paths=DATA_PATHS,
+    get_version=lambda: get_swaps_store().data_version,
+    get_last_modified=lambda: get_swaps_store().last_modified,
+)
+if TIMING_ENABLED:
+    app.add_middleware(TimingMiddleware, paths=DATA_PATHS | {"/batch"})
 
 
 @app.get(
@@ -40,68 +176,67 @@ def get_swap_rate_levels_tenors(
     store: SwapsStore, swap_type: SwapTypes, currency: SwapCurrency
 ) -> list:
     """Available tenors for a given currency and swap type."""
-    store_key = currency.lower() + "_swaps"
-    sheet_name = "Interest Rates"
-    df = store.get_store(store_key, sheet_name=sheet_name)
-
-    if swap_type != "Both":
-        df = df[df["swap.type"] == swap_type]
-
-    tenors = df["metric"].unique().tolist()
-
-    return [d for d in SWAP_TENOR_CHOICES if d["value"] in tenors]
+    return store.get_options(currency).get_tenors(swap_type)
 
 
 @app.get("/swap_rate_levels")
 def swap_rate_levels(
+    request: Request,
     store: SwapsStore,
     currency: SwapCurrency = "USD",
     swap_type: SwapTypes = "OIS",
     tenor: SwapRateTenors = "2s10s",
     period: SwapRatePeriod = "1y",
+    start_date: SwapRateStartDate = None,
+    end_date: SwapRateEndDate = None,
+    frequency: SwapRateFrequency = "daily",
+    format: ResponseFormat = "json",
 ) -> list[SwapRateLevelsResponseModel]:
     """Get swap rate levels as a time series, by term and currency."""
-    store_key = currency.lower() + "_swaps"
-    sheet_name = "Interest Rates"
-
-    tenor = tenor.split(",") if "," in tenor else [tenor]
-    lookback_period = (
-        relativedelta(months=int(period[0])) if period in ["1m", "3m", "6m"] else None
-    )
+    # Sorted like the tenors of the response cache key.
+    tenor = sorted(set(tenor.split(",")))
+    window = date_window(start_date, end_date, frequency)
+    # Dates outside of the data select no rows, like they do for the volumes.
+    windowed = start_date is not None or end_date is not None
+    format = negotiate_format(format, request.headers.get("accept"))
+    if format in ("arrow", "parquet"):
+        require_pyarrow()
 
     try:
-        df = store.get_store(store_key, sheet_name=sheet_name)
-        df = df[df["metric"].isin(tenor)]
-
-        df.curve_date = df["curve_date"].astype("datetime64[ns]")
-        df = df.set_index("curve_date").sort_index()
-
-        if lookback_period:
-            df = df[df.index >= (df.index[-1] - lookback_period)]
-
-        df.index = df.index.strftime("%Y-%m-%d")
-
-        if period == "YTD":
-            max_year = df.index[-1].split("-")[0]
-            df = df[df.index >= f"{max_year}-01-01"]
-
-        df = df.reset_index()
-        df = df.sort_values(by=["curve_date", "metric", "swap.type"])
-        df.rate = df["rate"].astype("float64").multiply(100).round(4)
-
-        if swap_type != "Both":
-            df = df[df["swap.type"] == swap_type]
-
-        df = df.pivot(
-            index="curve_date", columns=["swap.type", "metric"], values="rate"
-        )
+        rate_levels = store.get_rate_levels(currency)
+
+        if format in ("arrow", "parquet"):
+            with span("query"):
+                columns = rate_levels.query_columns(swap_type, tenor, period, **window)
+            if len(columns["curve_date"]) == 0 and not (
+                windowed and rate_levels.has_data(swap_type, tenor)
+            ):
+                raise OpenBBError(f"No {currency} {swap_type} data found for {tenor}.")
+
+            with span("serialize"):
+                content = table_content(SwapRateLevelsResponseModel, columns, format)
+            return table_response(content, format)
+
+        if format == "ndjson":
+            with span("query"):
+                batches = rate_levels.iter_query(swap_type, tenor, period, **window)
+                first = next(batches, None)
+            if first is None and not (
+                windowed and rate_levels.has_data(swap_type, tenor)
+            ):
+                raise OpenBBError(f"No {currency} {swap_type} data found for {tenor}.")
+
+            first_batches = [] if first is None else [first]
+            return ndjson_response(
+                SwapRateLevelsResponseModel, chain(first_batches, batches)
+            )
 
-        df.columns = [f"{stype.lower()}_{metric}" for stype, metric in df.columns]
-        df = df.reset_index().replace({nan: None})
-        if df.empty:
+        with span("query"):
+            records = rate_levels.query(swap_type, tenor, period, **window)
+        if not records and not (windowed and rate_levels.has_data(swap_type, tenor)):
             raise OpenBBError(f"No {currency} {swap_type} data found for {tenor}.")
 
-        return df.to_dict(orient="records")
+        return records_response(SwapRateLevelsResponseModel, records)
 
     except Exception as e:
         raise OpenBBError(e) from e
@@ -113,103 +248,57 @@ def swap_rate_levels(
 )
 def get_swap_rate_volume_buckets(store: SwapsStore, currency: SwapCurrency) -> list:
     """Available tenors for a given currency and swap type."""
-    all_buckets = [
-        "0-1",
-        "1-3",
-        "3-4",
-        "4-5",
-        "5-7",
-        "7-10",
-        "10-15",
-        "15-20",
-        "20-25",
-        "25-30",
-        "30-40",
-        "40-50",
-    ]
-    store_key = currency.lower() + "_swaps"
-    sheet_name = "Trading Data"
-    df = store.get_store(store_key, sheet_name=sheet_name)
-
-    tenors = df["Bucket"].unique().tolist()
-
-    return [
-        {"label": tenor, "value": tenor} for tenor in all_buckets if tenor in tenors
-    ]
+    return store.get_options(currency).buckets
 
 
 @app.get("/swap_rate_volume")
 async def swap_rate_volume(
+    request: Request,
     store: SwapsStore,
     currency: SwapCurrency = "USD",
     stat: SwapVolumeTypes = "Notional",
     bucket: SwapTenorBuckets = "7-10",
     period: SwapRatePeriod = "1y",
+    start_date: SwapRateStartDate = None,
+    end_date: SwapRateEndDate = None,
+    frequency: SwapRateFrequency = "daily",
+    format: ResponseFormat = "json",
 ) -> list[SwapRateVolumeResponseModel]:
     """Get swap rate volumes by underlying currency. Choose between total notional or the PV01 of the notional."""
-    store_key = currency.lower() + "_swaps"
-    sheet_name = "Trading Data"
-    lookback_period = (
-        relativedelta(months=int(period[0])) if period in ["1m", "3m", "6m"] else None
-    )
-    buckets = bucket.split(",") if "," in bucket else [bucket]
-
-    try:
-        df = store.get_store(store_key, sheet_name=sheet_name)
-
-        df = df[df["Bucket"].isin(buckets)] if buckets else df
-        df = df.reset_index()
-
-        libor_volume = (
-            df[df["swap.type"] == "Libor"]
-            .copy()
-            .groupby("spot_date")
-            .agg({"notional": "sum", "pv01": "sum"})
-        )
-        ois_volume = (
-            df[df["swap.type"] == "OIS"]
-            .copy()
-            .groupby("spot_date")
-            .agg({"notional": "sum", "pv01": "sum"})
+    format = negotiate_format(format, request.headers.get("accept"))
+    window = date_window(start_date, end_date, frequency)
+    if format in ("arrow", "parquet"):
+        require_pyarrow()
+        content = await get_executor("swap_rate_volume").run(
+            handlers.swap_rate_volume_table,
+            store,
+            currency,
+            stat,
+            bucket,
+            period,
+            format,
+            **window,
         )
-
-        if stat == "Notional":
-            _ = libor_volume.pop("pv01")
-            _ = ois_volume.pop("pv01")
-        else:
-            _ = libor_volume.pop("notional")
-            _ = ois_volume.pop("notional")
-
-        libor_volume = libor_volume.rename(
-            columns={"notional": "Libor Volume", "pv01": "Libor Volume"}
+        return table_response(content, format)
+
+    if format == "ndjson":
+        series = await get_executor("swap_rate_volume").run(
+            handlers.swap_rate_volume_series,
+            store,
+            currency,
+            stat,
+            bucket,
+            period,
+            **window,
         )
-        ois_volume = ois_volume.rename(
-            columns={"notional": "OIS Volume", "pv01": "OIS Volume"}
+        return ndjson_response(
+            SwapRateVolumeResponseModel, SwapVolumeCube.iter_records(series)
         )
-        output = libor_volume.join(ois_volume, how="outer")
-        output = output.fillna(0)
-        output.loc[:, "Total"] = output["Libor Volume"] + output["OIS Volume"]
-        output.loc[:, "Total 5-Day MA Volume"] = output["Total"].rolling(5).mean()
-        output = output.dropna(subset="Total 5-Day MA Volume").astype("int64")
-        _ = output.pop("Total")
-        output = output.reset_index()
-
-        output.spot_date = output["spot_date"].astype("datetime64[ns]")
-        output = output.set_index("spot_date").sort_index()
-
-        if lookback_period:
-            output = output[output.index >= (output.index[-1] - lookback_period)]
-
-        output.index = output.index.strftime("%Y-%m-%d")
-
-        if period == "YTD":
-            max_year = output.index[-1].split("-")[0]
-            output = output[output.index >= f"{max_year}-01-01"]
-
-        return output.reset_index().to_dict(orient="records")
 
-    except Exception as e:
-        raise OpenBBError(e) from e
+    records = await get_executor("swap_rate_volume").run(
+        handlers.swap_rate_volume, store, currency, stat, bucket, period, **window
+    )
+    return records_response(SwapRateVolumeResponseModel, records)
 
 
 @app.get(
@@ -220,17 +309,16 @@ def get_trade_distribution_dates(
     store: SwapsStore, currency: SwapCurrency, swap_type: SwapTypes
 ) -> list:
     """Available trade distribution dates for a given currency and swap type."""
-    store_key = currency.lower() + "_swaps"
-    sheet_name = "Trading Data"
-    df = store.get_store(store_key, sheet_name=sheet_name)
+    return store.get_options(currency).get_dates(swap_type)
 
-    if swap_type != "Both":
-        df = df[df["swap.type"] == swap_type]
 
-    df.sort_values(by=["spot_date"], inplace=True, ascending=False)
-    dates = df["spot_date"].astype(str).unique().tolist()
-
-    return [{"label": date, "value": date} for date in dates]
+@app.get(
+    "/swap_trades/dates",
+    openapi_extra={"widget_config": {"exclude": True}},
+)
+def get_swap_trades_dates(store: SwapsStore, currency: SwapCurrency) -> list:
+    """Available swap trade dates for a given currency."""
+    return store.get_options(currency).get_trade_dates()
 
 
 @app.get("/trade_distribution")
@@ -242,100 +330,81 @@ async def trade_distribution(
     date: SwapTradeDistributionDates = "2025-04-15",
 ) -> list[TradeDistributionResponseModel]:
     """Get swap rate volumes, by currency, as a time series. Choose between total notional or the PV01 of the notional."""
-    store_key = currency.lower() + "_swaps"
-    sheet_name = "Trading Data"
-
-    try:
-        df = store.get_store(store_key, sheet_name=sheet_name)
-
-        if swap_type != "Both":
-            df = df[df["swap.type"] == swap_type]
-
-        df = df[df["spot_date"] == to_datetime(date)]
-
-        if len(df) == 0:
-            raise OpenBBError(f"No {swap_type} data found for {date}.")
-
-        output = (
-            df.copy()
-            .groupby("Bucket")
-            .agg(
-                {
-                    "notional": "sum",
-                    "pv01": "sum",
-                }
-            )
-        )
-
-        output = output.fillna(0).round()
-
-        output = (
-            output[["notional"]].copy().T.reset_index()
-            if stat == "Notional"
-            else output[["pv01"]].copy().T.reset_index()
-        )
-
-        return output.to_dict(orient="records")
-    except Exception as e:
-        raise OpenBBError(e) from e
+    records = await get_executor("trade_distribution").run(
+        handlers.trade_distribution, store, currency, swap_type, stat, date
+    )
+    return records_response(TradeDistributionResponseModel, records)
 
 
 @app.get("/swap_trades")
 async def swap_trades(
     store: SwapsStore,
     currency: SwapCurrency = "USD",
-    date: SwapTradesDates = "2025-04-15",
+    date: SwapTradesDates = None,
     cleared_only: SwapTradesClearedOnly = False,
     include_starting: SwapTradesIncludeStarting = False,
 ) -> list[SwapTradesResponseModel]:
     """Get swap trades, by currency and swap type, for a given date."""
-    store_key = currency.lower() + "_swaps"
-    sheet_name = "Trades and Pricing Curve"
-    target_cols = ["time.to.mat", "strike", "type"]
+    records = await get_executor("swap_trades").run(
+        handlers.swap_trades, store, currency, date, cleared_only, include_starting
+    )
+    return records_response(SwapTradesResponseModel, records)
 
-    try:
-        df = store.get_store(store_key, sheet_name=sheet_name)
-        df = df[df["spot_date"] == to_datetime(date)]
-        df.strike = df.strike.astype("float64").multiply(100).round(4)
-        output = df[df.type == "Pricing Rate"][target_cols]
-
-        if cleared_only is True:
-            if include_starting is True:
-                cleared_and_forward_starting = df[df["cleared"].astype(str) == "1"][
-                    target_cols
-                ]
-                output = concat([output, cleared_and_forward_starting], axis=0)
-            else:
-                cleared_only = df[
-                    (df["cleared"].astype(str) == "1")
-                    & (df.forward_starting.astype(str) == "0")
-                ][target_cols]
-                output = concat([output, cleared_only], axis=0)
-        else:
-            if include_starting is True:
-                all_trades = df[df.type != "Pricing Rate"][target_cols]
-                output = concat([output, all_trades], axis=0)
-            else:
-                not_forward_starting = df[df["forward_starting"].astype(str) == "0"][
-                    target_cols
-                ]
-                output = concat([output, not_forward_starting], axis=0)
-
-        output = output.pivot_table(
-            columns="type",
-            values="strike",
-            index="time.to.mat",
-        )
 
-        for col in output.columns:
-            output[col] = output[col].astype("float64").round(4)
+@app.get(
+    "/swap_curve/dates",
+    openapi_extra={"widget_config": {"exclude": True}},
+)
+def get_swap_curve_dates(
+    store: SwapsStore, currency: SwapCurrency, swap_type: SwapCurveTypes = "OIS"
+) -> list:
+    """Available curve dates for a given currency and swap type."""
+    return store.get_curves(currency).get_dates(swap_type)
 
-        output = output.reset_index()
-        output.loc[:, "time.to.mat"] = output["time.to.mat"].round(2)
 
-        return output.replace({nan: None}).to_dict(orient="records")
-    except Exception as e:
-        raise OpenBBError(e) from e
+@app.get("/swap_curve")
+async def swap_curve(
+    store: SwapsStore,
+    currency: SwapCurrency = "USD",
+    swap_type: SwapCurveTypes = "OIS",
+    date: SwapCurveDates = None,
+    method: SwapCurveMethods = "monotone",
+    measure: SwapCurveMeasures = "par",
+    maturities: SwapCurveMaturities = None,
+    points: SwapCurvePoints = 100,
+) -> list[SwapCurveResponseModel]:
+    """Get the interpolated swap curve, by currency and swap type, for one or more dates.
+
+    Each date is a column of rates, by maturity, to overlay the curves.
+    """
+    records = await get_executor("swap_curve").run(
+        handlers.swap_curve,
+        store,
+        currency,
+        swap_type,
+        date,
+        method,
+        measure,
+        parse_maturities(maturities),
+        points,
+    )
+    return records_response(SwapCurveResponseModel, records)
+
+
+@app.post(
+    "/batch",
+    openapi_extra={"widget_config": {"exclude": True}},
+)
+async def batch(queries: BatchQueries) -> list[BatchResult]:
+    """Run several queries to data endpoints in one request.
+
+    Queries run concurrently, and identical queries run once.
+    Each result has the status of its query, with its data or error.
+    """
+    return Response(
+        content=await run_batch(app, queries, DATA_PATHS),
+        media_type="application/json",
+    )
 
 
 @app.get("/apps.json")
@@ -347,3 +416,50 @@ def get_apps_json():
             return json.load(f)
     except Exception as e:
         raise OpenBBError(f"Error reading apps.json: {str(e)}") from e
+
+
+@app.get(
+    "/stats",
+    openapi_extra={"widget_config": {"exclude": True}},
+)
+def get_stats(store: SwapsStore) -> dict:
+    """Event loop lag, compute executor, response cache and store cache statistics."""
+    return {
+        "event_loop_lag": event_loop_lag.stats(),
+        "executors": {kind: executor.stats() for kind, executor in executors.items()},
+        "response_cache": response_cache.stats(),
+        "store": {**store.cache_info(), "handle": store_handle.stats()},
+    }
+
+
+@app.get(
+    "/metrics",
+    openapi_extra={"widget_config": {"exclude": True}},
+)
+def get_metrics() -> Response:
+    """Per-stage request timing histograms, in the Prometheus text format."""
+    return Response(
+        content=stage_histograms.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@app.post(
+    "/admin/reload",
+    openapi_extra={"widget_config": {"exclude": True}},
+)
+async def reload_data(
+    authorization: Annotated[Optional[str], Header()] = None,
+) -> dict:
+    """Reload the swaps data from disk, if it changed, without restarting the worker.
+
+    The new data is loaded in the background. Requests in flight finish on the data
+    they started with. Requires the `OPENBB_SWAPS_ADMIN_TOKEN` as a bearer token.
+    """
+    token = os.environ.get("OPENBB_SWAPS_ADMIN_TOKEN")
+    if not token or not hmac.compare_digest(
+        (authorization or "").encode(), f"Bearer {token}".encode()
+    ):
+        raise HTTPException(status_code=403, detail="Not authorized to reload data.")
+    reloaded = await run_in_threadpool(refresh_swaps_store)
+    return {"reloaded": reloaded, **store_handle.stats()}
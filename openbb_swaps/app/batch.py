@@ -0,0 +1,140 @@
+"""Batch Queries to Data Endpoints.
+
+A dashboard mounts several widgets at once. A batch runs all of their queries in
+one request: each query is sent through the application, as a GET request, so it is
+validated, cached and computed exactly like a request of its own.
+
+Queries are run concurrently. Identical queries, with the same canonical parameters,
+run once. Sheets and precomputed views shared by queries are loaded once by the store.
+"""
+
+import asyncio
+from typing import Any
+from urllib.parse import urlencode
+
+from openbb_swaps.app.cache import canonical_params, join_repeated_params
+from openbb_swaps.models.query_params import BatchQuery
+
+
+def _query_string(params: dict) -> bytes:
+    """Encode query parameters, repeating a parameter for each item of a list.
+
+    Repeated parameters are joined into comma-separated values by the application.
+    """
+    values = {}
+    for name, value in params.items():
+        if isinstance(value, bool):
+            value = str(value).lower()
+        values[name] = value
+    return urlencode(values, doseq=True).encode("latin-1")
+
+
+async def _get(app, path: str, query_string: bytes) -> tuple[int, bytes]:
+    """Send a GET request through the application and get its status and body."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query_string,
+        "headers": [(b"accept", b"application/json")],
+        "client": None,
+        "server": None,
+    }
+    response: dict = {"status": 500, "body": b""}
+
+    async def receive():
+        """Receive an empty request body."""
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        """Collect the response."""
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    try:
+        await app(scope, receive, send)
+    except Exception as e:  # pylint: disable=broad-except
+        # Unhandled errors are raised after a generic 500 response is sent.
+        response["status"] = 500
+        response["body"] = str(e).encode()
+
+    return response["status"], response["body"]
+
+
+def _error(body: bytes) -> Any:
+    """Get the error detail of a response body."""
+    # pylint: disable=import-outside-toplevel
+    import json
+
+    try:
+        content = json.loads(body)
+    except ValueError:
+        return body.decode(errors="replace")
+    return content.get("detail", content) if isinstance(content, dict) else content
+
+
+async def run_batch(app, queries: list[BatchQuery], paths: set) -> bytes:
+    """Run the queries concurrently and get the JSON array of their results.
+
+    The response of a query is embedded as-is, without parsing it again.
+    """
+    # pylint: disable=import-outside-toplevel
+    from pydantic_core import to_json
+
+    routes = {
+        route.path: route
+        for route in app.routes
+        if getattr(route, "path", None) in paths
+        and "GET" in getattr(route, "methods", ())
+    }
+    requests: dict = {}
+    rejected: dict = {}
+    keys: list = []
+
+    for i, query in enumerate(queries):
+        route = routes.get(query.endpoint)
+        if route is None:
+            rejected[i] = (404, f"Unknown endpoint {query.endpoint}.")
+        elif query.params.get("format", "json") != "json":
+            rejected[i] = (400, "Only the json format can be batched.")
+        else:
+            query_string = _query_string(query.params)
+            key = (
+                query.endpoint,
+                canonical_params(route, join_repeated_params(query_string)),
+            )
+            if key not in requests:
+                requests[key] = _get(app, query.endpoint, query_string)
+            keys.append(key)
+            continue
+        keys.append(None)
+
+    responses = dict(zip(requests, await asyncio.gather(*requests.values())))
+    results: list = []
+
+    for i, (query, key) in enumerate(zip(queries, keys)):
+        if key is None:
+            status, error = rejected[i]
+            body = b""
+        else:
+            status, body = responses[key]
+            error = None if status == 200 else _error(body)
+        result = to_json(
+            {
+                "endpoint": query.endpoint,
+                "params": query.params,
+                "status": status,
+                "error": error,
+            }
+        )
+        data = body if status == 200 else b"null"
+        results.append(result[:-1] + b',"data":' + data + b"}")
+
+    return b"[" + b",".join(results) + b"]"
@@ -0,0 +1,332 @@
+"""Response Cache and Validators for Data Endpoints.
+
+The query space of the data endpoints is small and closed, and the data only
+changes when a new data version is loaded. Successful responses are cached as
+the final serialized bytes, keyed on the canonical query parameters and the data version.
+
+Canonical parameters fill in the defaults of the route, ignore undeclared parameters,
+parse boolean values, and sort the items of comma-separated list parameters,
+so `tenor=2s10s,1s5s` and `tenor=1s5s,2s10s` share an entry. The handlers of
+list parameters return the same response for any order of the items.
+The format is the one negotiated from the `format` parameter and the Accept header,
+so `format=arrow` and `Accept: application/vnd.apache.arrow.stream` share an entry.
+Repeated parameters are joined into one comma-separated value before the request
+is routed, so `tenor=2s10s&tenor=1s5s` is the same request as `tenor=2s10s,1s5s`.
+
+The same key gives the ETag of a response, so clients polling with If-None-Match
+get a 304 Not Modified until the data version changes, even with the cache disabled.
+If-Modified-Since, and If-None-Match: *, are only answered for keys that produced
+a successful response for the data version, so failing requests are always run.
+
+Configuration is read from the environment:
+
+- `OPENBB_SWAPS_RESPONSE_CACHE_SIZE`: Maximum number of cached responses. Default is 1024. Set to 0 to disable.
+- `OPENBB_SWAPS_RESPONSE_CACHE_TTL`: Seconds a cached response is served. Default is 3600.
+- `OPENBB_SWAPS_RESPONSE_CACHE_BYTES`: Maximum total size of the cached responses. Default is 64 MB.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from openbb_swaps.app.responses import negotiate_format
+
+LIST_PARAMS = {"tenor", "bucket"}
+
+
+class ResponseCache:
+    """LRU cache of serialized responses, with a time-to-live and a size limit."""
+
+    def __init__(
+        self, maxsize: int = 1024, ttl: float = 3600.0, max_bytes: int = 64 << 20
+    ):
+        """Initialize the cache limits."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.size_bytes = 0
+        self.version: Optional[str] = None
+        self._entries: OrderedDict = OrderedDict()
+        # Keys with a successful response for the data version, cached or not.
+        self._succeeded: OrderedDict = OrderedDict()
+        self.max_succeeded = max(maxsize, 4096)
+
+    def get(self, key: tuple) -> Optional[tuple]:
+        """Get the (headers, body) of a cached response, if present and fresh."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._pop(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1], entry[2]
+
+    def set(self, key: tuple, headers: list, body: bytes):
+        """Cache a response, evicting the least recently used ones over the limits."""
+        if self.maxsize <= 0 or len(body) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._pop(key)
+        self._entries[key] = (time.monotonic() + self.ttl, headers, body)
+        self.size_bytes += len(body)
+        while len(self._entries) > self.maxsize or self.size_bytes > self.max_bytes:
+            self._pop(next(iter(self._entries)))
+
+    def mark_succeeded(self, key: tuple):
+        """Record that a key produced a successful response for the data version."""
+        self._succeeded[key] = None
+        self._succeeded.move_to_end(key)
+        while len(self._succeeded) > self.max_succeeded:
+            self._succeeded.popitem(last=False)
+
+    def succeeded(self, key: tuple) -> bool:
+        """Check if a key produced a successful response for the data version."""
+        return key in self._succeeded
+
+    def check_version(self, version: str):
+        """Drop every entry when the data version changes."""
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+    def clear(self):
+        """Drop every entry."""
+        self._entries.clear()
+        self._succeeded.clear()
+        self.size_bytes = 0
+
+    def _pop(self, key: tuple):
+        """Drop an entry."""
+        _, _, body = self._entries.pop(key)
+        self.size_bytes -= len(body)
+
+    def stats(self) -> dict:
+        """Get the cache counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+            "version": self.version,
+        }
+
+
+def _canonical_value(value: Any, annotation: Any, name: str) -> str:
+    """Convert a query parameter value to its canonical string."""
+    # pylint: disable=import-outside-toplevel
+    from pydantic import TypeAdapter, ValidationError
+
+    if annotation is bool:
+        try:
+            return str(TypeAdapter(bool).validate_python(value)).lower()
+        except ValidationError:
+            return str(value)
+    value = str(value)
+    if name in LIST_PARAMS:
+        return ",".join(sorted(set(value.split(","))))
+    return value
+
+
+def join_repeated_params(query_string: bytes) -> bytes:
+    """Join the values of repeated query parameters into comma-separated values."""
+    pairs = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    names = [name for name, _ in pairs]
+    if len(set(names)) == len(names):
+        return query_string
+    values: dict = {}
+    for name, value in pairs:
+        values[name] = f"{values[name]},{value}" if name in values else value
+    return urlencode(values).encode("latin-1")
+
+
+def canonical_params(route: Any, query_string: bytes) -> tuple:
+    """Get the canonical (name, value) pairs of a request to a route."""
+    fields = {field.alias: field for field in route.dependant.query_params}
+    values = {
+        alias: field.field_info.default
+        for alias, field in fields.items()
+        if not field.field_info.is_required()
+    }
+    for name, value in parse_qsl(
+        query_string.decode("latin-1"), keep_blank_values=True
+    ):
+        if name in fields:
+            values[name] = value
+
+    return tuple(
+        (name, _canonical_value(value, fields[name].field_info.annotation, name))
+        for name, value in sorted(values.items())
+    )
+
+
+def _etag(key: tuple) -> bytes:
+    """Get the strong entity tag of a cache key."""
+    return b'"' + hashlib.sha256(repr(key).encode()).hexdigest()[:32].encode() + b'"'
+
+
+def _not_modified(
+    headers: dict, etag: bytes, last_modified: float, succeeded: bool
+) -> bool:
+    """Check the conditional request headers against the validators of a response.
+
+    If-Modified-Since is only considered when If-None-Match is absent.
+    Neither it nor the "*" tag match unless the key produced a successful response,
+    since they do not identify one.
+    """
+    if b"if-none-match" in headers:
+        tags = [tag.strip() for tag in headers[b"if-none-match"].split(b",")]
+        return any(
+            (tag == b"*" and succeeded)
+            or tag == etag
+            or tag.removeprefix(b"W/") == etag
+            for tag in tags
+        )
+    if b"if-modified-since" in headers and succeeded:
+        try:
+            since = parsedate_to_datetime(headers[b"if-modified-since"].decode())
+        except (TypeError, ValueError):
+            return False
+        return since.timestamp() >= int(last_modified)
+    return False
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware for conditional and cached GET requests to selected paths.
+
+    Successful responses carry a strong ETag, derived from the data version and
+    the canonical parameters, and a Last-Modified header with the time of the data.
+    A conditional request that matches them is answered with 304 Not Modified,
+    and a cached response is sent as-is. Neither routes the request,
+    so no dependencies, handlers or serialization run.
+    """
+
+    def __init__(
+        self,
+        app,
+        cache: ResponseCache,
+        paths: set,
+        get_version: Callable[[], str],
+        get_last_modified: Callable[[], float],
+    ):
+        """Initialize the middleware."""
+        self.app = app
+        self.cache = cache
+        self.paths = paths
+        self.get_version = get_version
+        self.get_last_modified = get_last_modified
+        self._routes: dict = {}
+
+    def _route(self, scope) -> Any:
+        """Get the API route of a cached path."""
+        path = scope["path"]
+        if path not in self._routes:
+            self._routes[path] = next(
+                (
+                    route
+                    for route in scope["app"].routes
+                    if getattr(route, "path", None) == path
+                    and "GET" in getattr(route, "methods", ())
+                ),
+                None,
+            )
+        return self._routes[path]
+
+    async def __call__(self, scope, receive, send):
+        """Answer conditional requests, serve from the cache, or run the request."""
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or scope["path"] not in self.paths
+            or self._route(scope) is None
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        scope = {**scope, "query_string": join_repeated_params(scope["query_string"])}
+        version = self.get_version()
+        last_modified = self.get_last_modified()
+        self.cache.check_version(version)
+        headers = dict(scope["headers"])
+        params = canonical_params(self._route(scope), scope["query_string"])
+        # The response format can be negotiated with the Accept header.
+        accept = headers.get(b"accept", b"").decode("latin-1")
+        params = tuple(
+            (name, negotiate_format(value, accept) if name == "format" else value)
+            for name, value in params
+        )
+        key = (scope["path"], params, version)
+        etag = _etag(key)
+        validators = [
+            (b"etag", etag),
+            (b"last-modified", formatdate(last_modified, usegmt=True).encode()),
+            (b"vary", b"Accept"),
+        ]
+
+        if _not_modified(headers, etag, last_modified, self.cache.succeeded(key)):
+            self.cache.not_modified += 1
+            await send(
+                {"type": "http.response.start", "status": 304, "headers": validators}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        cached = self.cache.get(key) if self.cache.maxsize > 0 else None
+
+        if cached is not None:
+            headers, body = cached
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": headers + validators + [(b"x-cache", b"hit")],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start: dict = {}
+        chunks: Optional[list] = []
+        size = 0
+
+        async def send_and_capture(message):
+            """Capture the response while sending it."""
+            nonlocal chunks, size
+            if message["type"] == "http.response.start":
+                start.update(message)
+                headers = list(message.get("headers", []))
+                if message["status"] == 200:
+                    headers += validators
+                    self.cache.mark_succeeded(key)
+                message = {**message, "headers": headers + [(b"x-cache", b"miss")]}
+            elif message["type"] == "http.response.body" and chunks is not None:
+                chunks.append(message.get("body", b""))
+                size += len(chunks[-1])
+                if size > self.cache.max_bytes or self.cache.maxsize <= 0:
+                    # Streamed responses larger than the cache are not held.
+                    chunks = None
+                elif not message.get("more_body", False) and start.get("status") == 200:
+                    self.cache.set(
+                        key, list(start.get("headers", [])), b"".join(chunks)
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_and_capture)
+
+
+def cache_from_environment() -> ResponseCache:
+    """Create a response cache configured from the environment."""
+    return ResponseCache(
+        maxsize=int(os.environ.get("OPENBB_SWAPS_RESPONSE_CACHE_SIZE", 1024)),
+        ttl=float(os.environ.get("OPENBB_SWAPS_RESPONSE_CACHE_TTL", 3600)),
+        max_bytes=int(os.environ.get("OPENBB_SWAPS_RESPONSE_CACHE_BYTES", 64 << 20)),
+    )
@@ -0,0 +1,241 @@
+"""Bounded Compute Executors for Endpoint Handlers.
+
+Async endpoints hand their synchronous pandas work to a compute executor,
+so the event loop stays free to serve other requests while it runs.
+
+Each executor is a thread pool or a process pool with a limit on the number of
+pending tasks. When the limit is reached, new requests are rejected with
+a 429 response instead of queueing without bound.
+
+Configuration is read from the environment:
+
+- `OPENBB_SWAPS_COMPUTE_EXECUTOR`: "thread" (default) or "process".
+- `OPENBB_SWAPS_COMPUTE_EXECUTOR_<ENDPOINT>`: Override the executor kind for one endpoint,
+  e.g. `OPENBB_SWAPS_COMPUTE_EXECUTOR_SWAP_TRADES=process`.
+- `OPENBB_SWAPS_COMPUTE_WORKERS`: Number of workers per executor. Default is the CPU count, up to 4.
+- `OPENBB_SWAPS_COMPUTE_QUEUE`: Number of tasks allowed to wait for a worker. Default is 64.
+"""
+
+import asyncio
+import os
+import threading
+from collections import deque
+from contextvars import copy_context
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, partial
+from typing import Any, Callable, Literal
+
+from fastapi import HTTPException
+from openbb_swaps.app.timing import span
+
+
+def _run_with_process_store(
+    func: Callable, spec: dict, args: tuple, kwargs: dict
+) -> Any:
+    """Run a compute function in a worker process, on the data version of the request.
+
+    The worker loads the version of the store leased by the request, from its
+    `store_spec`, so the result matches the version of its cache key and ETag.
+    """
+    # pylint: disable=import-outside-toplevel
+    from openbb_swaps.data.store import get_version_store
+
+    return func(get_version_store(spec), *args, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def _check_importable(module: str, qualname: str):
+    """Check that worker processes can import a compute function by its module name.
+
+    Process pools pickle functions by reference. A module loaded from a file path,
+    like the app by the launcher, has a name the workers cannot import, and a worker
+    failing to unpickle a task breaks the whole pool.
+
+    Raises
+    ------
+    RuntimeError
+        When the module of the function is not importable from `sys.path`.
+    """
+    # pylint: disable=import-outside-toplevel
+    from importlib.machinery import PathFinder
+
+    if module == "__main__" or PathFinder.find_spec(module.split(".")[0]) is None:
+        raise RuntimeError(
+            f"{module}.{qualname} cannot run in a process pool: worker processes"
+            + f" cannot import the '{module}' module. Define it in the package."
+        )
+
+
+class ComputeExecutor:
+    """A thread or process pool with a bounded number of pending tasks."""
+
+    def __init__(
+        self,
+        kind: Literal["thread", "process"] = "thread",
+        max_workers: int = 4,
+        max_queue: int = 64,
+    ):
+        """Initialize the executor. The pool is started on first use."""
+        if kind not in ("thread", "process"):
+            raise ValueError(
+                f"Invalid executor kind '{kind}'. Choose 'thread' or 'process'."
+            )
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self._pool: Executor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def pool(self) -> Executor:
+        """Get the underlying pool, starting it if needed."""
+        with self._lock:
+            if self._pool is None:
+                if self.kind == "process":
+                    # pylint: disable=import-outside-toplevel
+                    from multiprocessing import get_context
+
+                    self._pool = ProcessPoolExecutor(
+                        self.max_workers, mp_context=get_context("spawn")
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(
+                        self.max_workers, thread_name_prefix="openbb-swaps-compute"
+                    )
+            return self._pool
+
+    async def run(self, func: Callable, store: Any, *args, **kwargs) -> Any:
+        """Run `func(store, *args, **kwargs)` on the pool and await the result.
+
+        In a process pool, the store is not sent to the worker. The worker process
+        loads the same data version, described by `store_spec`, and keeps it for
+        the next tasks.
+
+        Raises
+        ------
+        HTTPException
+            With status 429, when all workers are busy and the queue is full.
+        """
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail="The server is busy computing other requests. Retry later.",
+                headers={"Retry-After": "1"},
+            )
+
+        if self.kind == "process":
+            # pylint: disable=import-outside-toplevel
+            from openbb_swaps.data.store import store_spec
+
+            _check_importable(func.__module__, func.__qualname__)
+            call = partial(
+                _run_with_process_store, func, store_spec(store), args, kwargs
+            )
+        else:
+            # Stages timed in the thread count towards the request.
+            call = partial(copy_context().run, func, store, *args, **kwargs)
+
+        self.pending += 1
+        try:
+            with span("compute"):
+                return await asyncio.get_running_loop().run_in_executor(self.pool, call)
+        except BrokenProcessPool:
+            # A worker died. Start a new pool for the next requests.
+            with self._lock:
+                broken, self._pool = self._pool, None
+            if broken is not None:
+                broken.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            self.pending -= 1
+            self.completed += 1
+
+    def stats(self) -> dict:
+        """Get the executor configuration and counters."""
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self):
+        """Shut down the pool, waiting for running tasks."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+
+executors: dict[str, ComputeExecutor] = {}
+
+
+def get_executor(endpoint: str) -> ComputeExecutor:
+    """Get the compute executor configured for an endpoint.
+
+    Endpoints configured with the same kind of executor share it.
+    """
+    default_kind = os.environ.get("OPENBB_SWAPS_COMPUTE_EXECUTOR", "thread")
+    kind = os.environ.get(
+        f"OPENBB_SWAPS_COMPUTE_EXECUTOR_{endpoint.upper()}", default_kind
+    ).lower()
+
+    if kind not in executors:
+        executors[kind] = ComputeExecutor(
+            kind,  # type: ignore
+            max_workers=int(
+                os.environ.get(
+                    "OPENBB_SWAPS_COMPUTE_WORKERS", min(4, os.cpu_count() or 1)
+                )
+            ),
+            max_queue=int(os.environ.get("OPENBB_SWAPS_COMPUTE_QUEUE", 64)),
+        )
+
+    return executors[kind]
+
+
+class EventLoopLagMonitor:
+    """Measure how late the event loop wakes up from a fixed-interval sleep.
+
+    A busy loop, blocked by synchronous work, wakes up late.
+    The lag is the difference between the requested and actual sleep time.
+    """
+
+    def __init__(self, interval: float = 0.25, window: int = 1200):
+        """Initialize the monitor with a sampling interval and a window of samples."""
+        self.interval = interval
+        self.samples: deque = deque(maxlen=window)
+        self.max_lag = 0.0
+
+    async def run(self):
+        """Sample the event loop lag until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def stats(self) -> dict:
+        """Get the event loop lag statistics, in milliseconds."""
+        samples = sorted(self.samples)
+        if not samples:
+            return {"samples": 0}
+        return {
+            "samples": len(samples),
+            "last_ms": round(self.samples[-1] * 1000, 3),
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 3),
+            "p99_ms": round(samples[int(0.99 * (len(samples) - 1))] * 1000, 3),
+            "max_ms": round(self.max_lag * 1000, 3),
+        }
+
+
+event_loop_lag = EventLoopLagMonitor()
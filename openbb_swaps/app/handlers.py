@@ -0,0 +1,195 @@
+"""Compute Functions of the Data Endpoints.
+
+The endpoints run these functions on their compute executor, as
+`func(store, *args, **kwargs)`. A process pool pickles the function by reference,
+so each worker process imports it by its module name. They live here, in the
+package, because the launcher loads `app.py` from its file path under another
+module name, that the worker processes cannot import.
+"""
+
+from openbb_core.app.model.abstract.error import OpenBBError
+
+
+def swap_rate_volume(store, currency, stat, bucket, period, **window) -> list:
+    """Compute the swap rate volume records."""
+    buckets = bucket.split(",") if "," in bucket else [bucket]
+
+    try:
+        return store.get_volume_cube(currency).query(stat, buckets, period, **window)
+
+    except Exception as e:
+        raise OpenBBError(e) from e
+
+
+def swap_rate_volume_table(
+    store, currency, stat, bucket, period, format, **window
+) -> bytes:
+    """Compute the swap rate volume columns, as Arrow IPC stream or Parquet content."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_swaps.app.responses import table_content
+    from openbb_swaps.models.response_models import SwapRateVolumeResponseModel
+
+    buckets = bucket.split(",") if "," in bucket else [bucket]
+
+    try:
+        columns = store.get_volume_cube(currency).query_columns(
+            stat, buckets, period, **window
+        )
+
+        return table_content(SwapRateVolumeResponseModel, columns, format)
+
+    except Exception as e:
+        raise OpenBBError(e) from e
+
+
+def swap_rate_volume_series(store, currency, stat, bucket, period, **window) -> tuple:
+    """Compute the swap rate volume series, to stream as batches of records."""
+    buckets = bucket.split(",") if "," in bucket else [bucket]
+
+    try:
+        return store.get_volume_cube(currency).query_series(
+            stat, buckets, period, **window
+        )
+
+    except Exception as e:
+        raise OpenBBError(e) from e
+
+
+def trade_distribution(store, currency, swap_type, stat, date) -> list:
+    """Compute the trade distribution record for a date."""
+    sheet_name = "Trading Data"
+
+    try:
+        df = store.get_date_rows(currency, sheet_name, date)
+
+        if swap_type != "Both":
+            df = df[df["swap.type"] == swap_type]
+
+        if len(df) == 0:
+            raise OpenBBError(f"No {swap_type} data found for {date}.")
+
+        output = (
+            df.copy()
+            .groupby("Bucket", observed=True)
+            .agg(
+                {
+                    "notional": "sum",
+                    "pv01": "sum",
+                }
+            )
+        )
+
+        output = output.fillna(0).round()
+
+        output = (
+            output[["notional"]].copy().T.reset_index()
+            if stat == "Notional"
+            else output[["pv01"]].copy().T.reset_index()
+        )
+
+        return output.to_dict(orient="records")
+    except Exception as e:
+        raise OpenBBError(e) from e
+
+
+def swap_trades(store, currency, date, cleared_only, include_starting) -> list:
+    """Compute the swap trade records for a date."""
+    # pylint: disable=import-outside-toplevel
+    from numpy import nan
+    from pandas import concat
+
+    sheet_name = "Trades and Pricing Curve"
+    target_cols = ["time.to.mat", "strike", "type"]
+
+    try:
+        partitions = store.get_date_partitions(currency, sheet_name)
+        if not date:
+            date = partitions.last_date
+            if date is None:
+                raise OpenBBError(f"No {currency} trades found.")
+        df = partitions.get(date)
+        df.strike = df.strike.multiply(100).round(4)
+        output = df[df.type == "Pricing Rate"][target_cols]
+
+        if cleared_only is True:
+            if include_starting is True:
+                cleared_and_forward_starting = df[df["cleared"]][target_cols]
+                output = concat([output, cleared_and_forward_starting], axis=0)
+            else:
+                cleared_only = df[df["cleared"] & ~df["forward_starting"]][target_cols]
+                output = concat([output, cleared_only], axis=0)
+        else:
+            if include_starting is True:
+                all_trades = df[df.type != "Pricing Rate"][target_cols]
+                output = concat([output, all_trades], axis=0)
+            else:
+                not_forward_starting = df[~df["forward_starting"]][target_cols]
+                output = concat([output, not_forward_starting], axis=0)
+
+        output = output.pivot_table(
+            columns="type",
+            values="strike",
+            index="time.to.mat",
+            observed=True,
+        )
+
+        for col in output.columns:
+            output[col] = output[col].astype("float64").round(4)
+
+        output = output.reset_index()
+        output.loc[:, "time.to.mat"] = output["time.to.mat"].round(2)
+
+        return output.replace({nan: None}).to_dict(orient="records")
+    except Exception as e:
+        raise OpenBBError(e) from e
+
+
+def swap_curve(
+    store, currency, swap_type, date, method, measure, maturities, points
+) -> list:
+    """Evaluate the curves of the dates at the maturities, a list of years or None.
+
+    Without maturities, the curves are evaluated at `points` maturities spanning their
+    knots. Curves of a single pricing point, at the same maturity, give that one row.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import asarray, linspace
+    from pandas import Timestamp
+
+    try:
+        curves = store.get_curves(currency)
+
+        if date:
+            dates = [
+                Timestamp(d.strip()).strftime("%Y-%m-%d")
+                for d in date.split(",")
+                if d.strip()
+            ]
+        else:
+            dates = [d["value"] for d in curves.get_dates(swap_type)[:1]]
+
+        if not dates:
+            raise OpenBBError(f"No {swap_type} curve found for {currency}.")
+
+        selected = {
+            d: curves.get_curve(swap_type, d, method) for d in dict.fromkeys(dates)
+        }
+
+        first = min(c.maturities[0] for c in selected.values())
+        last = max(c.maturities[-1] for c in selected.values())
+        if maturities:
+            grid = asarray(maturities, dtype="float64")
+        elif last > first:
+            grid = linspace(first, last, points)
+        else:
+            grid = asarray([first])
+
+        columns = {"maturity": grid.round(4).tolist()}
+        for d, curve in selected.items():
+            rates = curve.par(grid) if measure == "par" else curve.zero(grid)
+            columns[d] = rates.round(4).tolist()
+
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+    except Exception as e:
+        raise OpenBBError(e) from e
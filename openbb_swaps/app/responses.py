@@ -0,0 +1,355 @@
+"""Fast JSON Responses for Data Endpoints.
+
+Endpoints returning `list[<ResponseModel>]` have every record validated into an
+OpenBB `Data` model and serialized back, one row at a time. A `RecordsSerializer`
+plans that work once per model instead: which record key feeds each field, how its
+values are coerced, and which key it is written under. The records of a response
+are then converted column by column and written to JSON in one call.
+
+The output is the same bytes FastAPI writes for the response model. When records
+do not fit the plan, like a value that needs validation beyond a plain coercion,
+they are returned as-is and FastAPI validates and serializes them as before.
+
+History endpoints can also stream newline-delimited JSON, one record per line,
+written batch by batch as the records are produced, or return their columns as
+an Arrow IPC stream or a Parquet file. Those require the optional `pyarrow` package.
+"""
+
+from datetime import date as dateType
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional, Union, get_args
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from openbb_core.provider.abstract.data import Data
+from openbb_swaps.app.timing import span
+
+
+def _to_float(value: Any) -> float:
+    """Coerce a value to a float, as a lax float field would."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"Not a number: {value!r}")
+    return float(value)
+
+
+def _to_int(value: Any) -> int:
+    """Coerce a value to an int, as a lax int field would."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"Not a number: {value!r}")
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"Not an integer: {value!r}")
+    return int(value)
+
+
+def _to_date(value: Any) -> str:
+    """Coerce an ISO date string or a date to its ISO date string."""
+    if isinstance(value, str):
+        return dateType.fromisoformat(value).isoformat()
+    if type(value) is dateType:  # pylint: disable=unidiomatic-typecheck
+        return value.isoformat()
+    raise TypeError(f"Not a date: {value!r}")
+
+
+TABLE_MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+COERCIONS: dict[type, Callable[[Any], Any]] = {
+    float: _to_float,
+    int: _to_int,
+    dateType: _to_date,
+}
+
+
+class RecordsSerializer:
+    """Serializer of response records for a `Data` model, planned once per model.
+
+    Models with a custom model serializer write the fields that are not None, under
+    their names, followed by the extra fields of the record if the serializer
+    writes them. Other models write every field, under its serialization alias.
+    """
+
+    def __init__(self, model: type[Data]):
+        """Plan the source key, coercion and output key of each field of the model."""
+        self.model = model
+        self.drop_none = bool(model.__pydantic_decorators__.model_serializers)
+        self.fields: list = []
+        self.sources: set = set()
+        self.renamed: set = set()
+
+        for name, field in model.model_fields.items():
+            annotation = field.annotation
+            optional = type(None) in get_args(annotation)
+            if optional:
+                annotation = next(
+                    a for a in get_args(annotation) if a is not type(None)
+                )
+            if annotation not in COERCIONS:
+                raise TypeError(f"No fast path for the {name} field of {model}.")
+            source = model.__alias_dict__.get(name, name)
+            output = name if self.drop_none else field.serialization_alias or name
+            self.fields.append(
+                (source, output, annotation, optional, field.is_required())
+            )
+            self.sources.add(source)
+            if source != name:
+                self.renamed.add(name)
+
+        self.keep_extra = self.drop_none and self._writes_extra_fields()
+
+    def _writes_extra_fields(self) -> bool:
+        """Check whether the model serializer writes the extra fields of a record."""
+        samples = {float: 0.0, int: 0, dateType: "2000-01-01"}
+        record = {field[0]: samples[field[2]] for field in self.fields if field[4]}
+        dumped = self.model.model_validate({**record, "__extra__": 0}).model_dump()
+        return "__extra__" in dumped
+
+    def _column(self, records: list, field: tuple, present: set) -> list:
+        """Get the coerced values of a field, from every record."""
+        source, _, kind, optional, required = field
+        if source not in present and not required:
+            return [None] * len(records)
+        if required and any(source not in record for record in records):
+            raise ValueError(f"Missing required field {source}.")
+        coerce = COERCIONS[kind]
+        values = [record.get(source) for record in records]
+        if optional:
+            return [
+                value if value is None or type(value) is kind else coerce(value)
+                for value in values
+            ]
+        return [value if type(value) is kind else coerce(value) for value in values]
+
+    def rows(self, records: list) -> Optional[list]:
+        """Convert the records to output rows, or return None if they need full validation."""
+        # pylint: disable=import-outside-toplevel
+        from pydantic import ValidationError
+
+        if not records:
+            return []
+
+        try:
+            if not all(isinstance(record, dict) for record in records):
+                return None
+            if any(not self.renamed.isdisjoint(record) for record in records):
+                # Fields given by name instead of by alias are left to the model.
+                return None
+            if not self.drop_none and any(
+                not self.sources.issuperset(record) for record in records
+            ):
+                # Unknown keys are kept as extra fields, left to the model.
+                return None
+            self.model.model_validate(records[0])
+            present = set().union(*records)
+            fields = [
+                field
+                for field in self.fields
+                if not self.drop_none or field[0] in present or field[4]
+            ]
+            columns = [self._column(records, field, present) for field in fields]
+        except (TypeError, ValueError, ValidationError):
+            return None
+
+        outputs = [field[1] for field in fields]
+        if self.drop_none:
+            rows = [
+                {key: value for key, value in zip(outputs, row) if value is not None}
+                for row in zip(*columns)
+            ]
+            if self.keep_extra and not self.sources.issuperset(present):
+                for row, record in zip(rows, records):
+                    row.update(
+                        (key, value)
+                        for key, value in record.items()
+                        if key not in self.sources and value is not None
+                    )
+            return rows
+        return [dict(zip(outputs, row)) for row in zip(*columns)]
+
+    def dumps(self, records: list) -> Optional[bytes]:
+        """Serialize the records to JSON, or return None if they need full validation."""
+        # pylint: disable=import-outside-toplevel
+        from pydantic_core import to_json
+
+        rows = self.rows(records)
+        return None if rows is None else to_json(rows)
+
+    def dumps_lines(self, records: list) -> bytes:
+        """Serialize the records to newline-delimited JSON, one record per line."""
+        # pylint: disable=import-outside-toplevel
+        from pydantic_core import to_json
+
+        rows = self.rows(records)
+        if rows is None:
+            rows = [self.model.model_validate(record) for record in records]
+        return b"".join(to_json(row, by_alias=True) + b"\n" for row in rows)
+
+
+@lru_cache(maxsize=None)
+def get_serializer(model: type[Data]) -> RecordsSerializer:
+    """Get the records serializer of a response model."""
+    return RecordsSerializer(model)
+
+
+def records_response(model: type[Data], records: list) -> Union[Response, list]:
+    """Get a JSON response with the records of a response model.
+
+    Returns the records as-is when they do not fit the fast path.
+    """
+    with span("serialize"):
+        content = get_serializer(model).dumps(records)
+    if content is None:
+        return records
+    return Response(content=content, media_type="application/json")
+
+
+def ndjson_response(model: type[Data], batches: Iterable[list]) -> StreamingResponse:
+    """Get a streaming newline-delimited JSON response with batches of records.
+
+    Each batch is serialized and sent as it is produced,
+    so only one batch of records is held in memory at a time.
+    """
+    serializer = get_serializer(model)
+    return StreamingResponse(
+        (serializer.dumps_lines(batch) for batch in batches),
+        media_type="application/x-ndjson",
+    )
+
+
+JSON_MEDIA_TYPES = ("application/json", "application/*", "*/*")
+
+
+@lru_cache(maxsize=None)
+def pyarrow_available() -> bool:
+    """Check if the optional pyarrow package is installed."""
+    # pylint: disable=import-outside-toplevel
+    from importlib.util import find_spec
+
+    return find_spec("pyarrow") is not None
+
+
+def _accepted_media_types(accept: str) -> list:
+    """Get the media types of an Accept header, most preferred first.
+
+    Types are ordered by quality, then by their order in the header.
+    Types with a quality of 0 are not acceptable, and are left out.
+    """
+    weighted = []
+    for i, item in enumerate(accept.split(",")):
+        media_type, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type and quality > 0:
+            weighted.append((-quality, i, media_type.lower()))
+    return [media_type for _, _, media_type in sorted(weighted)]
+
+
+@lru_cache(maxsize=256)
+def negotiate_format(format: str, accept: Optional[str]) -> str:
+    """Get the response format, from the Accept header when the format is the default.
+
+    Media types are tried in the order the client prefers them. The Arrow and Parquet
+    types are skipped when pyarrow is not installed, so a JSON type listed after them
+    gets JSON. When only those types are acceptable, their format is returned,
+    for `require_pyarrow` to answer 406. Headers without a known type get JSON.
+    """
+    if format != "json" or not accept:
+        return format
+    table_formats = {
+        media_type: table_format
+        for table_format, media_type in TABLE_MEDIA_TYPES.items()
+    }
+    unavailable = None
+    for media_type in _accepted_media_types(accept):
+        if media_type in JSON_MEDIA_TYPES:
+            return "json"
+        if media_type in table_formats:
+            if pyarrow_available():
+                return table_formats[media_type]
+            unavailable = unavailable or table_formats[media_type]
+    return unavailable or format
+
+
+def require_pyarrow():
+    """Check that pyarrow is installed, for the Arrow and Parquet formats.
+
+    Raises
+    ------
+    HTTPException
+        With status 406, when pyarrow is not installed.
+    """
+    if not pyarrow_available():
+        raise HTTPException(
+            status_code=406,
+            detail="The Arrow and Parquet formats require the pyarrow package."
+            + " Install it with `pip install openbb-swaps[arrow]`.",
+        )
+
+
+def table_content(model: type[Data], columns: dict, format: str) -> bytes:
+    """Write columns, keyed like the records of a model, as an Arrow IPC stream or Parquet.
+
+    Columns are named and typed like the fields of the JSON records, in the same order.
+    Extra columns follow, when the model writes extra fields, with their inferred types.
+    Models that drop null values from records drop the columns without any value.
+    """
+    # pylint: disable=import-outside-toplevel
+    import pyarrow as pa
+
+    serializer = get_serializer(model)
+    types = {float: pa.float64(), int: pa.int64(), dateType: pa.date32()}
+    names: list = []
+    arrays: list = []
+
+    fields = [
+        (source, output, kind, required)
+        for source, output, kind, _, required in serializer.fields
+    ]
+    if serializer.keep_extra:
+        fields += [
+            (name, name, None, False)
+            for name in columns
+            if name not in serializer.sources
+        ]
+
+    for source, output, kind, required in fields:
+        if source not in columns:
+            continue
+        values = columns[source]
+        if kind is dateType:
+            values = values.astype("datetime64[D]")
+        array = pa.array(values, type=types.get(kind), from_pandas=True)
+        if (
+            serializer.drop_none
+            and not required
+            and len(array) > 0
+            and array.null_count == len(array)
+        ):
+            continue
+        names.append(output)
+        arrays.append(array)
+
+    table = pa.table(arrays, names=names)
+    sink = pa.BufferOutputStream()
+
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    return sink.getvalue().to_pybytes()
+
+
+def table_response(content: bytes, format: str) -> Response:
+    """Get a response with Arrow IPC stream or Parquet content."""
+    return Response(content=content, media_type=TABLE_MEDIA_TYPES[format])
@@ -0,0 +1,190 @@
+"""Per-Stage Timing of Requests.
+
+Handlers, the compute executors and the store time their stages with `span`:
+
+    with span("query"):
+        records = rate_levels.query(swap_type, tenor, period)
+
+The durations of the stages of a request are sent back in its `Server-Timing` header,
+in milliseconds, with the total time to the start of the response. Every duration is
+also observed in a histogram by path and stage, served in the Prometheus text format
+at `/metrics`. Each worker process serves its own histograms.
+
+Stages run in a process pool are timed as a whole, by the "compute" stage.
+
+Configuration is read from the environment:
+
+- `OPENBB_SWAPS_TIMING`: Set to 0 to disable. `span` is then a shared no-op context
+  manager, no header is sent, and `/metrics` has no samples.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Optional
+
+TIMING_ENABLED = os.environ.get("OPENBB_SWAPS_TIMING", "1").lower() not in (
+    "0",
+    "false",
+)
+
+# Upper bounds of the histogram buckets, in seconds.
+BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# The (stage, seconds) of the stages timed so far in the current request.
+_stages: ContextVar[Optional[list]] = ContextVar("openbb_swaps_stages", default=None)
+
+_disabled = nullcontext()
+
+
+class _Span:
+    """Context manager adding the duration of a stage to the current request."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        """Initialize the span of a stage."""
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        """Start timing the stage."""
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        """Add the duration of the stage to the current request, if any."""
+        stages = _stages.get()
+        if stages is not None:
+            stages.append((self.name, time.perf_counter() - self.start))
+        return False
+
+
+def span(name: str):
+    """Time a stage of the current request, as a context manager."""
+    return _Span(name) if TIMING_ENABLED else _disabled
+
+
+class StageHistograms:
+    """Histograms of the durations of the stages of requests, by path and stage."""
+
+    def __init__(self, buckets: tuple = BUCKETS):
+        """Initialize the empty histograms."""
+        self.buckets = buckets
+        # (path, stage) -> [bucket counts..., +Inf count], sum
+        self._histograms: dict = {}
+        self._lock = threading.Lock()
+
+    def observe(self, path: str, stages: list):
+        """Add the (stage, seconds) durations of a request to the histograms."""
+        with self._lock:
+            for stage, seconds in stages:
+                histogram = self._histograms.get((path, stage))
+                if histogram is None:
+                    histogram = self._histograms[(path, stage)] = [
+                        [0] * (len(self.buckets) + 1),
+                        0.0,
+                    ]
+                histogram[0][bisect_left(self.buckets, seconds)] += 1
+                histogram[1] += seconds
+
+    def render(self) -> str:
+        """Get the histograms in the Prometheus text exposition format."""
+        name = "openbb_swaps_stage_seconds"
+        lines = [
+            f"# HELP {name} Duration of the stages of requests, by path and stage.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            histograms = [
+                (key, list(counts), total)
+                for key, (counts, total) in sorted(self._histograms.items())
+            ]
+
+        for (path, stage), counts, total in histograms:
+            labels = f'path="{path}",stage="{stage}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {total}")
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+
+        return "\n".join(lines) + "\n"
+
+
+stage_histograms = StageHistograms()
+
+
+def _server_timing(stages: list, total: float) -> bytes:
+    """Get the Server-Timing header value of the stages of a request."""
+    durations: dict = {}
+    for stage, seconds in stages:
+        durations[stage] = durations.get(stage, 0.0) + seconds
+    durations["total"] = total
+    return ", ".join(
+        f"{stage};dur={seconds * 1000:.3f}" for stage, seconds in durations.items()
+    ).encode("latin-1")
+
+
+class TimingMiddleware:
+    """ASGI middleware timing the stages of the requests to a set of paths.
+
+    The `Server-Timing` header lists the stages finished when the response starts.
+    Stages of a streamed body are observed in the histograms when it ends.
+    """
+
+    def __init__(self, app, paths: set):
+        """Initialize the middleware for the requests to the given paths."""
+        self.app = app
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        """Time the request and add its Server-Timing header."""
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        stages: list = []
+        token = _stages.set(stages)
+        start = time.perf_counter()
+        total = 0.0
+
+        async def send_with_timing(message):
+            """Add the Server-Timing header to the start of the response."""
+            nonlocal total
+            if message["type"] == "http.response.start":
+                total = time.perf_counter() - start
+                message = {
+                    **message,
+                    "headers": list(message.get("headers", []))
+                    + [(b"server-timing", _server_timing(stages, total))],
+                }
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _stages.reset(token)
+            stage_histograms.observe(
+                scope["path"],
+                stages + [("total", total or time.perf_counter() - start)],
+            )
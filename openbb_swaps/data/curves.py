@@ -0,0 +1,204 @@
+"""Interpolated Swap Curves."""
+
+from typing import TYPE_CHECKING, Literal
+
+from openbb_core.app.model.abstract.error import OpenBBError
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+CurveMethod = Literal["monotone", "cubic", "linear"]
+
+
+def _monotone_slopes(x, y):
+    """Get the knot slopes of a monotone piecewise cubic (Fritsch-Carlson).
+
+    Interior slopes are the weighted harmonic mean of the neighbouring secants,
+    and zero at local extrema, so the curve does not overshoot between knots.
+    End slopes are the shape-preserving three-point estimates.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import errstate, sign, where
+
+    h = x[1:] - x[:-1]
+    delta = (y[1:] - y[:-1]) / h
+    slopes = y * 0.0
+
+    if len(x) == 2:
+        slopes[:] = delta[0]
+        return slopes
+
+    w1 = 2 * h[1:] + h[:-1]
+    w2 = h[1:] + 2 * h[:-1]
+    with errstate(divide="ignore", invalid="ignore"):
+        mean = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+    slopes[1:-1] = where(delta[:-1] * delta[1:] > 0, mean, 0.0)
+
+    for end, h0, h1, d0, d1 in (
+        (0, h[0], h[1], delta[0], delta[1]),
+        (-1, h[-1], h[-2], delta[-1], delta[-2]),
+    ):
+        slope = ((2 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+        if sign(slope) != sign(d0):
+            slope = 0.0
+        elif sign(d0) != sign(d1) and abs(slope) > abs(3 * d0):
+            slope = 3 * d0
+        slopes[end] = slope
+
+    return slopes
+
+
+def _spline_slopes(x, y):
+    """Get the knot slopes of a natural cubic spline."""
+    # pylint: disable=import-outside-toplevel
+    from numpy import zeros
+    from numpy.linalg import solve
+
+    n = len(x)
+    h = x[1:] - x[:-1]
+    delta = (y[1:] - y[:-1]) / h
+
+    # Second derivatives at the knots, zero at both ends.
+    system = zeros((n, n))
+    rhs = zeros(n)
+    system[0, 0] = system[-1, -1] = 1.0
+    for i in range(1, n - 1):
+        system[i, i - 1 : i + 2] = h[i - 1], 2 * (h[i - 1] + h[i]), h[i]
+        rhs[i] = 6 * (delta[i] - delta[i - 1])
+    m = solve(system, rhs)
+
+    slopes = y * 0.0
+    slopes[:-1] = delta - h * (2 * m[:-1] + m[1:]) / 6
+    slopes[-1] = delta[-1] + h[-1] * (m[-2] + 2 * m[-1]) / 6
+    return slopes
+
+
+class SwapCurve:
+    """Interpolated par swap curve of one date, in percent, by maturity in years.
+
+    Between knots the curve is a cubic Hermite segment, with the knot slopes of the
+    method: "monotone" (Fritsch-Carlson, no overshoot), "cubic" (natural spline),
+    or "linear". Maturities outside the knots are held flat at the first or last rate,
+    and a curve of a single point is flat.
+
+    Zero rates, annually compounded, are bootstrapped from the par rates of annual-pay
+    swaps at every whole year of the curve, and interpolated with the same method.
+    """
+
+    def __init__(self, maturities, rates, method: CurveMethod = "monotone"):
+        """Initialize the curve from its sorted, distinct knot maturities and rates."""
+        self.maturities = maturities
+        self.rates = rates
+        self.method = method
+        self.slopes = (
+            None
+            if method == "linear" or len(maturities) < 2
+            else (
+                _monotone_slopes(maturities, rates)
+                if method == "monotone"
+                else _spline_slopes(maturities, rates)
+            )
+        )
+        self._zero_curve: "SwapCurve | None" = None
+
+    def par(self, maturities):
+        """Evaluate the par rates at an array of maturities, in one pass."""
+        # pylint: disable=import-outside-toplevel
+        from numpy import asarray, clip, interp
+
+        knots = self.maturities
+        at = clip(asarray(maturities, dtype="float64"), knots[0], knots[-1])
+        if self.slopes is None:
+            return interp(at, knots, self.rates)
+
+        k = clip(knots.searchsorted(at, side="right") - 1, 0, len(knots) - 2)
+        h = knots[k + 1] - knots[k]
+        t = (at - knots[k]) / h
+        t2 = t * t
+        t3 = t2 * t
+        return (
+            (2 * t3 - 3 * t2 + 1) * self.rates[k]
+            + (t3 - 2 * t2 + t) * h * self.slopes[k]
+            + (3 * t2 - 2 * t3) * self.rates[k + 1]
+            + (t3 - t2) * h * self.slopes[k + 1]
+        )
+
+    def zero(self, maturities):
+        """Evaluate the bootstrapped zero rates at an array of maturities."""
+        if self._zero_curve is None:
+            self._zero_curve = self._bootstrap()
+        return self._zero_curve.par(maturities)
+
+    def _bootstrap(self) -> "SwapCurve":
+        """Bootstrap the zero curve from the par rates at every whole year."""
+        # pylint: disable=import-outside-toplevel
+        from numpy import arange, empty
+
+        years = arange(1, int(self.maturities[-1]) + 1, dtype="float64")
+        if len(years) < 2:
+            return self
+
+        par = self.par(years) / 100
+        discounts = empty(len(years))
+        annuity = 0.0
+        for i, rate in enumerate(par):
+            discounts[i] = (1 - rate * annuity) / (1 + rate)
+            annuity += discounts[i]
+
+        zeros = (discounts ** (-1 / years) - 1) * 100
+        return SwapCurve(years, zeros, self.method)
+
+
+class SwapCurves:
+    """The pricing curve points of a currency, by swap type and spot date.
+
+    Curves are built on first use, for each date and method, and kept for later requests.
+    """
+
+    def __init__(self, points: dict):
+        """Initialize from the (maturities, rates) knots, by swap type and ISO date."""
+        self.points = points
+        self._curves: dict = {}
+
+    @classmethod
+    def from_frame(cls, df: "DataFrame") -> "SwapCurves":
+        """Collect the "Pricing Rate" points of a normalized trades sheet."""
+        # pylint: disable=import-outside-toplevel
+        from numpy import datetime_as_string
+
+        rows = (
+            df[df.type == "Pricing Rate"]
+            .drop_duplicates(["swap.type", "spot_date", "time.to.mat"], keep="last")
+            .sort_values(["spot_date", "time.to.mat"])
+        )
+        points: dict = {}
+
+        for (swap_type, spot_date), group in rows.groupby(
+            ["swap.type", "spot_date"], observed=True, sort=True
+        ):
+            date = str(datetime_as_string(spot_date.to_datetime64(), unit="D"))
+            points.setdefault(str(swap_type), {})[date] = (
+                group["time.to.mat"].to_numpy(dtype="float64"),
+                group["strike"].multiply(100).round(4).to_numpy(dtype="float64"),
+            )
+
+        return cls(points)
+
+    def get_dates(self, swap_type: str) -> list:
+        """Get the dates with a curve for a swap type, latest first."""
+        return [
+            {"label": date, "value": date}
+            for date in sorted(self.points.get(swap_type, {}), reverse=True)
+        ]
+
+    def get_curve(self, swap_type: str, date: str, method: CurveMethod) -> SwapCurve:
+        """Get the interpolated curve of a swap type on a date."""
+        key = (swap_type, date, method)
+        curve = self._curves.get(key)
+        if curve is None:
+            knots = self.points.get(swap_type, {}).get(date)
+            if knots is None:
+                raise OpenBBError(f"No {swap_type} curve found for {date}.")
+            curve = self._curves.setdefault(key, SwapCurve(*knots, method))
+        return curve
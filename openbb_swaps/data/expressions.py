@@ -0,0 +1,53 @@
+"""Swap Curve Spread and Butterfly Expressions."""
+
+import re
+from typing import Optional
+
+from openbb_swaps.models.query_params import SWAP_TENOR_CHOICES
+
+PAR_TENORS = [d["value"] for d in SWAP_TENOR_CHOICES if d["value"].isdigit()]
+
+EXPRESSION_PATTERN = re.compile(r"(\d+)s(\d+)s(?:(\d+)s)?")
+
+
+def parse_expression(expression: str) -> Optional[tuple[list, list]]:
+    """Get the par tenors and weights of a spread or butterfly expression.
+
+    A spread "AsBs" is the B year rate less the A year rate. A butterfly "AsBsCs" is
+    the A and C year rates less twice the B year rate. Like "1s5s" and "2s5s10s".
+
+    Returns None when the expression is not a spread or butterfly of distinct par tenors.
+    """
+    match = EXPRESSION_PATTERN.fullmatch(expression)
+    if match is None:
+        return None
+    tenors = [tenor for tenor in match.groups() if tenor is not None]
+    if len(set(tenors)) < len(tenors) or not set(tenors).issubset(PAR_TENORS):
+        return None
+    weights = [-1.0, 1.0] if len(tenors) == 2 else [1.0, -2.0, 1.0]
+    return tenors, weights
+
+
+def evaluate_expressions(values, legs: list, weights: list):
+    """Evaluate expressions over the columns of a matrix, all in one pass.
+
+    Parameters
+    ----------
+    values : ndarray
+        The matrix of rates, one column per series.
+    legs : list
+        The column positions of the legs of each expression, padded to three legs
+        by repeating the first leg.
+    weights : list
+        The weights of the legs of each expression, padded with zeros.
+
+    Returns
+    -------
+    ndarray
+        One column per expression, rounded to 4 decimals.
+        Rows where any leg is missing are NaN.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import asarray
+
+    return (values[:, asarray(legs)] * asarray(weights)).sum(axis=2).round(4)
@@ -0,0 +1,128 @@
+"""Swaps Sheet Normalization."""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+SWAP_SHEET_DTYPES = {
+    "curve_date": "datetime64[ns]",
+    "spot_date": "datetime64[ns]",
+    "rate": "float64",
+    "strike": "float64",
+    "cleared": "bool",
+    "forward_starting": "bool",
+}
+
+# String columns with few distinct values, stored as integer codes.
+SWAP_SHEET_CATEGORIES = ["swap.type", "metric", "currency", "Bucket", "type"]
+
+# Columns summed over many rows, kept at 64 bits so that their sums cannot overflow.
+SWAP_SHEET_ADDITIVE = ["notional", "pv01"]
+
+
+def _compact_column(values):
+    """Get the smallest representation of a numeric column that keeps every value.
+
+    Integers are downcast to the smallest integer type holding their range.
+    Floats are downcast to float32 only when every value survives the round trip.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import array_equal, float32, iinfo, int8, int16, int32
+
+    if values.dtype.kind == "i" and len(values) > 0:
+        low, high = values.min(), values.max()
+        for candidate in (int8, int16, int32):
+            if iinfo(candidate).min <= low and high <= iinfo(candidate).max:
+                return values.astype(candidate)
+    elif values.dtype.kind == "f" and values.dtype.itemsize > 4:
+        compact = values.astype(float32)
+        if array_equal(compact.astype(values.dtype), values, equal_nan=True):
+            return compact
+    return values
+
+
+def _widen_column(values):
+    """Get a numeric column as 64-bit integers or floats."""
+    if values.dtype.kind in "iu" and values.dtype.itemsize < 8:
+        return values.astype("int64")
+    if values.dtype.kind == "f" and values.dtype.itemsize < 8:
+        return values.astype("float64")
+    return values
+
+
+def normalize_frame(df: "DataFrame") -> "DataFrame":
+    """Cast the swap sheet columns to their compact dtypes, backed by read-only arrays.
+
+    Known columns are cast to their dtypes, and string columns of labels to
+    categoricals, with their categories sorted. Additive columns, like notionals,
+    are 64-bit. Other numeric columns are downcast where no value changes.
+    Dates stay datetime64 values, compared as integers.
+
+    Columns already of the right dtype are not copied, so columns memory-mapped
+    from a snapshot stay shared with every other process mapping it.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import dtype
+    from pandas import CategoricalDtype, DataFrame
+
+    casts = {
+        k: v
+        for k, v in SWAP_SHEET_DTYPES.items()
+        if k in df.columns and df[k].dtype != v
+    }
+    casts.update(
+        {
+            col: "category"
+            for col in SWAP_SHEET_CATEGORIES
+            if col in df.columns and not isinstance(df[col].dtype, CategoricalDtype)
+        }
+    )
+    if casts:
+        df = df.astype(casts)
+
+    for col in SWAP_SHEET_CATEGORIES:
+        if col in df.columns and not df[col].cat.categories.is_monotonic_increasing:
+            # Sorted categories group and sort like the strings they encode.
+            df = df.assign(
+                **{col: df[col].cat.reorder_categories(sorted(df[col].cat.categories))}
+            )
+
+    columns: dict = {}
+
+    for col in df.columns:
+        if isinstance(df[col].dtype, dtype):
+            values = df[col].to_numpy()
+            if col in SWAP_SHEET_ADDITIVE:
+                values = _widen_column(values)
+            elif col not in SWAP_SHEET_DTYPES:
+                values = _compact_column(values)
+            if values.flags.writeable:
+                values = values.view()
+                values.flags.writeable = False
+            columns[col] = values
+        else:
+            columns[col] = df[col].array
+
+    return DataFrame(columns, index=df.index, copy=False)
+
+
+def bytes_saved(df: "DataFrame") -> int:
+    """Get the bytes a normalized sheet saves over plain strings and 64-bit numbers."""
+    # pylint: disable=import-outside-toplevel
+    from pandas import CategoricalDtype
+
+    saved = 0
+
+    for col in df.columns:
+        values = df[col]
+        if isinstance(values.dtype, CategoricalDtype):
+            expanded = values.astype(object).memory_usage(index=False, deep=True)
+        elif values.dtype.kind in "iuf":
+            expanded = len(values) * 8
+        else:
+            continue
+        saved += expanded - values.memory_usage(index=False, deep=True)
+
+    return int(saved)
@@ -0,0 +1,473 @@
+"""Incremental Ingestion of DTCC Daily Swap Files.
+
+DTCC publishes a daily cumulative file of the interest rate swaps reported to its
+swap data repository. Each file is parsed into the rows of the three sheets the
+application reads, for each currency:
+
+- "Trades and Pricing Curve": the fixed-for-floating trades of the day, with their
+  tenor, fixed rate, clearing and forward-starting flags, and the day's pricing curve.
+- "Interest Rates": the median fixed rate of the cleared, spot-starting trades at
+  each standard tenor, with the spreads and butterflies derived from them.
+- "Trading Data": the notional and PV01 of the trades, by swap type and tenor bucket.
+
+The rows are appended to the snapshot as new segments. History is never rewritten:
+files already ingested, and days already in the data, are skipped. The snapshot
+manifest is replaced atomically after each file, which changes the data version
+the application serves, and running workers pick the new rows up without
+reloading the rest. One ingest runs at a time, and the segments of a file that
+fails are removed, so a retry starts from the last file ingested.
+
+Ingest files with the `openbb-swaps-ingest` command.
+"""
+
+import hashlib
+import logging
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Union
+
+from openbb_swaps.data.options import SWAP_VOLUME_BUCKETS
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+# Columns of the DTCC public dissemination report that are read.
+DTCC_COLUMNS = {
+    "action": "Action type",
+    "executed": "Execution Timestamp",
+    "effective": "Effective Date",
+    "expiration": "Expiration Date",
+    "cleared": "Cleared",
+    "notional": "Notional amount-Leg 1",
+    "currency": "Notional currency-Leg 1",
+    "fixed_rate_1": "Fixed rate-Leg 1",
+    "fixed_rate_2": "Fixed rate-Leg 2",
+    "underlier_1": "Underlier ID-Leg 1",
+    "underlier_2": "Underlier ID-Leg 2",
+}
+
+SWAP_CURRENCIES = ["USD", "EUR", "GBP", "JPY"]
+
+# Overnight index swaps float on a risk-free rate. Other floating legs are
+# reported under the "Libor" swap type, like IBOR-linked swaps in the archive.
+OIS_UNDERLIERS = re.compile(r"SOFR|FEDFUND|ESTR|EUROSTR|€STR|SONIA|TONA|OIS", re.I)
+
+CURVE_TENORS = ["1", "2", "3", "4", "5", "7", "10", "15", "20", "30", "40", "50"]
+CURVE_SPREADS = {"1s5s": ("5", "1"), "2s10s": ("10", "2"), "5s20s": ("20", "5")}
+CURVE_BUTTERFLIES = {"2s5s10s": ("2", "5", "10"), "2s10s30s": ("2", "10", "30")}
+
+# Years from a standard tenor within which a trade prices it.
+TENOR_TOLERANCE = 0.1
+# Difference from the median rate of its tenor beyond which a trade is an outlier.
+OUTLIER_THRESHOLD = 0.01
+
+# File in the snapshot directory locked while an ingest runs.
+INGEST_LOCK_NAME = ".ingest.lock"
+
+
+def file_digest(path: Path) -> str:
+    """Get the SHA256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_trades(path: Union[str, Path]) -> "DataFrame":
+    """Read the new fixed-for-floating swap trades of a daily file.
+
+    The file is a CSV, or a ZIP archive of one, as published by DTCC.
+    Trades without a single fixed leg, dates, or a positive notional are dropped.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import busday_count, where
+    from pandas import DataFrame, read_csv, to_datetime, to_numeric
+
+    raw = read_csv(path, usecols=list(DTCC_COLUMNS.values()), dtype=str)
+    raw = raw.rename(columns={v: k for k, v in DTCC_COLUMNS.items()})
+    raw = raw[raw["action"].str.upper() == "NEWT"]
+
+    fixed_1 = to_numeric(raw["fixed_rate_1"], errors="coerce")
+    fixed_2 = to_numeric(raw["fixed_rate_2"], errors="coerce")
+    notional = to_numeric(
+        raw["notional"].str.replace(r"[,+]", "", regex=True), errors="coerce"
+    )
+    underliers = raw["underlier_1"].fillna("") + " " + raw["underlier_2"].fillna("")
+
+    trades = DataFrame(
+        {
+            "spot_date": to_datetime(raw["executed"], errors="coerce", utc=True)
+            .dt.tz_localize(None)
+            .dt.normalize(),
+            "effective": to_datetime(raw["effective"], errors="coerce"),
+            "expiration": to_datetime(raw["expiration"], errors="coerce"),
+            "currency": raw["currency"].str.upper(),
+            "swap.type": where(underliers.str.contains(OIS_UNDERLIERS), "OIS", "Libor"),
+            "cleared": raw["cleared"].str.upper() == "Y",
+            "notional": notional,
+            "strike": fixed_1.fillna(fixed_2),
+        }
+    )
+    trades = trades[
+        (fixed_1.isna() != fixed_2.isna())
+        & trades["currency"].isin(SWAP_CURRENCIES)
+        & trades["notional"].gt(0)
+        & trades[["spot_date", "effective", "expiration"]].notna().all(axis=1)
+        & (trades["expiration"] > trades["effective"])
+    ]
+
+    trades["time.to.mat"] = (trades["expiration"] - trades["effective"]).dt.days / 365
+    # Spot starting trades settle within two business days of the trade.
+    trades["forward_starting"] = (
+        busday_count(
+            trades["spot_date"].to_numpy().astype("datetime64[D]"),
+            trades["effective"].to_numpy().astype("datetime64[D]"),
+        )
+        > 2
+    )
+    trades["notional"] = trades["notional"].astype("int64")
+
+    return trades.reset_index(drop=True)
+
+
+def flag_outliers(trades: "DataFrame") -> "DataFrame":
+    """Flag the trades far from the median rate of their currency, swap type and tenor."""
+    tenor = trades["time.to.mat"].round()
+    median = trades.groupby(
+        [trades["currency"], trades["swap.type"], tenor], sort=False
+    )["strike"].transform("median")
+    return trades.assign(
+        outlier=((trades["strike"] - median).abs() > OUTLIER_THRESHOLD).astype("int64")
+    )
+
+
+def rates_sheet(trades: "DataFrame") -> "DataFrame":
+    """Get the "Interest Rates" rows of a day's trades.
+
+    Each trade prices the standard tenor within `TENOR_TOLERANCE` of its maturity,
+    if any. The median rates of every swap type, date and tenor are computed in one
+    grouping, and the spreads and butterflies from their columns.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import abs as np_abs, array, isnan
+    from pandas import DataFrame
+
+    priced = trades[
+        trades["cleared"] & ~trades["forward_starting"] & (trades["outlier"] == 0)
+    ]
+    tenors = array([float(tenor) for tenor in CURVE_TENORS])
+    distance = np_abs(priced["time.to.mat"].to_numpy()[:, None] - tenors)
+    nearest = distance.argmin(axis=1)
+    near = distance.min(axis=1, initial=float("inf")) <= TENOR_TOLERANCE
+
+    rates = (
+        priced[near]
+        .assign(metric=array(CURVE_TENORS, dtype=object)[nearest[near]])
+        .groupby(["swap.type", "spot_date", "metric"])["strike"]
+        .median()
+        .unstack("metric")
+        .reindex(columns=CURVE_TENORS)
+    )
+    for name, (long, short) in CURVE_SPREADS.items():
+        rates[name] = rates[long] - rates[short]
+    for name, (short, belly, long) in CURVE_BUTTERFLIES.items():
+        rates[name] = rates[short] + rates[long] - 2 * rates[belly]
+
+    # Rows of every date, in the order of the metrics, skipping missing rates.
+    values = rates.to_numpy()
+    rows, columns = (~isnan(values)).nonzero()
+    return DataFrame(
+        {
+            "swap.type": rates.index.get_level_values("swap.type")[rows],
+            "curve_date": rates.index.get_level_values("spot_date")[rows],
+            "metric": rates.columns[columns],
+            "rate": values[rows, columns],
+        }
+    ).astype({"curve_date": "datetime64[ns]", "rate": "float64"})
+
+
+def volume_sheet(trades: "DataFrame") -> "DataFrame":
+    """Get the "Trading Data" rows of a day's trades.
+
+    PV01 is the change in value of the fixed leg for a one basis point move,
+    with annual coupons discounted at the trade's fixed rate.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import inf
+    from pandas import cut
+
+    edges = [0.0] + [float(bucket.split("-")[1]) for bucket in SWAP_VOLUME_BUCKETS]
+    edges[-1] = inf
+    years = trades["time.to.mat"]
+    rate = trades["strike"].where(trades["strike"].abs() > 1e-9, 1e-9)
+    annuity = (1 - (1 + rate) ** -years) / rate
+
+    volume = trades.assign(
+        Bucket=cut(years.round(1), edges, labels=SWAP_VOLUME_BUCKETS).astype(str),
+        pv01=trades["notional"] * annuity * 1e-4,
+    )
+    return (
+        volume.groupby(["swap.type", "spot_date", "currency", "Bucket"], sort=True)
+        .agg({"notional": "sum", "pv01": "sum"})
+        .reset_index()
+    )
+
+
+def trades_sheet(trades: "DataFrame", rates: "DataFrame") -> "DataFrame":
+    """Get the "Trades and Pricing Curve" rows of a day's trades and rates.
+
+    The pricing curve is the OIS rate at each standard tenor.
+    """
+    # pylint: disable=import-outside-toplevel
+    from pandas import concat
+
+    curve = rates[
+        (rates["swap.type"] == "OIS") & rates["metric"].isin(CURVE_TENORS)
+    ].assign(
+        **{
+            "time.to.mat": lambda df: df["metric"].astype(float),
+            "cleared": False,
+            "forward_starting": False,
+            "outlier": 0,
+            "type": "Pricing Rate",
+        }
+    )
+    curve = curve.rename(columns={"curve_date": "spot_date", "rate": "strike"})
+    # Like the archive, only the rows of the pricing curve have a swap type.
+    trades = trades.assign(
+        **{"swap.type": None},
+        type=(trades["cleared"] & ~trades["forward_starting"]).map(
+            {
+                True: "Cleared and spot starting",
+                False: "Non cleared and/or forward starting",
+            }
+        ),
+    )
+    columns = [
+        "spot_date",
+        "time.to.mat",
+        "strike",
+        "swap.type",
+        "cleared",
+        "forward_starting",
+        "outlier",
+        "type",
+    ]
+    return concat(
+        [curve.sort_values("time.to.mat")[columns], trades[columns]], ignore_index=True
+    )
+
+
+def parse_daily_file(path: Union[str, Path]) -> dict:
+    """Parse a DTCC daily file into sheets of rows, by store key and sheet name."""
+    # pylint: disable=import-outside-toplevel
+    from openbb_swaps.data.frames import normalize_frame
+
+    trades = flag_outliers(read_trades(path))
+    stores: dict = {}
+
+    for currency, rows in trades.groupby("currency"):
+        rates = rates_sheet(rows)
+        stores[f"{currency.lower()}_swaps"] = {
+            "Interest Rates": normalize_frame(rates),
+            "Trading Data": normalize_frame(volume_sheet(rows)),
+            "Trades and Pricing Curve": normalize_frame(trades_sheet(rows, rates)),
+        }
+
+    return stores
+
+
+SHEET_DATE_COLUMNS = {
+    "Interest Rates": "curve_date",
+    "Trading Data": "spot_date",
+    "Trades and Pricing Curve": "spot_date",
+}
+
+
+def _segment_dtype(values, stored):
+    """Get the dtype to write the new values of a column with.
+
+    It is the stored dtype of the column when every value fits in it, or the
+    wider dtype of both when casting down would change a value.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import array_equal, errstate, result_type
+
+    if stored.kind not in "iuf" or values.dtype.kind not in "iuf":
+        return stored
+    with errstate(invalid="ignore", over="ignore"):
+        cast = values.astype(stored)
+    if array_equal(cast.astype(values.dtype), values, equal_nan=True):
+        return stored
+    return result_type(stored, values.dtype)
+
+
+@contextmanager
+def ingest_lock(snapshot_path: Path) -> Iterator[None]:
+    """Hold the ingest lock of a snapshot, so that one ingest runs at a time.
+
+    The lock is released when the process exits, even if it crashes.
+
+    Raises
+    ------
+    RuntimeError
+        When another ingest holds the lock.
+    """
+    # pylint: disable=import-outside-toplevel
+    import fcntl
+
+    with open(Path(snapshot_path) / INGEST_LOCK_NAME, "a", encoding="utf-8") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError as e:
+            raise RuntimeError(
+                f"Another ingest into {snapshot_path} is running."
+            ) from e
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def ingest_files(paths: list, snapshot_path: Path) -> dict:
+    """Append the rows of DTCC daily files to a snapshot.
+
+    Files already ingested are skipped, as are the days a sheet already has.
+    The manifest is replaced after each file, once its segments are written.
+    When a file fails, its segments are removed and the files before it stay
+    ingested. Segments left by an ingest that crashed are removed first.
+    The segments are folded into the columns of their sheets at the end.
+
+    Returns
+    -------
+    dict
+        The number of rows appended, by store key and sheet name.
+    """
+    with ingest_lock(snapshot_path):
+        return _ingest_files(paths, Path(snapshot_path))
+
+
+def _append_file(path, snapshot, manifest: dict) -> dict:
+    """Write the new rows of a daily file as segments, and list them in the manifest.
+
+    Returns the number of rows appended, by store key and sheet name.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import unique
+    from openbb_swaps.data.snapshot import write_segment
+
+    appended: dict = {}
+
+    for store_key, sheets in parse_daily_file(path).items():
+        if store_key not in manifest["stores"]:
+            continue
+        for sheet_name, df in sheets.items():
+            date_column = SHEET_DATE_COLUMNS[sheet_name]
+            # Only the dates of the sheet are read, not its other columns.
+            existing_dates = unique(
+                snapshot.get_column(store_key, sheet_name, date_column)
+            )
+            dtypes = snapshot.column_dtypes(store_key, sheet_name)
+            # Segments have the columns and dtypes of the rows they extend.
+            # Categories are written as strings, so new labels are kept.
+            df = df[~df[date_column].isin(existing_dates)]
+            df = df[list(dtypes)]
+            df = df.astype(
+                {
+                    col: object
+                    if dtype == "category"
+                    else _segment_dtype(df[col].to_numpy(), dtype)
+                    for col, dtype in dtypes.items()
+                }
+            )
+            if len(df) == 0:
+                continue
+            write_segment(snapshot.path, manifest, store_key, sheet_name, df)
+            appended.setdefault(store_key, {})[sheet_name] = len(df)
+
+    return appended
+
+
+def _ingest_files(paths: list, snapshot_path: Path) -> dict:
+    """Append the rows of DTCC daily files to a snapshot, holding its ingest lock."""
+    # pylint: disable=import-outside-toplevel
+    import copy
+    import json
+
+    from openbb_swaps.data.snapshot import (
+        MANIFEST_NAME,
+        SwapsSnapshot,
+        compact_snapshot,
+        remove_unlisted_segments,
+        write_manifest,
+    )
+
+    with open(snapshot_path / MANIFEST_NAME, encoding="utf-8") as f:
+        manifest = json.load(f)
+    for segment_dir in remove_unlisted_segments(snapshot_path, manifest):
+        logger.warning("Removed %s, left by an ingest that failed.", segment_dir)
+    snapshot = SwapsSnapshot(snapshot_path, manifest)
+    ingested = {delta["sha256"] for delta in snapshot.deltas}
+    appended: dict = {}
+
+    for path in paths:
+        digest = file_digest(path)
+        if digest in ingested:
+            logger.info("Skipping %s, it was already ingested.", path)
+            continue
+
+        # The segments of the file are listed in a copy of the manifest,
+        # which replaces it once they are all written.
+        updated = copy.deepcopy(manifest)
+        try:
+            counts = _append_file(path, snapshot, updated)
+        except BaseException:
+            remove_unlisted_segments(snapshot_path, manifest)
+            raise
+        updated.setdefault("deltas", []).append(
+            {"name": Path(path).name, "sha256": digest, "ingested": time.time()}
+        )
+        write_manifest(snapshot_path, updated)
+
+        manifest = updated
+        ingested.add(digest)
+        snapshot = SwapsSnapshot(snapshot_path, manifest)
+        for store_key, sheets in counts.items():
+            for sheet_name, rows in sheets.items():
+                totals = appended.setdefault(store_key, {})
+                totals[sheet_name] = totals.get(sheet_name, 0) + rows
+
+    compact_snapshot(snapshot_path, manifest)
+
+    return appended
+
+
+def main():
+    """Ingest DTCC daily files into the swaps data snapshot."""
+    # pylint: disable=import-outside-toplevel
+    import argparse
+
+    from openbb_swaps.data.snapshot import snapshot_path
+
+    parser = argparse.ArgumentParser(
+        description="Append DTCC daily swap files to the swaps data snapshot."
+    )
+    parser.add_argument("files", nargs="+", help="DTCC daily CSV or ZIP files.")
+    parser.add_argument("--snapshot", default=str(snapshot_path))
+    args = parser.parse_args()
+
+    appended = ingest_files(args.files, Path(args.snapshot))
+    for store_key, sheets in appended.items():
+        for sheet_name, rows in sheets.items():
+            print(f"{store_key} / {sheet_name}: {rows} rows appended")  # noqa: T201
+    if not appended:
+        print("No new rows to append.")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Swaps Widget Options Catalog."""
+
+from typing import TYPE_CHECKING
+
+from openbb_swaps.models.query_params import SWAP_TENOR_CHOICES
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+SWAP_VOLUME_BUCKETS = [
+    "0-1",
+    "1-3",
+    "3-4",
+    "4-5",
+    "5-7",
+    "7-10",
+    "10-15",
+    "15-20",
+    "20-25",
+    "25-30",
+    "30-40",
+    "40-50",
+]
+
+
+class SwapOptions:
+    """The option lists of the widget parameters for one currency.
+
+    Tenors and trade dates are indexed by swap type, with "Both" covering all types.
+    Lists are shared between requests and must not be modified.
+    """
+
+    def __init__(self, tenors: dict, buckets: list, dates: dict, trade_dates: list):
+        """Initialize the catalog from its option lists."""
+        self.tenors = tenors
+        self.buckets = buckets
+        self.dates = dates
+        self.trade_dates = trade_dates
+
+    @classmethod
+    def from_frames(
+        cls, rates: "DataFrame", trades: "DataFrame", pricing: "DataFrame"
+    ) -> "SwapOptions":
+        """Build the catalog from the rates, trading data, and trades sheets."""
+        # pylint: disable=import-outside-toplevel
+        from numpy import datetime_as_string, unique
+
+        tenors: dict = {}
+        dates: dict = {}
+        swap_types = set(rates["swap.type"].unique().tolist())
+        swap_types.update(trades["swap.type"].unique().tolist())
+
+        for swap_type in sorted(swap_types) + ["Both"]:
+            rate_rows = (
+                rates if swap_type == "Both" else rates[rates["swap.type"] == swap_type]
+            )
+            trade_rows = (
+                trades
+                if swap_type == "Both"
+                else trades[trades["swap.type"] == swap_type]
+            )
+            metrics = set(rate_rows["metric"].unique().tolist())
+            tenors[swap_type] = [d for d in SWAP_TENOR_CHOICES if d["value"] in metrics]
+            spot_dates = datetime_as_string(
+                unique(trade_rows["spot_date"].to_numpy())[::-1], unit="D"
+            ).tolist()
+            dates[swap_type] = [{"label": date, "value": date} for date in spot_dates]
+
+        present = set(trades["Bucket"].unique().tolist())
+        buckets = [
+            {"label": bucket, "value": bucket}
+            for bucket in SWAP_VOLUME_BUCKETS
+            if bucket in present
+        ]
+
+        trade_dates = [
+            {"label": date, "value": date}
+            for date in datetime_as_string(
+                unique(pricing["spot_date"].to_numpy())[::-1], unit="D"
+            ).tolist()
+        ]
+
+        return cls(tenors, buckets, dates, trade_dates)
+
+    def get_tenors(self, swap_type: str) -> list:
+        """Get the tenor choices with rates for a swap type."""
+        return self.tenors.get(swap_type, [])
+
+    def get_dates(self, swap_type: str) -> list:
+        """Get the spot dates with trades for a swap type, latest first."""
+        return self.dates.get(swap_type, [])
+
+    def get_trade_dates(self) -> list:
+        """Get the spot dates of the individual trades, latest first."""
+        return self.trade_dates
@@ -0,0 +1,35 @@
+"""Date-Partitioned Swaps Sheets."""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+class DatePartitions:
+    """A sheet sorted by a date column, for O(log n) single-date lookups.
+
+    Rows are sorted stably, so rows of the same date keep their order in the sheet.
+    The rows of a date are a contiguous range found by binary search.
+    """
+
+    def __init__(self, df: "DataFrame", date_column: str):
+        """Sort the sheet by its date column."""
+        self.date_column = date_column
+        self.frame = df.sort_values(by=date_column, kind="stable")
+        self.dates = self.frame[date_column].to_numpy()
+
+    @property
+    def last_date(self):
+        """Get the latest date of the sheet, or None when it is empty."""
+        return self.dates[-1] if len(self.dates) else None
+
+    def get(self, date) -> "DataFrame":
+        """Get a read-only view of the rows for a date."""
+        # pylint: disable=import-outside-toplevel
+        from pandas import Timestamp
+
+        date = Timestamp(date).to_datetime64()
+        start = self.dates.searchsorted(date, side="left")
+        end = self.dates.searchsorted(date, side="right")
+        return self.frame.iloc[start:end].copy(deep=False)
@@ -0,0 +1,160 @@
+"""Lookback Period Windows of Date Series.
+
+Periods are resolved to row bounds of a sorted datetime64 date array, with the
+calendar arithmetic done on the single anchor date and the rows found by binary
+search, so no date is converted to a string or a Timestamp. Dates are formatted
+only when the rows returned are serialized.
+
+Windows are downsampled to weekly or monthly rows in one pass over their columns,
+with ufunc reductions over the runs of rows of each week or month.
+"""
+
+from typing import Literal, Optional
+
+# Calendar months of the lookback periods. YTD starts on January 1st.
+PERIOD_MONTHS = {"1m": 1, "3m": 3, "6m": 6, "1y": 12}
+
+Frequency = Literal["daily", "weekly", "monthly", "weekly_mean", "monthly_mean"]
+
+
+def period_start(last_date, period: str):
+    """Get the first date of a lookback period ending on the last date.
+
+    Months are counted back like `relativedelta`: the day of the month is kept,
+    or the last day of a shorter month. Returns None when the period has no start.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import datetime64, minimum
+
+    day = datetime64(last_date, "D")
+    if period in PERIOD_MONTHS:
+        month = day.astype("datetime64[M]")
+        target = month - PERIOD_MONTHS[period]
+        days_in_target = (target + 1).astype("datetime64[D]") - target.astype(
+            "datetime64[D]"
+        )
+        return target.astype("datetime64[D]") + minimum(
+            day - month.astype("datetime64[D]"), days_in_target - 1
+        )
+    if period == "YTD":
+        return day.astype("datetime64[Y]").astype("datetime64[D]")
+    return None
+
+
+def period_bounds(
+    dates,
+    period: str,
+    start_date=None,
+    end_date=None,
+    last_row: Optional[int] = None,
+) -> tuple:
+    """Get the [first, end) row bounds of a period of sorted dates.
+
+    Parameters
+    ----------
+    dates : ndarray
+        The sorted datetime64 dates of the series.
+    period : str
+        The lookback period, ending on the last date of the window.
+    start_date : datetime64 | str | None
+        The first date of the window. Overrides the start of the period.
+    end_date : datetime64 | str | None
+        The last date of the window. Default is the last date of the series.
+    last_row : int | None
+        The last row of the series with data. Default is the last row.
+
+    Returns
+    -------
+    tuple[int, int]
+        The first row, and the row after the last, of the window.
+        They are equal when the window has no dates.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import datetime64
+
+    end = len(dates) if last_row is None else last_row + 1
+    if end_date is not None:
+        end = min(
+            end,
+            int(
+                dates.searchsorted(
+                    datetime64(end_date, "D").astype(dates.dtype), side="right"
+                )
+            ),
+        )
+    if end <= 0:
+        return 0, 0
+
+    start = (
+        datetime64(start_date, "D")
+        if start_date is not None
+        else period_start(dates[end - 1], period)
+    )
+    first = (
+        0
+        if start is None
+        else int(dates.searchsorted(start.astype(dates.dtype), side="left"))
+    )
+
+    return min(first, end), end
+
+
+def resample(dates, columns: list, frequency: Frequency) -> tuple:
+    """Downsample sorted dates and their columns to one row per week or month.
+
+    Weeks start on Monday. Each row is dated on the last date of its week or month,
+    with the last value of each column in it, or the mean with a "_mean" frequency.
+    NaN values are skipped, and a column without values in a week or month is NaN.
+    Integer columns stay integers, with means rounded.
+
+    Returns
+    -------
+    tuple[ndarray, list[ndarray]]
+        The dates and columns of the rows. Daily data is returned as it is.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import (
+        add,
+        arange,
+        concatenate,
+        errstate,
+        flatnonzero,
+        isnan,
+        maximum,
+        nan,
+        ones,
+        rint,
+        where,
+    )
+
+    unit, _, how = frequency.partition("_")
+    if unit == "daily" or len(dates) == 0:
+        return dates, columns
+
+    if unit == "weekly":
+        # 1970-01-01 was a Thursday, so days since the epoch plus 3 start weeks on Monday.
+        keys = (dates.astype("datetime64[D]").astype("int64") + 3) // 7
+    else:
+        keys = dates.astype("datetime64[M]").astype("int64")
+
+    starts = concatenate([[0], flatnonzero(keys[1:] != keys[:-1]) + 1])
+    ends = concatenate([starts[1:], [len(dates)]]) - 1
+    rows = arange(len(dates))
+    resampled: list = []
+
+    for column in columns:
+        integer = column.dtype.kind in "iu"
+        valid = ones(len(column), dtype=bool) if integer else ~isnan(column)
+        if how == "mean":
+            with errstate(divide="ignore", invalid="ignore"):
+                values = add.reduceat(where(valid, column, 0), starts) / add.reduceat(
+                    valid.astype("int64"), starts
+                )
+            resampled.append(rint(values).astype(column.dtype) if integer else values)
+        else:
+            last = maximum.reduceat(where(valid, rows, -1), starts)
+            resampled.append(
+                column[last] if integer else where(last >= 0, column[last], nan)
+            )
+
+    return dates[ends], resampled
@@ -0,0 +1,242 @@
+"""Swap Rate Levels Matrix."""
+
+from typing import TYPE_CHECKING, Iterator
+
+from openbb_swaps.data.expressions import evaluate_expressions, parse_expression
+from openbb_swaps.data.periods import Frequency, period_bounds, resample
+from openbb_swaps.models.response_models import SwapRateLevelsResponseModel
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+SWAP_RATE_LEVELS_COLUMNS = [
+    v for k, v in SwapRateLevelsResponseModel.__alias_dict__.items() if k != "date"
+]
+
+
+class SwapRateLevels:
+    """Dense matrix of swap rate levels, in percent, by curve date.
+
+    Rows are the sorted curve dates of a currency, and columns are every
+    `{ois,libor}_{tenor}` series of `SwapRateLevelsResponseModel`.
+    Missing observations are NaN.
+
+    Other spreads and butterflies of par tenors are derived from the matrix on request.
+    """
+
+    def __init__(self, dates, columns: list, values):
+        """Initialize the matrix from its date index, column names and values."""
+        # pylint: disable=import-outside-toplevel
+        from numpy import arange, isnan, where
+
+        self.dates = dates
+        self.columns = columns
+        self.values = values
+        self._positions = {col: i for i, col in enumerate(columns)}
+        # Row of the last observation in each column, -1 when the column is empty.
+        rows = arange(len(dates))[:, None]
+        self._last_rows = where(~isnan(values), rows, -1).max(axis=0, initial=-1)
+
+    @classmethod
+    def from_frame(cls, df: "DataFrame") -> "SwapRateLevels":
+        """Build the matrix from a normalized "Interest Rates" sheet."""
+        # pylint: disable=import-outside-toplevel
+        from numpy import full, nan, unique
+        from pandas import Index
+
+        df = df.drop_duplicates(["curve_date", "swap.type", "metric"], keep="last")
+        columns = (
+            df["swap.type"].astype(str).str.lower() + "_" + df["metric"].astype(str)
+        )
+        column_positions = Index(SWAP_RATE_LEVELS_COLUMNS).get_indexer(columns)
+        df = df[column_positions >= 0]
+        column_positions = column_positions[column_positions >= 0]
+
+        dates, date_positions = unique(df["curve_date"].to_numpy(), return_inverse=True)
+        values = full((len(dates), len(SWAP_RATE_LEVELS_COLUMNS)), nan)
+        values[date_positions, column_positions] = (
+            df["rate"].multiply(100).round(4).to_numpy()
+        )
+        values.flags.writeable = False
+
+        return cls(dates, SWAP_RATE_LEVELS_COLUMNS, values)
+
+    def _series(self, names: list) -> dict:
+        """Get the columns and last rows of the named series with data or an expression.
+
+        Spread and butterfly expressions not stored in the data, like "ois_3s7s",
+        are evaluated from the columns of their par tenors, in one pass, for each
+        request. Nothing is cached, so the matrix can be shared by every thread.
+        """
+        # pylint: disable=import-outside-toplevel
+        from numpy import arange, isnan, where
+
+        derived: list = []
+        legs: list = []
+        weights: list = []
+
+        for name in names:
+            if name in self._positions or name in derived:
+                continue
+            swap_type, _, expression = name.partition("_")
+            parsed = parse_expression(expression)
+            if parsed is None:
+                continue
+            positions = [self._positions.get(f"{swap_type}_{t}") for t in parsed[0]]
+            if None in positions:
+                continue
+            derived.append(name)
+            legs.append(positions + positions[:1] * (3 - len(positions)))
+            weights.append(parsed[1] + [0.0] * (3 - len(parsed[1])))
+
+        evaluated: dict = {}
+        if derived:
+            block = evaluate_expressions(self.values, legs, weights)
+            rows = arange(len(self.dates))[:, None]
+            last_rows = where(~isnan(block), rows, -1).max(axis=0, initial=-1)
+            for i, name in enumerate(derived):
+                evaluated[name] = (block[:, i], int(last_rows[i]))
+
+        series: dict = {}
+        for name in names:
+            if name in self._positions:
+                i = self._positions[name]
+                series[name] = (self.values[:, i], int(self._last_rows[i]))
+            elif name in evaluated:
+                series[name] = evaluated[name]
+        return series
+
+    def has_data(self, swap_type: str, tenors: list) -> bool:
+        """Check that any of the tenors has data of the swap type, on any date."""
+        swap_types = ["libor", "ois"] if swap_type == "Both" else [swap_type.lower()]
+        series = self._series(
+            [f"{stype}_{tenor}" for tenor in tenors for stype in swap_types]
+        )
+        return any(last >= 0 for _, last in series.values())
+
+    def _window(
+        self,
+        swap_type: str,
+        tenors: list,
+        period: str,
+        start_date=None,
+        end_date=None,
+        frequency: Frequency = "daily",
+    ):
+        """Get the dates, columns and names of the series over a lookback period.
+
+        Returns None when none of the tenors has data. Daily columns are views
+        of the matrix, and other frequencies are downsampled from them.
+        """
+        swap_types = ["libor", "ois"] if swap_type == "Both" else [swap_type.lower()]
+        series = self._series(
+            [f"{stype}_{tenor}" for tenor in tenors for stype in ["libor", "ois"]]
+        )
+        if not series:
+            return None
+
+        last_row = max(last for _, last in series.values())
+        if last_row < 0:
+            return None
+
+        first_row, end_row = period_bounds(
+            self.dates, period, start_date, end_date, last_row=last_row
+        )
+        names = [
+            f"{stype}_{tenor}"
+            for tenor in tenors
+            for stype in swap_types
+            if f"{stype}_{tenor}" in series
+        ]
+        rows = slice(first_row, end_row)
+        dates, columns = resample(
+            self.dates[rows], [series[name][0][rows] for name in names], frequency
+        )
+        if frequency.endswith("_mean"):
+            columns = [column.round(4) for column in columns]
+
+        return dates, columns, names
+
+    @staticmethod
+    def _block(dates, columns: list):
+        """Stack the columns of a window into rows."""
+        # pylint: disable=import-outside-toplevel
+        from numpy import column_stack, empty
+
+        return column_stack(columns) if columns else empty((len(dates), 0))
+
+    def _records(self, dates, columns: list, names: list) -> list:
+        """Get the records of the rows of the series, skipping rows without data."""
+        # pylint: disable=import-outside-toplevel
+        from numpy import datetime_as_string, isnan
+
+        block = self._block(dates, columns)
+        rows = ~isnan(block).all(axis=1)
+        block = block[rows]
+        dates = datetime_as_string(dates[rows], unit="D")
+
+        return [
+            {
+                "curve_date": date,
+                **{name: value for name, value in zip(names, row) if value == value},
+            }
+            for date, row in zip(dates.tolist(), block.tolist())
+        ]
+
+    def query(self, swap_type: str, tenors: list, period: str, **options) -> list:
+        """Get the records for the tenors and swap type over a lookback period.
+
+        The period ends on the last date with data for any of the tenors,
+        of either swap type, or on the `end_date`, and starts on the `start_date`
+        when it is given. Rows are daily, or weekly or monthly with `frequency`.
+        Dates without data for the selected series are skipped.
+        """
+        window = self._window(swap_type, tenors, period, **options)
+        if window is None:
+            return []
+        return self._records(*window)
+
+    def query_columns(
+        self, swap_type: str, tenors: list, period: str, **options
+    ) -> dict:
+        """Get the series of `query` as arrays keyed like the records, one row per date."""
+        # pylint: disable=import-outside-toplevel
+        from numpy import isnan
+
+        window = self._window(swap_type, tenors, period, **options)
+        if window is None:
+            return {"curve_date": self.dates[:0]}
+
+        dates, columns, names = window
+        rows = ~isnan(self._block(dates, columns)).all(axis=1)
+
+        return {
+            "curve_date": dates[rows],
+            **{name: column[rows] for name, column in zip(names, columns)},
+        }
+
+    def iter_query(
+        self,
+        swap_type: str,
+        tenors: list,
+        period: str,
+        batch_size: int = 1000,
+        **options,
+    ) -> Iterator[list]:
+        """Get the records of `query` in batches of up to `batch_size` dates.
+
+        Each batch is built from its own rows of the matrix, when it is requested.
+        Batches without records are skipped.
+        """
+        window = self._window(swap_type, tenors, period, **options)
+        if window is None:
+            return
+        dates, columns, names = window
+        for start in range(0, len(dates), batch_size):
+            rows = slice(start, start + batch_size)
+            records = self._records(
+                dates[rows], [column[rows] for column in columns], names
+            )
+            if records:
+                yield records
@@ -0,0 +1,556 @@
+"""Columnar Snapshot of the Swaps Data Archive.
+
+The bundled `swaps_data.xz` archive is an LZMA-compressed, pickled Excel workbook.
+Reading a sheet from it means decompressing the archive and parsing the workbook,
+which every worker repeats on every request.
+
+This module converts the archive, once, into an uncompressed columnar snapshot:
+one `.npy` file per (store, sheet, column) and a `manifest.json` describing them.
+Columns are written with the dtypes the application uses, and numeric and date
+columns are memory-mapped read-only on load, so the pages are shared by every
+worker process on the host. String columns are stored as integer
+codes with their categories kept in the manifest.
+
+Build the snapshot with the `openbb-swaps-snapshot` command. The loader falls back
+to the `.xz` archive when the snapshot is missing, or when it was built from a
+different archive than the one on disk.
+
+Data ingested later is appended to a sheet as segments, written next to its
+columns and listed in the manifest with the files they came from. Existing
+files are never rewritten. When an ingest finishes, the segments are folded
+into a new generation of the columns of their sheet, so every sheet is served
+from memory-mapped files again. Rebuilding the snapshot from the archive drops them.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+SNAPSHOT_FORMAT = 2
+MANIFEST_NAME = "manifest.json"
+
+archive_path = Path(__file__).parent / "swaps_data.xz"
+snapshot_path = Path(
+    os.environ.get(
+        "OPENBB_SWAPS_SNAPSHOT_PATH", Path(__file__).parent / "swaps_data.snapshot"
+    )
+)
+
+
+def archive_digest(archive_path: Path) -> str:
+    """Get the SHA256 digest of the archive file."""
+    digest = hashlib.sha256()
+    with open(archive_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _slug(name: str) -> str:
+    """Convert a sheet name to a directory name."""
+    return name.strip().lower().replace(" ", "_")
+
+
+def _write_column(directory: Path, column: str, values) -> dict:
+    """Write a single column to disk and return its manifest entry."""
+    # pylint: disable=import-outside-toplevel
+    from numpy import save
+    from pandas import api, factorize
+
+    entry: dict = {"name": column, "file": f"{column}.npy", "dtype": str(values.dtype)}
+
+    if api.types.is_numeric_dtype(values.dtype) or api.types.is_datetime64_dtype(
+        values.dtype
+    ):
+        entry["kind"] = "array"
+        save(directory / entry["file"], values.to_numpy(), allow_pickle=False)
+    else:
+        codes, categories = factorize(values, sort=True, use_na_sentinel=True)
+        entry["kind"] = "codes"
+        entry["categories"] = [str(c) for c in categories]
+        save(directory / entry["file"], codes.astype("int32"), allow_pickle=False)
+
+    return entry
+
+
+def write_snapshot(snapshot_path: Path, source: dict, sheets: Iterable) -> dict:
+    """Write a columnar snapshot of sheets.
+
+    Parameters
+    ----------
+    snapshot_path : Path
+        The directory to write the snapshot to. It is replaced atomically.
+    source : dict
+        The `name`, `sha256` and `modified` time of the data the sheets come from.
+    sheets : Iterable
+        The (store, sheet name, normalized frame) of each sheet, consumed one at a time.
+
+    Returns
+    -------
+    dict
+        The manifest of the snapshot that was written.
+    """
+    snapshot_path = Path(snapshot_path).resolve()
+    manifest: dict = {"format": SNAPSHOT_FORMAT, "source": source, "stores": {}}
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".snapshot-", dir=snapshot_path.parent))
+
+    try:
+        for store_key, sheet_name, df in sheets:
+            sheet_dir = Path(store_key) / _slug(sheet_name)
+            (staging / sheet_dir).mkdir(parents=True)
+            manifest["stores"].setdefault(store_key, {})[sheet_name] = {
+                "path": sheet_dir.as_posix(),
+                "rows": len(df),
+                "columns": [
+                    _write_column(staging / sheet_dir, str(col), df[col])
+                    for col in df.columns
+                ],
+            }
+
+        with open(staging / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+        if snapshot_path.exists():
+            retired = snapshot_path.with_name(f".{snapshot_path.name}.old")
+            shutil.rmtree(retired, ignore_errors=True)
+            os.replace(snapshot_path, retired)
+            os.replace(staging, snapshot_path)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, snapshot_path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    return manifest
+
+
+def build_snapshot(archive_path: Path, snapshot_path: Path) -> dict:
+    """Build a columnar snapshot from the swaps data archive.
+
+    Parameters
+    ----------
+    archive_path : Path
+        The path to the `.xz` archive, including the extension.
+    snapshot_path : Path
+        The directory to write the snapshot to. It is replaced atomically.
+
+    Returns
+    -------
+    dict
+        The manifest of the snapshot that was written.
+    """
+    # pylint: disable=import-outside-toplevel
+    from openbb_store.store import Store
+    from openbb_swaps.data.frames import normalize_frame
+
+    archive_path = Path(archive_path).resolve()
+    store = Store(str(archive_path.with_suffix("")))
+    source = {
+        "name": archive_path.name,
+        "sha256": archive_digest(archive_path),
+        "modified": archive_path.stat().st_mtime,
+    }
+    sheets = (
+        (
+            store_key,
+            sheet_name,
+            normalize_frame(store.get_store(store_key, sheet_name=sheet_name)),
+        )
+        for store_key in store.list_stores
+        for sheet_name in store.get_store(store_key).sheet_names
+    )
+
+    return write_snapshot(snapshot_path, source, sheets)
+
+
+class SwapsSnapshot:
+    """Read-only, memory-mapped view over a columnar snapshot.
+
+    Exposes the subset of the `Store` interface used by the application,
+    so it can stand in for the archive-backed store.
+    """
+
+    def __init__(self, snapshot_path: Path, manifest: dict):
+        """Initialize the snapshot from its directory and manifest."""
+        self.path = Path(snapshot_path)
+        self.manifest = manifest
+        # Mapped base columns, by (store, sheet). Each snapshot version has its own.
+        self._columns: dict = {}
+        self._lock = threading.Lock()
+
+    @property
+    def deltas(self) -> list:
+        """List the ingested files appended to the snapshot, oldest first."""
+        return self.manifest.get("deltas", [])
+
+    @property
+    def data_version(self) -> str:
+        """Get the digest of the archive the snapshot was built from and its deltas."""
+        if not self.deltas:
+            return self.manifest["source"]["sha256"]
+        digest = hashlib.sha256(self.manifest["source"]["sha256"].encode())
+        for delta in self.deltas:
+            digest.update(delta["sha256"].encode())
+        return digest.hexdigest()
+
+    @property
+    def data_modified(self) -> float:
+        """Get the time of the last ingested file, or of the archive of the snapshot."""
+        if self.deltas:
+            return self.deltas[-1]["ingested"]
+        modified = self.manifest["source"].get("modified")
+        if modified is None:
+            modified = (self.path / MANIFEST_NAME).stat().st_mtime
+        return modified
+
+    def sheet_parts(self, name: str, sheet_name: str) -> list:
+        """List the directories of the columns of a sheet and of its segments."""
+        sheet = self.manifest["stores"].get(name, {}).get(sheet_name)
+        if sheet is None:
+            return []
+        return [part["path"] for part in [sheet] + sheet.get("segments", [])]
+
+    def sheet_rows(self, name: str, sheet_name: str) -> int:
+        """Get the number of rows of a sheet, with its segments."""
+        sheet = self.manifest["stores"][name][sheet_name]
+        return sheet["rows"] + sum(part["rows"] for part in sheet.get("segments", []))
+
+    @property
+    def list_stores(self) -> list:
+        """List all keys to stored data objects."""
+        return list(self.manifest["stores"])
+
+    def sheet_names(self, name: str) -> list:
+        """List the sheet names of a stored workbook."""
+        if name not in self.manifest["stores"]:
+            raise KeyError(f"Data store '{name}' does not exist.")
+        return list(self.manifest["stores"][name])
+
+    def _load_column(self, sheet_path: Path, entry: dict, start: int = 0):
+        """Memory-map a column, from its `start` row on.
+
+        String columns are loaded as categoricals of their codes, with sorted categories.
+        """
+        # pylint: disable=import-outside-toplevel
+        from numpy import arange, argsort, asarray, load
+        from pandas import Categorical
+
+        values = load(sheet_path / entry["file"], mmap_mode="r", allow_pickle=False)
+        values = values[start:] if start else values
+        if entry["kind"] == "array":
+            return values
+
+        categories = asarray(entry["categories"], dtype=object)
+        order = argsort(categories, kind="stable")
+        # Map each stored code to its sorted position, and the -1 of missing values to -1.
+        positions = arange(-1, len(categories), dtype="int32")
+        positions[order + 1] = arange(len(categories), dtype="int32")
+        return Categorical.from_codes(positions[values + 1], categories[order])
+
+    def get_store(self, name: str, sheet_name: Optional[str] = None) -> "DataFrame":
+        """Get a sheet of a stored workbook as a new DataFrame."""
+        # pylint: disable=import-outside-toplevel
+        from pandas import DataFrame, concat
+
+        sheets = self.manifest["stores"].get(name)
+        if sheets is None:
+            raise KeyError(f"Data store '{name}' does not exist.")
+        if sheet_name not in sheets:
+            raise KeyError(
+                f"Sheet '{sheet_name}' not found in ExcelFile. Choices are: {list(sheets)}"
+            )
+        sheet = sheets[sheet_name]
+        key = (name, sheet_name)
+
+        with self._lock:
+            columns = self._columns.get(key)
+        if columns is None:
+            sheet_path = self.path / sheet["path"]
+            columns = {
+                entry["name"]: self._load_column(sheet_path, entry)
+                for entry in sheet["columns"]
+            }
+            with self._lock:
+                columns = self._columns.setdefault(key, columns)
+
+        # The frame holds its own references to the mapped columns, which stay
+        # mapped while it is used, even if the snapshot releases them meanwhile.
+        df = DataFrame(columns, copy=False)
+
+        if not sheet.get("segments"):
+            return df
+        return concat(
+            [df, self.get_rows(name, sheet_name, start=sheet["rows"])],
+            ignore_index=True,
+        )
+
+    def get_column(self, name: str, sheet_name: str, column: str):
+        """Get a numeric or date column of a sheet, with its segments, as an array.
+
+        Only the files of the column are read, memory-mapped.
+        """
+        # pylint: disable=import-outside-toplevel
+        from numpy import concatenate
+
+        sheet = self.manifest["stores"][name][sheet_name]
+        arrays = [
+            self._load_column(self.path / part["path"], entry)
+            for part in [sheet] + sheet.get("segments", [])
+            for entry in part["columns"]
+            if entry["name"] == column
+        ]
+        return arrays[0] if len(arrays) == 1 else concatenate(arrays)
+
+    def column_dtypes(self, name: str, sheet_name: str) -> dict:
+        """Get the dtypes of the columns of a sheet, from the manifest.
+
+        Numeric columns have the widest dtype of the sheet and its segments.
+        String columns are "category".
+        """
+        # pylint: disable=import-outside-toplevel
+        from numpy import dtype, result_type
+
+        sheet = self.manifest["stores"][name][sheet_name]
+        dtypes: dict = {}
+        for part in [sheet] + sheet.get("segments", []):
+            for entry in part["columns"]:
+                if entry["kind"] == "codes":
+                    dtypes[entry["name"]] = "category"
+                    continue
+                current = dtype(entry["dtype"])
+                previous = dtypes.get(entry["name"], current)
+                dtypes[entry["name"]] = result_type(previous, current)
+        return dtypes
+
+    def release(self, name: str):
+        """Unmap the columns of a stored workbook. They are mapped again on access."""
+        with self._lock:
+            for key in [key for key in self._columns if key[0] == name]:
+                del self._columns[key]
+
+    def adopt_columns(self, other: "SwapsSnapshot"):
+        """Reuse the mapped columns of another version of the snapshot.
+
+        Only the sheets with the same column files in both versions are reused.
+        They are referenced in this version's own map, so releasing them from
+        either version does not affect the other.
+        """
+        with other._lock:  # pylint: disable=protected-access
+            mapped = dict(other._columns)  # pylint: disable=protected-access
+        shared = {
+            key: dict(columns)
+            for key, columns in mapped.items()
+            if self.sheet_parts(*key)[:1] == other.sheet_parts(*key)[:1]
+        }
+        with self._lock:
+            for key, columns in shared.items():
+                self._columns.setdefault(key, columns)
+
+    def get_rows(self, name: str, sheet_name: str, start: int = 0) -> "DataFrame":
+        """Get the rows of a sheet, with its segments, from the `start` row on.
+
+        Only the rows from `start` on are read from the memory-mapped columns,
+        so getting the rows appended since a known row count reads only those.
+        """
+        # pylint: disable=import-outside-toplevel
+        from pandas import DataFrame, concat
+
+        sheet = self.manifest["stores"][name][sheet_name]
+        parts = [sheet] + sheet.get("segments", [])
+        frames: list = []
+        offset = 0
+
+        for i, part in enumerate(parts):
+            first = min(max(start - offset, 0), part["rows"])
+            offset += part["rows"]
+            if first == part["rows"] and (frames or i < len(parts) - 1):
+                continue
+            frames.append(
+                DataFrame(
+                    {
+                        entry["name"]: self._load_column(
+                            self.path / part["path"], entry, first
+                        )
+                        for entry in part["columns"]
+                    },
+                    copy=False,
+                )
+            )
+
+        return frames[0] if len(frames) == 1 else concat(frames, ignore_index=True)
+
+
+def write_segment(
+    snapshot_path: Path, manifest: dict, name: str, sheet_name: str, df
+) -> Path:
+    """Write rows appended to a sheet as a new segment, and add it to the manifest.
+
+    The manifest is only modified in memory. Write it with `write_manifest`.
+    Returns the directory of the segment.
+    """
+    sheet = manifest["stores"][name][sheet_name]
+    segments = sheet.setdefault("segments", [])
+    segment_dir = Path(sheet["path"]) / f"segment-{len(segments) + 1:05d}"
+    (Path(snapshot_path) / segment_dir).mkdir(parents=True)
+    segments.append(
+        {
+            "path": segment_dir.as_posix(),
+            "rows": len(df),
+            "columns": [
+                _write_column(Path(snapshot_path) / segment_dir, str(col), df[col])
+                for col in df.columns
+            ],
+        }
+    )
+    return Path(snapshot_path) / segment_dir
+
+
+def compact_snapshot(snapshot_path: Path, manifest: dict) -> dict:
+    """Fold the segments of the sheets of a snapshot into their columns.
+
+    Each sheet with segments is written as a new generation of its columns, with
+    every row, next to the one it replaces. The sheet is then served from its
+    memory-mapped columns, shared by every worker, instead of from copies joining
+    the segments in each of them. The manifest is replaced once they are written.
+
+    Replaced generations are kept until the next compaction, so workers serving
+    the previous manifest can read them until they reload.
+
+    Returns
+    -------
+    dict
+        The manifest of the compacted snapshot.
+    """
+    # pylint: disable=import-outside-toplevel
+    import copy
+
+    from openbb_swaps.data.frames import normalize_frame
+
+    snapshot_path = Path(snapshot_path)
+    snapshot = SwapsSnapshot(snapshot_path, manifest)
+    compacted = copy.deepcopy(manifest)
+    retired: list = []
+
+    for name, sheets in compacted["stores"].items():
+        for sheet_name, sheet in sheets.items():
+            if not sheet.get("segments"):
+                continue
+            df = normalize_frame(snapshot.get_store(name, sheet_name))
+            generation = sheet.get("generation", 0) + 1
+            sheet_dir = Path(name) / f"{_slug(sheet_name)}.{generation:05d}"
+            # A directory of this generation can only be left by a failed compaction.
+            shutil.rmtree(snapshot_path / sheet_dir, ignore_errors=True)
+            (snapshot_path / sheet_dir).mkdir(parents=True)
+            sheets[sheet_name] = {
+                "path": sheet_dir.as_posix(),
+                "rows": len(df),
+                "generation": generation,
+                "columns": [
+                    _write_column(snapshot_path / sheet_dir, str(col), df[col])
+                    for col in df.columns
+                ],
+            }
+            retired.append(sheet["path"])
+
+    if not retired:
+        return manifest
+
+    previous = compacted.get("retired", [])
+    compacted["retired"] = retired
+    write_manifest(snapshot_path, compacted)
+    for path in previous:
+        shutil.rmtree(snapshot_path / path, ignore_errors=True)
+
+    return compacted
+
+
+def remove_unlisted_segments(snapshot_path: Path, manifest: dict) -> list:
+    """Remove the segment directories of a snapshot that its manifest does not list.
+
+    They are left by ingests that failed before writing the manifest, and would
+    take the names of the next segments. Nothing reads them.
+
+    Returns
+    -------
+    list
+        The directories removed.
+    """
+    removed: list = []
+    for sheets in manifest["stores"].values():
+        for sheet in sheets.values():
+            listed = {segment["path"] for segment in sheet.get("segments", [])}
+            sheet_path = Path(snapshot_path) / sheet["path"]
+            for segment_dir in sorted(sheet_path.glob("segment-*")):
+                if Path(sheet["path"], segment_dir.name).as_posix() not in listed:
+                    shutil.rmtree(segment_dir)
+                    removed.append(segment_dir)
+    return removed
+
+
+def write_manifest(snapshot_path: Path, manifest: dict):
+    """Replace the manifest of a snapshot atomically."""
+    manifest_path = Path(snapshot_path) / MANIFEST_NAME
+    staging = manifest_path.with_name(f".{MANIFEST_NAME}.tmp")
+    with open(staging, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(staging, manifest_path)
+
+
+def load_snapshot(snapshot_path: Path, archive_path: Path) -> Optional[SwapsSnapshot]:
+    """Load the snapshot if it exists and was built from the given archive.
+
+    Snapshots of other sources, like synthetic data, are loaded as they are.
+    Returns None when the snapshot is missing, unreadable, or stale.
+    """
+    manifest_path = Path(snapshot_path) / MANIFEST_NAME
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        return None
+    source = manifest.get("source", {})
+    if (
+        source.get("name") == Path(archive_path).name
+        and Path(archive_path).exists()
+        and source.get("sha256") != archive_digest(archive_path)
+    ):
+        return None
+
+    return SwapsSnapshot(snapshot_path, manifest)
+
+
+def main():
+    """Build the snapshot for the bundled swaps data archive."""
+    # pylint: disable=import-outside-toplevel
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Build a memory-mappable columnar snapshot of the swaps data archive."
+    )
+    parser.add_argument("--archive", default=str(archive_path))
+    parser.add_argument("--output", default=str(snapshot_path))
+    args = parser.parse_args()
+
+    manifest = build_snapshot(Path(args.archive), Path(args.output))
+    for store_key, sheets in manifest["stores"].items():
+        for sheet_name, sheet in sheets.items():
+            print(f"{store_key} / {sheet_name}: {sheet['rows']} rows")  # noqa: T201
+    print(f"Snapshot written to {args.output}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
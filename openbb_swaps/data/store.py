@@ -1,22 +1,583 @@
 """Swaps Data Store Dependency."""
 
+import logging
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any, AsyncIterator, Callable, Union
 
 from fastapi import Depends
 from openbb_store.store import Store
+from openbb_swaps.app.timing import span
+from openbb_swaps.data.curves import SwapCurves
+from openbb_swaps.data.frames import bytes_saved, normalize_frame
+from openbb_swaps.data.options import SwapOptions
+from openbb_swaps.data.partitions import DatePartitions
+from openbb_swaps.data.rate_levels import SwapRateLevels
+from openbb_swaps.data.snapshot import (
+    SwapsSnapshot,
+    archive_digest,
+    archive_path,
+    load_snapshot,
+    snapshot_path,
+)
+from openbb_swaps.data.volume import SwapVolumeCube
 
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
-store_path = Path(__file__).parent / "swaps_data"
-swaps_store = Store(str(store_path))
+logger = logging.getLogger(__name__)
 
+store_path = archive_path.with_suffix("")
 
-def get_swaps_store() -> Store:
-    """Get the swaps store."""
-    return swaps_store
+
+class PartitionedArchiveStore:
+    """Archive-backed store reading the workbook of each currency on its first access.
+
+    The archive is decompressed once, on the first access. It keeps the workbook of
+    each currency compressed, and sheets are read from it when they are requested,
+    so only the sheets of the currencies queried are kept in memory, as frames.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the store over the archive path, without its extension."""
+        self.path = path
+        self._store: Union[Store, None] = None
+        self._lock = threading.Lock()
+
+    def get_store(self, name: str, sheet_name: Union[str, None] = None) -> "DataFrame":
+        """Get a sheet of a stored workbook, decompressing the archive if needed."""
+        with self._lock:
+            if self._store is None:
+                self._store = Store(self.path)
+            store = self._store
+        return store.get_store(name, sheet_name=sheet_name)
+
+    def release(self, name: str):
+        """Release a workbook. Its sheets are only held by the frames built from them."""
+
+
+def _nbytes(value: Any) -> int:
+    """Get the approximate number of bytes held by the frames and arrays of an object.
+
+    Arrays viewing the memory of another array are not counted.
+    Memory-mapped columns are counted at their full size.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import ndarray
+    from pandas import DataFrame
+
+    if isinstance(value, DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, ndarray):
+        return value.nbytes if value.flags.owndata else 0
+    if hasattr(value, "__dict__"):
+        return sum(_nbytes(v) for v in vars(value).values())
+    return 0
+
+
+def load_swaps_store() -> tuple[
+    Union[SwapsSnapshot, PartitionedArchiveStore], str, float
+]:
+    """Load the memory-mapped snapshot, falling back to the compressed archive.
+
+    Returns the store, its data version and the modification time of its data.
+    """
+    snapshot = load_snapshot(snapshot_path, archive_path)
+    if snapshot is not None:
+        return snapshot, snapshot.data_version, snapshot.data_modified
+    logger.warning(
+        "Swaps data snapshot at %s is missing or stale, loading %s instead."
+        + " Run `openbb-swaps-snapshot` to build it.",
+        snapshot_path,
+        archive_path,
+    )
+    return (
+        PartitionedArchiveStore(str(store_path)),
+        archive_digest(archive_path),
+        archive_path.stat().st_mtime,
+    )
+
+
+class SwapsDataStore:
+    """Cache of normalized swaps sheets, loaded once per (currency, sheet).
+
+    Frames are handed out as shallow, read-only views of the cached frame.
+    Filtering or assigning columns on a view never modifies the cache.
+    Precomputed views, like the swap rate levels matrix or the volume cube,
+    are built once from the cached frames and shared as-is.
+
+    `data_version` identifies the data being served. It changes only when different
+    data is loaded, and keys the caches and validators derived from the data.
+    `last_modified` is the POSIX timestamp of the data.
+
+    Each currency is a partition, loaded on its first access. With a `memory_budget`,
+    in bytes, the least recently used partitions are evicted, with their frames, views
+    and source columns, while the cached objects exceed the budget.
+    The partition in use is never evicted, so a single currency can exceed the budget.
+    """
+
+    def __init__(
+        self,
+        source: Union[SwapsSnapshot, PartitionedArchiveStore],
+        data_version: str,
+        last_modified: float,
+        memory_budget: int = 0,
+    ):
+        """Initialize the cache over a snapshot or archive store."""
+        self.source = source
+        self.data_version = data_version
+        self.last_modified = last_modified
+        self.memory_budget = memory_budget
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache: dict = {}
+        self._sizes: dict = {}
+        self._partitions: OrderedDict = OrderedDict()
+        self._building: dict = {}
+        self._lock = threading.RLock()
+
+    def _lookup(self, key: tuple) -> tuple[bool, Any]:
+        """Get whether an object is cached, and the object, marking its partition used."""
+        with self._lock:
+            if key not in self._cache:
+                return False, None
+            self.hits += 1
+            self._partitions.move_to_end(key[1])
+            return True, self._cache[key]
+
+    def _get_cached(self, key: tuple, build: Callable[[], Any]) -> Any:
+        """Get a cached object, building it on the first access.
+
+        Objects are built outside of the store lock, so other keys are served while
+        one builds. Requests for a key being built wait on its build lock, and get
+        the object built by the first one.
+        """
+        found, value = self._lookup(key)
+        if found:
+            return value
+        with self._lock:
+            building = self._building.setdefault(key, threading.Lock())
+
+        with building:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            with self._lock:
+                self.misses += 1
+            try:
+                with span(f"store.{key[0]}"):
+                    value = build()
+                size = _nbytes(value)
+                with self._lock:
+                    self._admit(key, value, size)
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+        return value
+
+    def _admit(self, key: tuple, value: Any, size: Union[int, None] = None):
+        """Cache an object in the partition of its currency, evicting over the budget."""
+        currency = key[1]
+        size = _nbytes(value) if size is None else size
+        self._cache[key] = value
+        self._sizes[key] = size
+        self._partitions[currency] = self._partitions.get(currency, 0) + size
+        self._partitions.move_to_end(currency)
+
+        while (
+            self.memory_budget > 0
+            and len(self._partitions) > 1
+            and sum(self._partitions.values()) > self.memory_budget
+        ):
+            self._evict(next(iter(self._partitions)))
+
+    def _evict(self, currency: str):
+        """Drop the cached objects and source columns of a currency."""
+        for key in [key for key in self._cache if key[1] == currency]:
+            del self._cache[key]
+            del self._sizes[key]
+        del self._partitions[currency]
+        self.evictions += 1
+        logger.info("Evicted the %s swaps data from memory.", currency)
+        self.source.release(currency.lower() + "_swaps")
+
+    def get_frame(self, currency: str, sheet_name: str) -> "DataFrame":
+        """Get a read-only view of a sheet for a currency."""
+        frame = self._get_cached(
+            ("frame", currency.upper(), sheet_name),
+            lambda: normalize_frame(
+                self.source.get_store(
+                    currency.lower() + "_swaps", sheet_name=sheet_name
+                )
+            ),
+        )
+        return frame.copy(deep=False)
+
+    def get_rate_levels(self, currency: str) -> SwapRateLevels:
+        """Get the swap rate levels matrix for a currency."""
+        return self._get_cached(
+            ("rate_levels", currency.upper()),
+            lambda: SwapRateLevels.from_frame(
+                self.get_frame(currency, "Interest Rates")
+            ),
+        )
+
+    def get_volume_cube(self, currency: str) -> SwapVolumeCube:
+        """Get the swap volume cube for a currency."""
+        return self._get_cached(
+            ("volume_cube", currency.upper()),
+            lambda: SwapVolumeCube.from_frame(self.get_frame(currency, "Trading Data")),
+        )
+
+    def get_curves(self, currency: str) -> SwapCurves:
+        """Get the pricing curves for a currency."""
+        return self._get_cached(
+            ("curves", currency.upper()),
+            lambda: SwapCurves.from_frame(
+                self.get_frame(currency, "Trades and Pricing Curve")
+            ),
+        )
+
+    def get_options(self, currency: str) -> SwapOptions:
+        """Get the widget option lists for a currency."""
+        return self._get_cached(
+            ("options", currency.upper()),
+            lambda: SwapOptions.from_frames(
+                self.get_frame(currency, "Interest Rates"),
+                self.get_frame(currency, "Trading Data"),
+                self.get_frame(currency, "Trades and Pricing Curve"),
+            ),
+        )
+
+    def get_date_partitions(self, currency: str, sheet_name: str) -> DatePartitions:
+        """Get a sheet for a currency, partitioned by spot date."""
+        return self._get_cached(
+            ("date_partitions", currency.upper(), sheet_name),
+            lambda: DatePartitions(self.get_frame(currency, sheet_name), "spot_date"),
+        )
+
+    def get_date_rows(self, currency: str, sheet_name: str, date) -> "DataFrame":
+        """Get a read-only view of the rows of a sheet for a single spot date."""
+        return self.get_date_partitions(currency, sheet_name).get(date)
+
+    def warm(self, keys: list):
+        """Build the cached frames and views of the given cache keys, if missing."""
+        builders: dict[str, Callable] = {
+            "frame": self.get_frame,
+            "rate_levels": self.get_rate_levels,
+            "volume_cube": self.get_volume_cube,
+            "curves": self.get_curves,
+            "options": self.get_options,
+            "date_partitions": self.get_date_partitions,
+        }
+        for kind, *args in keys:
+            builders[kind](*args)
+
+    def cache_keys(self) -> list:
+        """List the keys of the cached frames and views."""
+        with self._lock:
+            return list(self._cache)
+
+    def clear(self):
+        """Drop every cached frame and view."""
+        with self._lock:
+            self._cache.clear()
+            self._sizes.clear()
+            self._partitions.clear()
+
+    def extend(self, source: SwapsSnapshot) -> "SwapsDataStore":
+        """Get a store over a newer version of the same snapshot, reusing the caches.
+
+        Only the rows appended since this store's version are read. Sheets with the
+        same files keep their cached frames and views. The volume cube adds the new
+        rows into its cells, and the frames and other views of the sheets with new
+        rows are mapped and rebuilt on their next access.
+        Falls back to an empty store when the snapshot is not an extension of this one.
+        """
+        store = SwapsDataStore(
+            source, source.data_version, source.data_modified, self.memory_budget
+        )
+        old = self.source
+        deltas = source.deltas
+        if (
+            not isinstance(old, SwapsSnapshot)
+            or old.manifest["source"]["sha256"] != source.manifest["source"]["sha256"]
+            or deltas[: len(old.deltas)] != old.deltas
+        ):
+            return store
+
+        # Columns of sheets whose files are unchanged are already mapped.
+        source.adopt_columns(old)
+
+        with self._lock:
+            cached = dict(self._cache)
+            sizes = dict(self._sizes)
+
+        cache: dict = {}
+        changed: set = set()
+        for key, value in cached.items():
+            if key[0] != "frame":
+                continue
+            _, currency, sheet_name = key
+            name = currency.lower() + "_swaps"
+            if source.sheet_parts(name, sheet_name) == old.sheet_parts(
+                name, sheet_name
+            ):
+                cache[key] = value
+                continue
+            # The frame is mapped again from the new files on its next access.
+            changed.add((currency, sheet_name))
+            cube = cached.get(("volume_cube", currency))
+            start = old.sheet_rows(name, sheet_name)
+            if (
+                sheet_name == "Trading Data"
+                and cube is not None
+                and source.sheet_rows(name, sheet_name) >= start
+            ):
+                rows = normalize_frame(source.get_rows(name, sheet_name, start=start))
+                cache[("volume_cube", currency)] = cube.append(rows)
+
+        dependencies = {
+            "rate_levels": ["Interest Rates"],
+            "volume_cube": ["Trading Data"],
+            "curves": ["Trades and Pricing Curve"],
+            "options": ["Interest Rates", "Trading Data", "Trades and Pricing Curve"],
+        }
+        for key, value in cached.items():
+            if key in cache or key[0] == "frame":
+                continue
+            sheets = [key[2]] if key[0] == "date_partitions" else dependencies[key[0]]
+            if not any((key[1], sheet) in changed for sheet in sheets):
+                cache[key] = value
+
+        with store._lock:
+            for key, value in cache.items():
+                store._admit(
+                    key, value, sizes[key] if value is cached.get(key) else None
+                )
+        return store
+
+    def cache_info(self) -> dict:
+        """Get the cache counters, entries by kind, and resident bytes by currency.
+
+        Currencies are listed from the least to the most recently used.
+        `bytes_saved` is the memory each loaded sheet saves with its compact dtypes.
+        """
+        with self._lock:
+            kinds = [key[0] for key in self._cache]
+            partitions = dict(self._partitions)
+            frames = {
+                key[1:]: value
+                for key, value in self._cache.items()
+                if key[0] == "frame"
+            }
+        saved: dict = {}
+        for (currency, sheet_name), frame in frames.items():
+            saved.setdefault(currency, {})[sheet_name] = bytes_saved(frame)
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": {kind: kinds.count(kind) for kind in sorted(set(kinds))},
+            "memory_budget": self.memory_budget,
+            "resident_bytes": sum(partitions.values()),
+            "partitions": partitions,
+            "bytes_saved": saved,
+        }
+
+
+class SwapsStoreHandle:
+    """Versioned handle to the current swaps store.
+
+    A reload loads and warms the new store in the background, while requests are
+    served by the current one, then swaps it in with a single assignment.
+    Requests lease the store they start with and finish on it, even if a reload
+    swaps in a new version meanwhile. A replaced store is reclaimed, its caches
+    dropped, when its last lease is released.
+    """
+
+    def __init__(self, store: SwapsDataStore):
+        """Initialize the handle with the store to serve."""
+        self.current = store
+        self.reloads = 0
+        self._leases: dict = {}
+        self._retired: set = set()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+    def acquire(self) -> SwapsDataStore:
+        """Lease the current store."""
+        with self._lock:
+            store = self.current
+            self._leases[store] = self._leases.get(store, 0) + 1
+            return store
+
+    def release(self, store: SwapsDataStore):
+        """Release a lease, reclaiming the store if it was replaced and is now unused."""
+        with self._lock:
+            self._leases[store] -= 1
+            if self._leases[store] > 0:
+                return
+            del self._leases[store]
+            if store not in self._retired:
+                return
+            self._retired.discard(store)
+        store.clear()
+
+    def replace(self, store: SwapsDataStore):
+        """Swap in a new store, retiring the current one until its leases are released."""
+        with self._lock:
+            old, self.current = self.current, store
+            self.reloads += 1
+            if old in self._leases:
+                self._retired.add(old)
+                return
+        old.clear()
+
+    def reload(self) -> bool:
+        """Load the data on disk, if its version differs from the current store's.
+
+        Data appended to the same snapshot only reads the new rows. Otherwise, the new
+        store is loaded in full. Either way, it is warmed with the frames and views
+        cached by the current store before it replaces it.
+
+        Returns True when the store was replaced.
+        """
+        with self._reload_lock:
+            current = self.current
+            snapshot = load_snapshot(snapshot_path, archive_path)
+
+            if snapshot is not None:
+                if snapshot.data_version == current.data_version:
+                    return False
+                store = current.extend(snapshot)
+            elif archive_digest(archive_path) == current.data_version:
+                return False
+            else:
+                store = SwapsDataStore(
+                    *load_swaps_store(), memory_budget=current.memory_budget
+                )
+
+            logger.info(
+                "Swaps data changed to version %s, reloading the store.",
+                store.data_version,
+            )
+            store.warm(current.cache_keys())
+            self.replace(store)
+            return True
+
+    def stats(self) -> dict:
+        """Get the current version, the number of reloads, and the leases by version."""
+        with self._lock:
+            return {
+                "data_version": self.current.data_version,
+                "reloads": self.reloads,
+                "retired": len(self._retired),
+                "leases": {
+                    store.data_version: count for store, count in self._leases.items()
+                },
+            }
+
+
+store_handle = SwapsStoreHandle(
+    SwapsDataStore(
+        *load_swaps_store(),
+        memory_budget=int(os.environ.get("OPENBB_SWAPS_STORE_MEMORY_BUDGET", 0)),
+    )
+)
+
+
+def get_swaps_store() -> SwapsDataStore:
+    """Get the current swaps store."""
+    return store_handle.current
+
+
+def refresh_swaps_store() -> bool:
+    """Reload the swaps store if the data on disk changed.
+
+    Returns True when the store was replaced.
+    """
+    return store_handle.reload()
+
+
+# Stores of the data versions leased by requests, in a compute worker process.
+WORKER_STORE_VERSIONS = 2
+_worker_stores: OrderedDict = OrderedDict()
+_worker_stores_lock = threading.Lock()
+
+
+def store_spec(store: SwapsDataStore) -> dict:
+    """Describe the data version of a store, for a worker process to load exactly it.
+
+    A snapshot is described by its manifest, so its version can be loaded after the
+    manifest on disk is replaced. The archive is described by its version only.
+    """
+    spec: dict = {
+        "data_version": store.data_version,
+        "memory_budget": store.memory_budget,
+    }
+    if isinstance(store.source, SwapsSnapshot):
+        spec["snapshot_path"] = str(store.source.path)
+        spec["manifest"] = store.source.manifest
+    return spec
+
+
+def get_version_store(spec: dict) -> SwapsDataStore:
+    """Get a store of exactly the data version of a `store_spec`, in a worker process.
+
+    The stores of the last versions used are kept. A new snapshot version extends
+    the last one, reading only the rows it adds.
+
+    Raises
+    ------
+    RuntimeError
+        When the data version is no longer on disk.
+    """
+    version = spec["data_version"]
+
+    with _worker_stores_lock:
+        store = _worker_stores.get(version)
+        if store is not None:
+            _worker_stores.move_to_end(version)
+            return store
+
+        current = store_handle.current
+        if current.data_version == version:
+            store = current
+        elif "manifest" in spec:
+            source = SwapsSnapshot(Path(spec["snapshot_path"]), spec["manifest"])
+            latest = next(reversed(_worker_stores.values()), current)
+            store = latest.extend(source)
+        else:
+            source, data_version, last_modified = load_swaps_store()
+            if data_version != version:
+                raise RuntimeError(
+                    f"The swaps data version {version} is no longer on disk."
+                )
+            store = SwapsDataStore(
+                source, data_version, last_modified, spec["memory_budget"]
+            )
+
+        _worker_stores[version] = store
+        while len(_worker_stores) > WORKER_STORE_VERSIONS:
+            _worker_stores.popitem(last=False)
+        return store
+
+
+async def lease_swaps_store() -> AsyncIterator[SwapsDataStore]:
+    """Lease the current swaps store for the duration of a request."""
+    with span("store.lease"):
+        store = store_handle.acquire()
+    try:
+        yield store
+    finally:
+        store_handle.release(store)
 
 
 SwapsStore = Annotated[
-    Store,
-    Depends(get_swaps_store),
+    SwapsDataStore,
+    Depends(lease_swaps_store),
 ]
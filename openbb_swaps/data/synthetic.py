@@ -0,0 +1,476 @@
+"""Synthetic DTCC Swaps Data for Load and Scale Testing.
+
+Generates fixed-for-floating swap trades for any number of years, currencies and
+trades per day, and converts them into the "Interest Rates", "Trading Data" and
+"Trades and Pricing Curve" sheets with the same functions as the ingestion of
+DTCC daily files, so the sheets have the columns and dtypes of the real data.
+
+Trades are priced off a Nelson-Siegel par curve per currency, whose level, slope and
+curvature follow mean-reverting random walks from one business day to the next.
+Trades cluster on the standard tenors, with lognormal notionals, a share of
+uncleared and forward-starting trades, and a few mispriced outliers.
+
+Like the bundled archive, the trades sheet keeps the individual trades of the latest
+days only. The data is written as a snapshot, which the application serves when
+`OPENBB_SWAPS_SNAPSHOT_PATH` points to it. DTCC daily files of the days after the
+snapshot can be written too, to load test the ingestion.
+
+Generate data with the `openbb-swaps-synthetic` command.
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from openbb_swaps.data.ingest import (
+    CURVE_TENORS,
+    DTCC_COLUMNS,
+    flag_outliers,
+    rates_sheet,
+    trades_sheet,
+    volume_sheet,
+)
+
+if TYPE_CHECKING:
+    from numpy.random import Generator
+    from pandas import DataFrame
+
+
+# Nelson-Siegel level, slope and curvature of the par curve of each currency.
+CURVE_FACTORS = {
+    "USD": (0.040, 0.002, -0.010),
+    "EUR": (0.024, -0.005, -0.005),
+    "GBP": (0.042, 0.000, -0.005),
+    "JPY": (0.020, -0.018, 0.000),
+}
+DEFAULT_CURVE_FACTORS = (0.030, -0.005, 0.000)
+# Daily volatility of the level, slope and curvature, and their daily mean reversion.
+FACTOR_VOLATILITY = (0.0006, 0.0004, 0.0005)
+FACTOR_REVERSION = 0.005
+# Decay of the slope and curvature loadings, in years.
+CURVE_DECAY = 2.0
+# Spread of Libor over OIS rates.
+LIBOR_BASIS = 0.0025
+
+# Share of the trades at each standard tenor. The rest have any maturity.
+TENOR_WEIGHTS = [10, 14, 9, 6, 12, 7, 14, 5, 4, 7, 1, 1]
+OFF_TENOR_SHARE = 0.1
+# Median notional of a trade, in units of the currency.
+MEDIAN_NOTIONAL = {"JPY": 5_000_000_000}
+DEFAULT_MEDIAN_NOTIONAL = 50_000_000
+
+FLOATING_INDEXES = {
+    "USD": ("USD-SOFR-COMPOUND", "USD-LIBOR-BBA"),
+    "EUR": ("EUR-EuroSTR-COMPOUND", "EUR-EURIBOR-Reuters"),
+    "GBP": ("GBP-SONIA-COMPOUND", "GBP-LIBOR-BBA"),
+    "JPY": ("JPY-TONA-OIS-COMPOUND", "JPY-LIBOR-BBA"),
+}
+
+
+def par_rates(factors, years):
+    """Get the Nelson-Siegel par rates of curve factors, by day, at maturities in years.
+
+    Parameters
+    ----------
+    factors : ndarray
+        The level, slope and curvature of each day, with shape (days, 3).
+    years : ndarray
+        The maturity of each rate, with a shape broadcasting with (days,).
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import exp, maximum
+
+    scaled = maximum(years, 1e-6) / CURVE_DECAY
+    slope = (1 - exp(-scaled)) / scaled
+    curvature = slope - exp(-scaled)
+    return factors[..., 0] + factors[..., 1] * slope + factors[..., 2] * curvature
+
+
+def curve_factors(
+    currency: str, days: int, rng: "Generator", previous: Optional[list] = None
+):
+    """Simulate the daily curve factors of a currency, with shape (days, 3).
+
+    The first day is at the mean of the currency, or one day on from the
+    `previous` factors, to continue the factors of earlier data.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import asarray, empty
+
+    mean = asarray(CURVE_FACTORS.get(currency, DEFAULT_CURVE_FACTORS))
+    shocks = rng.standard_normal((days, 3)) * asarray(FACTOR_VOLATILITY)
+    factors = empty((days, 3))
+    factors[0] = mean
+    for day in range(days):
+        if day == 0 and previous is None:
+            continue
+        last = factors[day - 1] if day > 0 else asarray(previous)
+        factors[day] = last + FACTOR_REVERSION * (mean - last) + shocks[day]
+    return factors
+
+
+def synthetic_trades(
+    currency: str,
+    dates,
+    factors,
+    trades_per_day: int,
+    rng: "Generator",
+    libor_share: float = 0.05,
+) -> "DataFrame":
+    """Generate the trades of a currency on business days, like `read_trades` returns them.
+
+    Parameters
+    ----------
+    currency : str
+        The currency of the trades.
+    dates : ndarray
+        The business days, as datetime64[D].
+    factors : ndarray
+        The curve factors of each day, from `curve_factors`.
+    trades_per_day : int
+        The average number of trades per day. Daily counts are Poisson distributed.
+    rng : Generator
+        The random number generator.
+    libor_share : float
+        The share of trades floating on Libor instead of an overnight index.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import (
+        array,
+        busday_offset,
+        log,
+        repeat,
+        round as np_round,
+        timedelta64,
+        where,
+    )
+    from pandas import DataFrame
+
+    counts = rng.poisson(trades_per_day, len(dates))
+    day = repeat(range(len(dates)), counts)
+    n = len(day)
+
+    standard = array([float(tenor) for tenor in CURVE_TENORS])
+    weights = array(TENOR_WEIGHTS, dtype="float64") / sum(TENOR_WEIGHTS)
+    years = where(
+        rng.random(n) < OFF_TENOR_SHARE,
+        rng.uniform(0.1, 50.0, n),
+        rng.choice(standard, n, p=weights),
+    )
+
+    spot = dates[day]
+    forward_starting = rng.random(n) < 0.15
+    effective = busday_offset(spot, 2, roll="forward") + where(
+        forward_starting, rng.integers(1, 25, n) * 30, 0
+    ).astype("timedelta64[D]")
+    expiration = effective + np_round(years * 365.25).astype("int64").astype(
+        "timedelta64[D]"
+    )
+    libor = rng.random(n) < libor_share
+
+    strike = par_rates(factors[day], years) + where(libor, LIBOR_BASIS, 0.0)
+    strike = strike + rng.normal(0.0, 0.0002, n)
+    outliers = rng.random(n) < 0.002
+    strike = where(
+        outliers,
+        strike + rng.choice([-1.0, 1.0], n) * rng.uniform(0.015, 0.03, n),
+        strike,
+    )
+
+    median = MEDIAN_NOTIONAL.get(currency, DEFAULT_MEDIAN_NOTIONAL)
+    notional = rng.lognormal(log(median), 1.2, n)
+    notional = (np_round(notional / (median / 50)) * (median / 50)).astype("int64")
+    notional = notional.clip(min=median // 50)
+
+    return DataFrame(
+        {
+            "spot_date": spot.astype("datetime64[ns]"),
+            "effective": effective.astype("datetime64[ns]"),
+            "expiration": expiration.astype("datetime64[ns]"),
+            "currency": currency,
+            "swap.type": where(libor, "Libor", "OIS"),
+            "cleared": rng.random(n) < 0.85,
+            "notional": notional,
+            "strike": strike.round(6),
+            "time.to.mat": (expiration - effective) / timedelta64(1, "D") / 365,
+            "forward_starting": forward_starting,
+        }
+    )
+
+
+def synthetic_sheets(
+    currency: str,
+    dates,
+    factors,
+    trades_per_day: int,
+    trade_days: int,
+    rng: "Generator",
+    chunk_days: int = 21,
+) -> dict:
+    """Generate the sheets of a currency over business days, from its curve factors.
+
+    Trades are generated and converted a chunk of days at a time, so memory does not
+    grow with the number of trades. The trades sheet keeps the latest `trade_days` days,
+    or every day when there are fewer. Outliers are flagged against the median rate of their tenor over their chunk.
+    """
+    # pylint: disable=import-outside-toplevel
+    from openbb_swaps.data.frames import normalize_frame
+    from pandas import concat
+
+    rates: list = []
+    volumes: list = []
+    trades: list = []
+    first_trade_day = dates[len(dates) - min(max(trade_days, 1), len(dates))]
+
+    for start in range(0, len(dates), chunk_days):
+        chunk = slice(start, start + chunk_days)
+        rows = flag_outliers(
+            synthetic_trades(
+                currency, dates[chunk], factors[chunk], trades_per_day, rng
+            )
+        )
+        chunk_rates = rates_sheet(rows)
+        rates.append(chunk_rates)
+        volumes.append(volume_sheet(rows))
+        recent = rows["spot_date"] >= first_trade_day
+        if recent.any():
+            trades.append(
+                trades_sheet(
+                    rows[recent],
+                    chunk_rates[chunk_rates["curve_date"] >= first_trade_day],
+                )
+            )
+
+    return {
+        "Interest Rates": normalize_frame(concat(rates, ignore_index=True)),
+        "Trading Data": normalize_frame(concat(volumes, ignore_index=True)),
+        "Trades and Pricing Curve": normalize_frame(concat(trades, ignore_index=True)),
+    }
+
+
+def business_days(end: str, years: float):
+    """Get the business days of the years up to and including the end date."""
+    # pylint: disable=import-outside-toplevel
+    from numpy import arange, datetime64, is_busday, timedelta64
+
+    last = datetime64(end, "D")
+    first = last - timedelta64(int(round(years * 365)), "D")
+    days = arange(first + 1, last + 1)
+    return days[is_busday(days)]
+
+
+def write_synthetic_snapshot(
+    output: Path,
+    years: float = 1.0,
+    currencies: Optional[list] = None,
+    trades_per_day: int = 500,
+    trade_days: int = 1,
+    end: str = "2025-04-15",
+    seed: int = 0,
+) -> dict:
+    """Generate the sheets of every currency and write them as a snapshot.
+
+    The source of the snapshot is named "synthetic", with a digest of the parameters,
+    so the same parameters always give the same data version. It keeps the curve
+    factors of the last day of each currency, to continue them in daily files.
+
+    Returns
+    -------
+    dict
+        The manifest of the snapshot that was written.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy.random import default_rng
+    from openbb_swaps.data.snapshot import write_snapshot
+
+    currencies = currencies or list(CURVE_FACTORS)
+    parameters = {
+        "years": years,
+        "currencies": currencies,
+        "trades_per_day": trades_per_day,
+        "trade_days": trade_days,
+        "end": end,
+        "seed": seed,
+    }
+    source = {
+        "name": "synthetic",
+        "sha256": hashlib.sha256(
+            json.dumps(parameters, sort_keys=True).encode()
+        ).hexdigest(),
+        "modified": time.time(),
+        "parameters": parameters,
+        "curve_factors": {},
+    }
+    dates = business_days(end, years)
+    rng = default_rng(seed)
+
+    def sheets() -> Iterator:
+        # The sheets are consumed before the manifest, with its source, is written.
+        for currency in currencies:
+            factors = curve_factors(currency, len(dates), rng)
+            source["curve_factors"][currency] = factors[-1].tolist()
+            generated = synthetic_sheets(
+                currency, dates, factors, trades_per_day, trade_days, rng
+            )
+            for sheet_name, df in generated.items():
+                yield f"{currency.lower()}_swaps", sheet_name, df
+
+    return write_snapshot(output, source, sheets())
+
+
+def dtcc_daily_file(trades: "DataFrame", path: Path):
+    """Write trades as a DTCC daily CSV file, with the columns `read_trades` reads."""
+    # pylint: disable=import-outside-toplevel
+    from pandas import DataFrame
+
+    indexes = [
+        FLOATING_INDEXES.get(
+            currency, (f"{currency}-OIS-COMPOUND", f"{currency}-LIBOR")
+        )
+        for currency in trades["currency"]
+    ]
+    DataFrame(
+        {
+            DTCC_COLUMNS["action"]: "NEWT",
+            DTCC_COLUMNS["executed"]: trades["spot_date"].dt.strftime(
+                "%Y-%m-%dT14:30:00Z"
+            ),
+            DTCC_COLUMNS["effective"]: trades["effective"].dt.strftime("%Y-%m-%d"),
+            DTCC_COLUMNS["expiration"]: trades["expiration"].dt.strftime("%Y-%m-%d"),
+            DTCC_COLUMNS["cleared"]: trades["cleared"].map({True: "Y", False: "N"}),
+            DTCC_COLUMNS["notional"]: trades["notional"].map("{:,}".format),
+            DTCC_COLUMNS["currency"]: trades["currency"],
+            DTCC_COLUMNS["fixed_rate_1"]: trades["strike"],
+            DTCC_COLUMNS["fixed_rate_2"]: None,
+            DTCC_COLUMNS["underlier_1"]: None,
+            DTCC_COLUMNS["underlier_2"]: [
+                ois if swap_type == "OIS" else libor
+                for (ois, libor), swap_type in zip(indexes, trades["swap.type"])
+            ],
+        }
+    ).to_csv(path, index=False)
+
+
+def write_daily_files(
+    directory: Path,
+    days: int,
+    currencies: Optional[list] = None,
+    trades_per_day: int = 500,
+    start: str = "2025-04-16",
+    seed: int = 0,
+    factors: Optional[dict] = None,
+) -> list:
+    """Write DTCC daily files of synthetic trades, one per business day from `start`.
+
+    The curve factors of each currency continue from its `factors` of the day
+    before `start`, like the "curve_factors" of the source of a synthetic snapshot.
+    Currencies without factors start at their mean.
+
+    Returns
+    -------
+    list
+        The paths of the files written.
+    """
+    # pylint: disable=import-outside-toplevel
+    from numpy import busday_offset, datetime64
+    from numpy.random import default_rng
+    from pandas import concat
+
+    currencies = currencies or list(CURVE_FACTORS)
+    factors = factors or {}
+    dates = busday_offset(datetime64(start, "D"), range(days), roll="forward")
+    rng = default_rng(seed)
+    trades = concat(
+        [
+            synthetic_trades(
+                currency,
+                dates,
+                curve_factors(currency, len(dates), rng, factors.get(currency)),
+                trades_per_day,
+                rng,
+            )
+            for currency in currencies
+        ],
+        ignore_index=True,
+    )
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths: list = []
+    for date, rows in trades.groupby("spot_date"):
+        path = directory / f"SYNTHETIC_RATES_{date:%Y_%m_%d}.csv"
+        dtcc_daily_file(rows, path)
+        paths.append(path)
+
+    return paths
+
+
+def main():
+    """Generate a synthetic swaps data snapshot, and DTCC daily files."""
+    # pylint: disable=import-outside-toplevel
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic swaps data for load and scale testing."
+    )
+    parser.add_argument("--output", required=True, help="Snapshot directory.")
+    parser.add_argument("--years", type=float, default=1.0)
+    parser.add_argument(
+        "--currencies",
+        default=",".join(CURVE_FACTORS),
+        help="Comma-separated currencies. Default is USD,EUR,GBP,JPY.",
+    )
+    parser.add_argument("--trades-per-day", type=int, default=500)
+    parser.add_argument(
+        "--trade-days",
+        type=int,
+        default=1,
+        help="Latest days of individual trades in the trades sheet. Default is 1.",
+    )
+    parser.add_argument("--end", default="2025-04-15", help="Last day of the data.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--daily-files",
+        help="Also write DTCC daily files of the days after the data to this directory.",
+    )
+    parser.add_argument(
+        "--days", type=int, default=5, help="Number of daily files. Default is 5."
+    )
+    args = parser.parse_args()
+    currencies = [c.strip().upper() for c in args.currencies.split(",") if c.strip()]
+
+    manifest = write_synthetic_snapshot(
+        Path(args.output),
+        years=args.years,
+        currencies=currencies,
+        trades_per_day=args.trades_per_day,
+        trade_days=args.trade_days,
+        end=args.end,
+        seed=args.seed,
+    )
+    for store_key, sheets in manifest["stores"].items():
+        for sheet_name, sheet in sheets.items():
+            print(f"{store_key} / {sheet_name}: {sheet['rows']} rows")  # noqa: T201
+    print(f"Snapshot written to {args.output}")  # noqa: T201
+
+    if args.daily_files:
+        # pylint: disable=import-outside-toplevel
+        from numpy import busday_offset, datetime64
+
+        start = str(busday_offset(datetime64(args.end, "D"), 1, roll="forward"))
+        paths = write_daily_files(
+            Path(args.daily_files),
+            args.days,
+            currencies=currencies,
+            trades_per_day=args.trades_per_day,
+            start=start,
+            seed=args.seed + 1,
+            factors=manifest["source"]["curve_factors"],
+        )
+        print(f"{len(paths)} daily files written to {args.daily_files}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Swap Rate Volume Cube."""
+
+from typing import TYPE_CHECKING, Iterator
+
+from openbb_core.app.model.abstract.error import OpenBBError
+from openbb_swaps.data.periods import Frequency, period_bounds, resample
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+
+SWAP_VOLUME_TYPES = ["Libor", "OIS"]
+
+
+class SwapVolumeCube:
+    """Notional and PV01 sums by spot date, swap type and tenor bucket.
+
+    Each of `notional`, `pv01` and `trades` is an array shaped
+    (spot dates, swap types, buckets). `trades` counts the rows summed into each cell,
+    so dates with trades that net to zero are kept apart from dates without trades.
+    """
+
+    def __init__(self, dates, buckets: list, notional, pv01, trades):
+        """Initialize the cube from its axes and arrays."""
+        self.dates = dates
+        self.buckets = buckets
+        self.notional = notional
+        self.pv01 = pv01
+        self.trades = trades
+        self._positions = {bucket: i for i, bucket in enumerate(buckets)}
+
+    @classmethod
+    def from_frame(cls, df: "DataFrame") -> "SwapVolumeCube":
+        """Build the cube from a normalized "Trading Data" sheet."""
+        # pylint: disable=import-outside-toplevel
+        from numpy import add, unique, zeros
+        from pandas import Index
+
+        df = df[df["swap.type"].isin(SWAP_VOLUME_TYPES)]
+        dates, date_positions = unique(df["spot_date"].to_numpy(), return_inverse=True)
+        buckets = df["Bucket"].unique().tolist()
+        type_positions = Index(SWAP_VOLUME_TYPES).get_indexer(df["swap.type"])
+        bucket_positions = Index(buckets).get_indexer(df["Bucket"])
+        shape = (len(dates), len(SWAP_VOLUME_TYPES), len(buckets))
+        cells = (date_positions, type_positions, bucket_positions)
+
+        notional = zeros(shape, dtype="int64")
+        pv01 = zeros(shape, dtype="float64")
+        trades = zeros(shape, dtype="int64")
+        add.at(notional, cells, df["notional"].to_numpy(dtype="int64"))
+        add.at(pv01, cells, df["pv01"].to_numpy(dtype="float64"))
+        add.at(trades, cells, 1)
+
+        return cls(dates, buckets, notional, pv01, trades)
+
+    def append(self, df: "DataFrame") -> "SwapVolumeCube":
+        """Get a new cube with the rows of a "Trading Data" frame added.
+
+        Only the new rows are aggregated. They are added into the existing cells,
+        so appending a day costs the size of the day, not of the history.
+        """
+        # pylint: disable=import-outside-toplevel
+        from numpy import arange, ix_, union1d, zeros
+
+        delta = SwapVolumeCube.from_frame(df)
+        buckets = self.buckets + [b for b in delta.buckets if b not in self._positions]
+        bucket_positions = {bucket: i for i, bucket in enumerate(buckets)}
+        dates = union1d(self.dates, delta.dates)
+        types = arange(len(SWAP_VOLUME_TYPES))
+        arrays: list = []
+
+        for name in ["notional", "pv01", "trades"]:
+            merged = zeros(
+                (len(dates), len(types), len(buckets)), dtype=getattr(self, name).dtype
+            )
+            for cube in (self, delta):
+                rows = dates.searchsorted(cube.dates)
+                columns = [bucket_positions[b] for b in cube.buckets]
+                merged[ix_(rows, types, columns)] += getattr(cube, name)
+            arrays.append(merged)
+
+        return SwapVolumeCube(dates, buckets, *arrays)
+
+    def _series(
+        self,
+        stat: str,
+        buckets: list,
+        period: str,
+        start_date=None,
+        end_date=None,
+        frequency: Frequency = "daily",
+    ) -> tuple:
+        """Get the dates, Libor and OIS volumes, and 5-day averages over a period.
+
+        The period ends on the last date with trades, or on the `end_date`, and starts
+        on the `start_date` when it is given. Rows are daily, or weekly or monthly
+        with `frequency`, downsampled after the daily 5-day average.
+        """
+        # pylint: disable=import-outside-toplevel
+        from numpy import column_stack
+        from pandas import Series
+
+        columns = sorted({self._positions[b] for b in buckets if b in self._positions})
+        values = (self.notional if stat == "Notional" else self.pv01)[..., columns]
+        rows = self.trades[..., columns].sum(axis=(1, 2)) > 0
+        volume = values[rows].sum(axis=2)
+        moving_average = (
+            Series(volume.sum(axis=1)).rolling(5).mean().to_numpy()[4:].astype("int64")
+        )
+        volume = volume[4:].astype("int64")
+        dates = self.dates[rows][4:]
+
+        if len(dates) == 0:
+            if period != "1y" and start_date is None:
+                raise OpenBBError("No volume data to anchor the lookback period.")
+            return dates, volume, moving_average
+
+        rows = slice(*period_bounds(dates, period, start_date, end_date))
+        dates, volume, moving_average = dates[rows], volume[rows], moving_average[rows]
+        if frequency != "daily":
+            dates, (libor, ois, moving_average) = resample(
+                dates, [volume[:, 0], volume[:, 1], moving_average], frequency
+            )
+            volume = column_stack([libor, ois])
+
+        return dates, volume, moving_average
+
+    @staticmethod
+    def _records(dates, volume, moving_average) -> list:
+        """Get the records of rows of the volume series."""
+        # pylint: disable=import-outside-toplevel
+        from numpy import datetime_as_string
+
+        return [
+            {
+                "spot_date": date,
+                "Libor Volume": libor,
+                "OIS Volume": ois,
+                "Total 5-Day MA Volume": average,
+            }
+            for date, (libor, ois), average in zip(
+                datetime_as_string(dates, unit="D").tolist(),
+                volume.tolist(),
+                moving_average.tolist(),
+            )
+        ]
+
+    def query(self, stat: str, buckets: list, period: str, **options) -> list:
+        """Get the Libor, OIS and total 5-day average volume for the buckets.
+
+        Volumes are summed over the selected buckets, for dates with trades in them.
+        """
+        return self._records(*self._series(stat, buckets, period, **options))
+
+    def query_columns(self, stat: str, buckets: list, period: str, **options) -> dict:
+        """Get the series of `query` as arrays keyed like the records, one row per date."""
+        dates, volume, moving_average = self._series(stat, buckets, period, **options)
+
+        return {
+            "spot_date": dates,
+            "Libor Volume": volume[:, 0],
+            "OIS Volume": volume[:, 1],
+            "Total 5-Day MA Volume": moving_average,
+        }
+
+    def query_series(self, stat: str, buckets: list, period: str, **options) -> tuple:
+        """Get the dates, volumes and 5-day averages of `query`, as arrays.
+
+        The arrays are compact and picklable, to be turned into records with
+        `iter_records` in another thread or process than the one querying.
+        """
+        return self._series(stat, buckets, period, **options)
+
+    @classmethod
+    def iter_records(cls, series: tuple, batch_size: int = 1000) -> Iterator[list]:
+        """Get the records of a `query_series` result in batches of up to `batch_size` dates."""
+        dates, volume, moving_average = series
+        for start in range(0, len(dates), batch_size):
+            rows = slice(start, start + batch_size)
+            yield cls._records(dates[rows], volume[rows], moving_average[rows])
+
+    def iter_query(
+        self,
+        stat: str,
+        buckets: list,
+        period: str,
+        batch_size: int = 1000,
+        **options,
+    ) -> Iterator[list]:
+        """Get the records of `query` in batches of up to `batch_size` dates."""
+        return self.iter_records(
+            self._series(stat, buckets, period, **options), batch_size
+        )
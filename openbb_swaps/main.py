@@ -1,19 +1,86 @@
 """Main entry point for the OpenBB API."""
 
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    """Parse the launch command line arguments."""
+    # pylint: disable=import-outside-toplevel
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Launch the DTCC Trade Repository application.",
+        epilog="Send SIGHUP to the main process to restart the workers one at a time,"
+        + " SIGTTIN or SIGTTOU to add or remove a worker.",
+    )
+    parser.add_argument(
+        "--host",
+        default=os.environ.get("OPENBB_SWAPS_HOST", "0.0.0.0"),  # noqa: S104
+    )
+    parser.add_argument(
+        "--port", type=int, default=int(os.environ.get("OPENBB_SWAPS_PORT", 6020))
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("OPENBB_SWAPS_WORKERS", 1)),
+        help="Number of worker processes. Default is 1.",
+    )
+    parser.add_argument(
+        "--timeout-graceful-shutdown",
+        type=int,
+        default=int(os.environ.get("OPENBB_SWAPS_GRACEFUL_TIMEOUT", 30)),
+        help="Seconds a stopping worker waits for in-flight requests. Default is 30.",
+    )
+    return parser.parse_args()
+
+
+def ensure_snapshot():
+    """Build the data snapshot, if it is missing or stale, before starting workers.
+
+    Workers memory-map the snapshot, so its pages are held once for all of them.
+    """
+    # pylint: disable=import-outside-toplevel
+    from openbb_swaps.data.snapshot import (
+        archive_path,
+        build_snapshot,
+        load_snapshot,
+        snapshot_path,
+    )
+
+    if load_snapshot(snapshot_path, archive_path) is not None:
+        return
+    try:
+        build_snapshot(archive_path, snapshot_path)
+    except OSError as e:
+        logger.warning(
+            "Could not build the swaps data snapshot at %s -> %s", snapshot_path, e
+        )
+
 
 def main():
-    import subprocess
-
-    subprocess.run(
-        [
-            "openbb-api",
-            "--app",
-            __file__.replace("main.py", "app/app.py"),
-            "--host",
-            "0.0.0.0",
-            "--port",
-            "6020",
-        ]
+    """Launch the application with one or more worker processes."""
+    # pylint: disable=import-outside-toplevel
+    import sys
+
+    import uvicorn
+
+    args = parse_args()
+    ensure_snapshot()
+
+    # The OpenBB Platform API launcher reads the app from the command line
+    # when it is imported, in this process and in each spawned worker.
+    sys.argv = [sys.argv[0], "--app", __file__.replace("main.py", "app/app.py")]
+
+    uvicorn.run(
+        "openbb_platform_api.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.timeout_graceful_shutdown,
     )
 
 
@@ -1,8 +1,10 @@
 """Swaps Data Query Parameter Types."""
 
-from typing import Annotated, Literal, Union
+from datetime import date as dateType
+from typing import Annotated, Literal, Optional, Union
 
-from fastapi import Query
+from fastapi import Body, Query
+from pydantic import BaseModel, Field
 
 SWAP_TENOR_CHOICES = [
     {"value": "1", "label": "1Y"},
@@ -58,6 +60,8 @@ SwapRateTenors = Annotated[
     ],
     Query(
         description="The tenor of swap to query. Can be a single tenor or a comma-separated list of tenors. Default is 2Y - 10Y Spread."
+        + " Any spread or butterfly of the par tenors can be requested as an expression,"
+        + " like 3s7s for the 7Y rate less the 3Y rate, or 5s10s30s for the 5Y and 30Y rates less twice the 10Y rate."
         + " Possible values are:\n"
         + "\n".join(
             [
@@ -88,7 +92,8 @@ SwapCurrency = Annotated[
 SwapRatePeriod = Annotated[
     Literal["1m", "3m", "6m", "YTD", "1y"],
     Query(
-        description="The historical window of levels. Default is 1y."
+        description="The historical window of levels, ending on the last date. Default is 1y."
+        + " Ignored when a start date is given."
         + " Possible values are:\n"
         + "\n- 1m\n- 3m\n- 6m\n- YTD\n- 1y",
         json_schema_extra={
@@ -106,6 +111,46 @@ SwapRatePeriod = Annotated[
     ),
 ]
 
+SwapRateStartDate = Annotated[
+    Optional[dateType],
+    Query(
+        description="The first date of the time series. Default is the start of the period.",
+        json_schema_extra={"x-widget_config": {"label": "Start Date"}},
+    ),
+]
+
+SwapRateEndDate = Annotated[
+    Optional[dateType],
+    Query(
+        description="The last date of the time series. Default is the last available date.",
+        json_schema_extra={"x-widget_config": {"label": "End Date"}},
+    ),
+]
+
+SwapRateFrequency = Annotated[
+    Literal["daily", "weekly", "monthly", "weekly_mean", "monthly_mean"],
+    Query(
+        description="The frequency of the time series. Default is daily."
+        + " Weekly and monthly rows are dated on the last date of the week or month."
+        + " Possible values are:\n"
+        + "\n- daily\n- weekly (Last value of each week)\n- monthly (Last value of each month)"
+        + "\n- weekly_mean (Mean of each week)\n- monthly_mean (Mean of each month)",
+        json_schema_extra={
+            "x-widget_config": {
+                "type": "dropdown",
+                "label": "Frequency",
+                "options": [
+                    {"value": "daily", "label": "Daily"},
+                    {"value": "weekly", "label": "Weekly"},
+                    {"value": "monthly", "label": "Monthly"},
+                    {"value": "weekly_mean", "label": "Weekly Mean"},
+                    {"value": "monthly_mean", "label": "Monthly Mean"},
+                ],
+            }
+        },
+    ),
+]
+
 
 SwapVolumeTypes = Annotated[
     Literal["Notional", "PV01"],
@@ -170,7 +215,7 @@ SwapTradeDistributionDates = Annotated[
 
 
 SwapCurveDates = Annotated[
-    str,
+    Optional[str],
     Query(
         description="The date of the curve. Default is the last available date.",
         json_schema_extra={
@@ -178,26 +223,70 @@ SwapCurveDates = Annotated[
                 "type": "endpoint",
                 "multiSelect": True,
                 "optionsEndpoint": "swap_curve/dates",
-                "optionsParams": {"currency": "$currency", "swap_type": "$swap_type"},
+                "optionsParams": {"currency": "$currency"},
                 "label": "Curve Date",
             }
         },
     ),
 ]
 
+# Pricing curves are only published for OIS.
+SwapCurveTypes = Annotated[
+    Literal["OIS"],
+    Query(description="The type of swap curve - OIS. Default is OIS."),
+]
+
+SwapCurveMethods = Annotated[
+    Literal["monotone", "cubic", "linear"],
+    Query(
+        description="The interpolation method. Default is monotone."
+        + " Possible values are:\n"
+        + "\n- monotone (Monotone piecewise cubic, no overshoot between points)"
+        + "\n- cubic (Natural cubic spline)"
+        + "\n- linear (Linear between points)",
+        json_schema_extra={"x-widget_config": {"label": "Interpolation"}},
+    ),
+]
+
+SwapCurveMeasures = Annotated[
+    Literal["par", "zero"],
+    Query(
+        description="The rates of the curve. Default is par."
+        + " Possible values are:\n"
+        + "\n- par (Par swap rates)"
+        + "\n- zero (Annually compounded zero rates, bootstrapped from the par rates)",
+        json_schema_extra={"x-widget_config": {"label": "Rates"}},
+    ),
+]
+
+SwapCurveMaturities = Annotated[
+    Optional[str],
+    Query(
+        description="Comma-separated maturities to evaluate, in years, like 0.5,2.5,12."
+        + " Default is an even grid of points over the maturities of the curve.",
+        json_schema_extra={"x-widget_config": {"exclude": True}},
+    ),
+]
+
+SwapCurvePoints = Annotated[
+    int,
+    Query(
+        description="The number of points of the even grid of maturities. Default is 100.",
+        ge=2,
+        le=10000,
+        json_schema_extra={"x-widget_config": {"label": "Points"}},
+    ),
+]
+
 SwapTradesDates = Annotated[
-    str,
+    Optional[str],
     Query(
-        description="The date to query. This feature is not implemented for historical data.",
+        description="The date to query. Default is the last available date.",
         json_schema_extra={
             "x-widget_config": {
-                "options": [
-                    {"value": "2025-04-15", "label": "2025-04-15"},
-                    {
-                        "value": "2025-04-15",
-                        "label": "Integrate your database for this feature....",
-                    },
-                ],
+                "type": "endpoint",
+                "optionsEndpoint": "swap_trades/dates",
+                "optionsParams": {"currency": "$currency"},
                 "label": "Trade Date",
             }
         },
@@ -227,3 +316,39 @@ SwapTradesIncludeStarting = Annotated[
         },
     ),
 ]
+
+ResponseFormat = Annotated[
+    Literal["json", "ndjson", "arrow", "parquet"],
+    Query(
+        description="The format of the response. Default is json,"
+        + " or the Arrow or Parquet media type named in the Accept header."
+        + " Possible values are:\n"
+        + "\n- json (A JSON array of records)"
+        + "\n- ndjson (Newline-delimited JSON, one record per line, streamed in batches)"
+        + "\n- arrow (An Arrow IPC stream of the columns, requires pyarrow)"
+        + "\n- parquet (A Parquet file of the columns, requires pyarrow)",
+        json_schema_extra={"x-widget_config": {"exclude": True}},
+    ),
+]
+
+
+class BatchQuery(BaseModel):
+    """A query to a data endpoint, in a batch request."""
+
+    endpoint: str = Field(
+        description="The path of the endpoint, e.g. /swap_rate_levels.",
+    )
+    params: dict[str, Union[str, int, float, bool, list[str]]] = Field(
+        default_factory=dict,
+        description="The query parameters of the endpoint."
+        + " Lists are sent as repeated parameters, joined into comma-separated values.",
+    )
+
+
+BatchQueries = Annotated[
+    list[BatchQuery],
+    Body(
+        description="The queries to run, up to 32.",
+        max_length=32,
+    ),
+]
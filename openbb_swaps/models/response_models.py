@@ -1,9 +1,9 @@
 """Swaps Data Response Models."""
 
 from datetime import date as dateType
-from typing import Optional
+from typing import Any, Optional
 from openbb_core.provider.abstract.data import Data
-from pydantic import ConfigDict, Field, model_serializer
+from pydantic import BaseModel, ConfigDict, Field, model_serializer
 
 
 SWAP_RATE_LEVELS_TENOR_MAP = {
@@ -398,8 +398,12 @@ class SwapRateLevelsResponseModel(Data):
 
     @model_serializer()
     def serialize_model(self):
-        """Serialize the model to a dictionary."""
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        """Serialize the model to a dictionary, with the series of custom expressions."""
+        return {
+            k: v
+            for k, v in {**self.__dict__, **(self.model_extra or {})}.items()
+            if v is not None
+        }
 
 
 class SwapRateVolumeResponseModel(Data):
@@ -620,3 +624,62 @@ class SwapTradesResponseModel(Data):
             },
         },
     )
+
+
+class SwapCurveResponseModel(Data):
+    """DTCC Swap Curve Data.
+
+    The rate of each curve date is an extra field, named by the ISO date.
+    """
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "x-widget_config": {
+                "$data": {
+                    "table": {
+                        "enableCharts": True,
+                        "chartView": {
+                            "chartType": "line",
+                            "enabled": True,
+                            "ignoreCellRange": True,
+                        },
+                    }
+                }
+            }
+        }
+    )
+
+    maturity: float = Field(
+        description="Maturity of the swap, in years.",
+        json_schema_extra={
+            "x-widget_config": {
+                "headerName": "Maturity",
+                "chartDataType": "category",
+            }
+        },
+    )
+
+    @model_serializer()
+    def serialize_model(self):
+        """Serialize the model to a dictionary, with the rate of each curve date."""
+        return {
+            k: v
+            for k, v in {**self.__dict__, **(self.model_extra or {})}.items()
+            if v is not None
+        }
+
+
+class BatchResult(BaseModel):
+    """The result of a query in a batch request."""
+
+    endpoint: str = Field(description="The path of the endpoint.")
+    params: dict = Field(description="The query parameters of the endpoint.")
+    status: int = Field(description="The HTTP status code of the query.")
+    error: Optional[Any] = Field(
+        default=None,
+        description="The error detail, when the status is not 200.",
+    )
+    data: Optional[Any] = Field(
+        default=None,
+        description="The response of the endpoint, when the status is 200.",
+    )
@@ -0,0 +1,45 @@
+"""Shared fixtures: a small synthetic snapshot and DTCC daily files after it."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from openbb_swaps.data.synthetic import write_daily_files, write_synthetic_snapshot
+
+CURRENCIES = ["EUR", "USD"]
+
+
+@pytest.fixture(scope="session")
+def synthetic_data(tmp_path_factory) -> Path:
+    """Generate the snapshot and daily files once for the session."""
+    root = tmp_path_factory.mktemp("synthetic")
+    manifest = write_synthetic_snapshot(
+        root / "snapshot",
+        years=0.25,
+        currencies=CURRENCIES,
+        trades_per_day=60,
+        trade_days=2,
+    )
+    write_daily_files(
+        root / "daily",
+        days=3,
+        currencies=CURRENCIES,
+        trades_per_day=60,
+        start="2025-04-16",
+        seed=1,
+        factors=manifest["source"]["curve_factors"],
+    )
+    return root
+
+
+@pytest.fixture
+def snapshot_dir(synthetic_data, tmp_path) -> Path:
+    """Get a copy of the synthetic snapshot, for a test to modify."""
+    return Path(shutil.copytree(synthetic_data / "snapshot", tmp_path / "snapshot"))
+
+
+@pytest.fixture
+def daily_files(synthetic_data) -> list:
+    """Get the DTCC daily files of the days after the snapshot, in order."""
+    return sorted((synthetic_data / "daily").glob("*.csv"))
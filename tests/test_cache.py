@@ -0,0 +1,99 @@
+"""Tests of the response cache keys and validators."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from openbb_swaps.app.cache import ResponseCache, ResponseCacheMiddleware
+from openbb_swaps.app.responses import negotiate_format
+
+ARROW = "application/vnd.apache.arrow.stream"
+
+
+@pytest.fixture
+def data():
+    """Get the data version and the number of handler calls of the app."""
+    return {"version": "v1", "calls": 0}
+
+
+@pytest.fixture
+def client(data) -> TestClient:
+    """Get a client of an app with a cached endpoint, echoing its parameters."""
+    app = FastAPI()
+
+    @app.get("/levels")
+    def levels(tenor: str = "2s10s", period: str = "1y", format: str = "json"):
+        data["calls"] += 1
+        return {"tenor": sorted(set(tenor.split(","))), "period": period}
+
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=ResponseCache(maxsize=16),
+        paths={"/levels"},
+        get_version=lambda: data["version"],
+        get_last_modified=lambda: 1_700_000_000.0,
+    )
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "first, second",
+    [
+        ("tenor=2s10s,1s5s", "tenor=1s5s,2s10s"),
+        ("tenor=2s10s,1s5s", "tenor=1s5s&tenor=2s10s"),
+        ("tenor=1s5s,1s5s", "tenor=1s5s"),
+        ("", "tenor=2s10s&period=1y&format=json"),
+        ("unknown=1", ""),
+    ],
+)
+def test_equivalent_queries_share_an_etag(client, data, first, second):
+    """Queries with the same canonical parameters share the ETag and cached response."""
+    a = client.get(f"/levels?{first}")
+    b = client.get(f"/levels?{second}")
+
+    assert a.status_code == b.status_code == 200
+    assert a.headers["etag"] == b.headers["etag"]
+    assert a.content == b.content
+    assert b.headers["x-cache"] == "hit"
+    assert data["calls"] == 1
+
+
+def test_different_queries_have_different_etags(client):
+    """Queries with different parameters or formats have different ETags."""
+    etags = {
+        client.get("/levels?tenor=2s10s").headers["etag"],
+        client.get("/levels?tenor=1s5s").headers["etag"],
+        client.get("/levels?period=5y").headers["etag"],
+        client.get("/levels?format=ndjson").headers["etag"],
+    }
+
+    assert len(etags) == 4
+
+
+def test_etag_follows_the_negotiated_format(client, monkeypatch):
+    """The Accept header keys the response by the format it negotiates."""
+    monkeypatch.setattr("openbb_swaps.app.responses.pyarrow_available", lambda: True)
+    negotiate_format.cache_clear()
+    try:
+        plain = client.get("/levels").headers["etag"]
+        accept_json = client.get("/levels", headers={"accept": "application/json"})
+        arrow = client.get("/levels", headers={"accept": ARROW})
+        explicit = client.get("/levels?format=arrow")
+    finally:
+        negotiate_format.cache_clear()
+
+    assert accept_json.headers["etag"] == plain
+    assert arrow.headers["etag"] == explicit.headers["etag"] != plain
+
+
+def test_etag_changes_with_the_data_version(client, data):
+    """A new data version gives new ETags, and runs the request again."""
+    etag = client.get("/levels").headers["etag"]
+    assert client.get("/levels", headers={"if-none-match": etag}).status_code == 304
+
+    data["version"] = "v2"
+    response = client.get("/levels", headers={"if-none-match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert data["calls"] == 2
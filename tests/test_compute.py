@@ -0,0 +1,52 @@
+"""Tests of the compute executors."""
+
+import asyncio
+
+from openbb_swaps.app import handlers
+from openbb_swaps.app.compute import ComputeExecutor
+from openbb_swaps.data.ingest import ingest_files
+from openbb_swaps.data.snapshot import load_snapshot
+from openbb_swaps.data.store import SwapsDataStore, get_version_store, store_spec
+
+
+def open_store(snapshot_dir) -> SwapsDataStore:
+    """Open a store over the current version of a snapshot."""
+    source = load_snapshot(snapshot_dir, snapshot_dir)
+    return SwapsDataStore(source, source.data_version, source.data_modified)
+
+
+def volume(store) -> list:
+    """Get the EUR notional volume of the 7-10 year bucket."""
+    return handlers.swap_rate_volume(store, "EUR", "Notional", "7-10", "1y")
+
+
+def test_version_store_loads_the_leased_version(snapshot_dir, daily_files):
+    """The store of a spec has its data version, after the data on disk changed."""
+    old = open_store(snapshot_dir)
+    spec = store_spec(old)
+    ingest_files(daily_files, snapshot_dir)
+    new = open_store(snapshot_dir)
+
+    assert get_version_store(spec).data_version == old.data_version
+    assert get_version_store(store_spec(new)).data_version == new.data_version
+    assert volume(get_version_store(spec)) == volume(old) != volume(new)
+
+
+def test_process_tasks_compute_on_the_leased_version(snapshot_dir, daily_files):
+    """Process pool tasks compute on the version the request leased."""
+    old = open_store(snapshot_dir)
+    ingest_files(daily_files, snapshot_dir)
+    new = open_store(snapshot_dir)
+    executor = ComputeExecutor("process", max_workers=1)
+
+    async def run(store) -> list:
+        return await executor.run(
+            handlers.swap_rate_volume, store, "EUR", "Notional", "7-10", "1y"
+        )
+
+    try:
+        assert asyncio.run(run(old)) == volume(old)
+        assert asyncio.run(run(new)) == volume(new)
+        assert asyncio.run(run(old)) == volume(old)
+    finally:
+        executor.shutdown()
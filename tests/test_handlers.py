@@ -0,0 +1,46 @@
+"""Tests of the endpoint handlers."""
+
+from numpy import array
+
+from openbb_swaps.app import handlers
+from openbb_swaps.data.curves import SwapCurves
+
+
+class CurvesStore:
+    """A store with the pricing curves of one currency."""
+
+    def __init__(self, points: dict):
+        """Initialize the curves from their knots, by swap type and date."""
+        self.curves = SwapCurves(points)
+
+    def get_curves(self, currency: str) -> SwapCurves:
+        """Get the curves of any currency."""
+        return self.curves
+
+
+def test_curve_of_a_single_point_is_one_row():
+    """A curve of a single pricing point gives the rate at its maturity."""
+    store = CurvesStore({"OIS": {"2025-04-15": (array([5.0]), array([3.25]))}})
+    records = handlers.swap_curve(
+        store, "USD", "OIS", None, "monotone", "par", None, 100
+    )
+
+    assert records == [{"maturity": 5.0, "2025-04-15": 3.25}]
+
+
+def test_curve_spans_the_knots_of_every_date():
+    """Curves of several dates are evaluated from the first to the last knot."""
+    store = CurvesStore(
+        {
+            "OIS": {
+                "2025-04-14": (array([5.0]), array([3.0])),
+                "2025-04-15": (array([1.0, 10.0]), array([3.5, 4.0])),
+            }
+        }
+    )
+    records = handlers.swap_curve(
+        store, "USD", "OIS", "2025-04-14,2025-04-15", "linear", "par", None, 10
+    )
+
+    assert [r["maturity"] for r in records] == [float(m) for m in range(1, 11)]
+    assert {r["2025-04-14"] for r in records} == {3.0}
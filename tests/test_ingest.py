@@ -0,0 +1,141 @@
+"""Tests of the ingestion of DTCC daily files into a snapshot."""
+
+import json
+
+import numpy
+import pandas
+import pytest
+
+from openbb_swaps.data import snapshot
+from openbb_swaps.data.frames import normalize_frame
+from openbb_swaps.data.ingest import ingest_files, ingest_lock
+from openbb_swaps.data.snapshot import (
+    MANIFEST_NAME,
+    SwapsSnapshot,
+    compact_snapshot,
+    load_snapshot,
+)
+
+
+def read_manifest(snapshot_dir) -> dict:
+    """Read the manifest of a snapshot."""
+    return json.loads((snapshot_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+
+
+def segment_dirs(snapshot_dir) -> set:
+    """List the segment directories on disk of the sheets of the manifest."""
+    return {
+        path.relative_to(snapshot_dir).as_posix()
+        for sheets in read_manifest(snapshot_dir)["stores"].values()
+        for sheet in sheets.values()
+        for path in (snapshot_dir / sheet["path"]).glob("segment-*")
+    }
+
+
+def listed_segments(manifest: dict) -> set:
+    """List the segment directories of a manifest."""
+    return {
+        segment["path"]
+        for sheets in manifest["stores"].values()
+        for sheet in sheets.values()
+        for segment in sheet.get("segments", [])
+    }
+
+
+def test_ingest_appends_segments(snapshot_dir, daily_files):
+    """Daily files are appended once, and a second run skips them."""
+    version = load_snapshot(snapshot_dir, snapshot_dir).data_version
+
+    appended = ingest_files(daily_files, snapshot_dir)
+
+    assert set(appended) == {"eur_swaps", "usd_swaps"}
+    manifest = read_manifest(snapshot_dir)
+    assert [d["name"] for d in manifest["deltas"]] == [p.name for p in daily_files]
+    assert segment_dirs(snapshot_dir) == listed_segments(manifest)
+    assert load_snapshot(snapshot_dir, snapshot_dir).data_version != version
+    assert ingest_files(daily_files, snapshot_dir) == {}
+
+
+def test_failed_file_keeps_earlier_files_and_retry_succeeds(
+    snapshot_dir, daily_files, tmp_path
+):
+    """A malformed file leaves no segments behind, and the ingest can be retried."""
+    bad = tmp_path / "bad.csv"
+    bad.write_text("not,a,dtcc,file\n1,2,3,4\n", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        ingest_files([daily_files[0], bad], snapshot_dir)
+
+    manifest = read_manifest(snapshot_dir)
+    assert [d["name"] for d in manifest["deltas"]] == [daily_files[0].name]
+    assert segment_dirs(snapshot_dir) == listed_segments(manifest)
+
+    ingest_files(daily_files, snapshot_dir)
+
+    manifest = read_manifest(snapshot_dir)
+    assert [d["name"] for d in manifest["deltas"]] == [p.name for p in daily_files]
+    assert segment_dirs(snapshot_dir) == listed_segments(manifest)
+
+
+def test_segments_left_by_a_crash_are_removed(snapshot_dir, daily_files):
+    """Segment directories that the manifest does not list do not block the next ingest."""
+    orphan = snapshot_dir / "eur_swaps" / "interest_rates" / "segment-00001"
+    orphan.mkdir()
+    (orphan / "rate.npy").write_bytes(b"partial")
+
+    ingest_files(daily_files[:1], snapshot_dir)
+
+    manifest = read_manifest(snapshot_dir)
+    assert segment_dirs(snapshot_dir) == listed_segments(manifest)
+    assert numpy.load(orphan / "rate.npy").dtype == "float64"
+
+
+def test_concurrent_ingest_is_refused(snapshot_dir, daily_files):
+    """A second ingest into the same snapshot fails while one holds the lock."""
+    with ingest_lock(snapshot_dir):
+        with pytest.raises(RuntimeError, match="Another ingest"):
+            ingest_files(daily_files, snapshot_dir)
+
+    assert "deltas" not in read_manifest(snapshot_dir)
+
+
+def test_ingest_compacts_segments(snapshot_dir, daily_files):
+    """Segments are folded into a new generation of the columns of their sheets."""
+    ingest_files(daily_files[:1], snapshot_dir)
+    before = read_manifest(snapshot_dir)
+
+    ingest_files(daily_files[1:], snapshot_dir)
+
+    manifest = read_manifest(snapshot_dir)
+    assert listed_segments(manifest) == set()
+    sheet = manifest["stores"]["eur_swaps"]["Interest Rates"]
+    assert sheet["generation"] == 2
+    assert before["stores"]["eur_swaps"]["Interest Rates"]["rows"] < sheet["rows"]
+    # The generation replaced by the first compaction is removed by the second.
+    assert not (snapshot_dir / before["retired"][0]).exists()
+    assert all((snapshot_dir / path).exists() for path in manifest["retired"])
+
+
+def test_compacted_rows_match_the_segments(snapshot_dir, daily_files, monkeypatch):
+    """Compaction keeps every row, in order."""
+    monkeypatch.setattr(snapshot, "compact_snapshot", lambda path, manifest: manifest)
+    ingest_files(daily_files, snapshot_dir)
+    manifest = read_manifest(snapshot_dir)
+    assert listed_segments(manifest)
+    segmented = SwapsSnapshot(snapshot_dir, manifest)
+    rows = {
+        sheet_name: normalize_frame(segmented.get_store("usd_swaps", sheet_name))
+        for sheet_name in manifest["stores"]["usd_swaps"]
+    }
+    appended = segmented.get_rows("usd_swaps", "Trading Data", start=100)
+
+    compacted = SwapsSnapshot(snapshot_dir, compact_snapshot(snapshot_dir, manifest))
+
+    for sheet_name, df in rows.items():
+        pandas.testing.assert_frame_equal(
+            normalize_frame(compacted.get_store("usd_swaps", sheet_name)), df
+        )
+    pandas.testing.assert_frame_equal(
+        normalize_frame(compacted.get_rows("usd_swaps", "Trading Data", start=100)),
+        normalize_frame(appended),
+    )
@@ -0,0 +1,37 @@
+"""Tests of the swap rate levels matrix."""
+
+import pytest
+
+from openbb_swaps.data.snapshot import load_snapshot
+from openbb_swaps.data.store import SwapsDataStore
+
+
+@pytest.fixture
+def rate_levels(snapshot_dir):
+    """Get the EUR swap rate levels of the synthetic snapshot."""
+    source = load_snapshot(snapshot_dir, snapshot_dir)
+    store = SwapsDataStore(source, source.data_version, source.data_modified)
+    return store.get_rate_levels("EUR")
+
+
+def test_derived_spreads_are_computed_from_par_tenors(rate_levels):
+    """A spread not stored in the data is the difference of its par tenors."""
+    records = rate_levels.query("OIS", ["3s7s", "3", "7"], "3m")
+
+    assert records
+    for record in records:
+        if {"ois_3", "ois_7", "ois_3s7s"} <= set(record):
+            assert record["ois_3s7s"] == pytest.approx(
+                record["ois_7"] - record["ois_3"], abs=1e-9
+            )
+
+
+def test_derived_spreads_are_not_kept(rate_levels):
+    """Distinct expressions do not grow the shared matrix."""
+    state = dict(vars(rate_levels))
+
+    for expression in ["1s2s", "3s7s", "4s15s", "2s7s20s", "1s3s5s"]:
+        assert rate_levels.query("OIS", [expression], "1m")
+
+    assert vars(rate_levels).keys() == state.keys()
+    assert all(vars(rate_levels)[key] is value for key, value in state.items())
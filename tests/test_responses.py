@@ -0,0 +1,100 @@
+"""Tests of the output formats of the data endpoints."""
+
+import json
+from importlib.util import find_spec
+
+import pytest
+from fastapi.testclient import TestClient
+
+from openbb_swaps.app.app import app
+from openbb_swaps.app.responses import TABLE_MEDIA_TYPES, negotiate_format
+
+ENDPOINTS = [
+    "/swap_rate_levels?currency=EUR&tenor=2s10s,10&period=3m",
+    "/swap_rate_volume?currency=EUR&bucket=2-5,7-10&period=3m",
+]
+
+
+@pytest.fixture(scope="module")
+def client() -> TestClient:
+    """Get a client of the application, over the bundled data."""
+    return TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+def test_ndjson_has_the_json_records(client, url):
+    """Newline-delimited JSON has the records of the JSON response, one per line."""
+    records = client.get(url).json()
+    response = client.get(f"{url}&format=ndjson")
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert records
+    assert [json.loads(line) for line in response.text.splitlines()] == records
+
+
+@pytest.mark.parametrize("url", ENDPOINTS)
+@pytest.mark.parametrize("table_format", list(TABLE_MEDIA_TYPES))
+def test_tables_have_the_json_columns(client, url, table_format):
+    """Arrow and Parquet tables have the columns of the JSON records, in order."""
+    response = client.get(f"{url}&format={table_format}")
+    if find_spec("pyarrow") is None:
+        assert response.status_code == 406
+        return
+
+    # pylint: disable=import-outside-toplevel
+    import io
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    assert response.headers["content-type"] == TABLE_MEDIA_TYPES[table_format]
+    buffer = io.BytesIO(response.content)
+    table = (
+        pa.ipc.open_stream(buffer).read_all()
+        if table_format == "arrow"
+        else pq.read_table(buffer)
+    )
+    records = client.get(url).json()
+    assert table.column_names == list(records[0])
+    assert table.num_rows == len(records)
+
+
+@pytest.mark.parametrize(
+    "accept, available, expected",
+    [
+        (None, False, "json"),
+        ("text/html", False, "json"),
+        (TABLE_MEDIA_TYPES["arrow"], True, "arrow"),
+        (TABLE_MEDIA_TYPES["arrow"], False, "arrow"),
+        (f"{TABLE_MEDIA_TYPES['arrow']}, application/json", False, "json"),
+        (f"{TABLE_MEDIA_TYPES['arrow']}, application/json", True, "arrow"),
+        (f"application/json;q=0.5, {TABLE_MEDIA_TYPES['parquet']}", True, "parquet"),
+        (f"{TABLE_MEDIA_TYPES['arrow']};q=0, */*", True, "json"),
+    ],
+)
+def test_accept_is_negotiated_in_order_of_preference(
+    monkeypatch, accept, available, expected
+):
+    """Accepted types are tried by preference, skipping the unavailable ones."""
+    monkeypatch.setattr(
+        "openbb_swaps.app.responses.pyarrow_available", lambda: available
+    )
+    negotiate_format.cache_clear()
+    try:
+        assert negotiate_format("json", accept) == expected
+        assert negotiate_format("ndjson", accept) == "ndjson"
+    finally:
+        negotiate_format.cache_clear()
+
+
+def test_unavailable_table_format_is_not_acceptable(client):
+    """Only accepting formats that cannot be written is answered with 406."""
+    url = ENDPOINTS[0]
+    accept = TABLE_MEDIA_TYPES["arrow"]
+    fallback = client.get(url, headers={"accept": f"{accept}, application/json"})
+    only = client.get(url, headers={"accept": accept})
+
+    assert fallback.status_code == 200
+    assert fallback.headers["content-type"] == "application/json"
+    if find_spec("pyarrow") is None:
+        assert only.status_code == 406
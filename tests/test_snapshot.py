@@ -0,0 +1,49 @@
+"""Tests of the memory-mapped snapshot."""
+
+import threading
+
+from openbb_swaps.data.ingest import ingest_files
+from openbb_swaps.data.snapshot import load_snapshot
+
+
+def test_release_while_mapping_is_safe(snapshot_dir):
+    """Sheets can be mapped by some threads while others release them."""
+    source = load_snapshot(snapshot_dir, snapshot_dir)
+    errors: list = []
+    stop = threading.Event()
+
+    def read():
+        try:
+            while not stop.is_set():
+                assert len(source.get_store("eur_swaps", "Interest Rates")) > 0
+        except Exception as e:  # pylint: disable=broad-except
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for _ in range(2000):
+        source.release("eur_swaps")
+    stop.set()
+    for reader in readers:
+        reader.join()
+
+    assert not errors
+
+
+def test_versions_release_their_own_columns(snapshot_dir, daily_files):
+    """Releasing the columns of a version keeps those adopted by the next one."""
+    old = load_snapshot(snapshot_dir, snapshot_dir)
+    old.get_store("usd_swaps", "Interest Rates")
+    old.get_store("eur_swaps", "Interest Rates")
+    ingest_files(daily_files, snapshot_dir)
+    new = load_snapshot(snapshot_dir, snapshot_dir)
+    # Compaction gives the USD sheets new files, so only unchanged sheets are reused.
+    new.manifest["stores"]["eur_swaps"] = old.manifest["stores"]["eur_swaps"]
+
+    new.adopt_columns(old)
+    old.release("eur_swaps")
+
+    assert ("eur_swaps", "Interest Rates") in new._columns
+    assert ("usd_swaps", "Interest Rates") not in new._columns
+    assert ("eur_swaps", "Interest Rates") not in old._columns
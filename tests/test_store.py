@@ -0,0 +1,129 @@
+"""Tests of the swaps data store caches over a snapshot."""
+
+import lzma
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+
+from openbb_swaps.data.ingest import ingest_files
+from openbb_swaps.data.snapshot import load_snapshot
+from openbb_swaps.data.store import (
+    PartitionedArchiveStore,
+    SwapsDataStore,
+    SwapsStoreHandle,
+    store_path,
+)
+
+
+def open_store(snapshot_dir, memory_budget: int = 0) -> SwapsDataStore:
+    """Open a store over the current version of a snapshot."""
+    source = load_snapshot(snapshot_dir, snapshot_dir)
+    return SwapsDataStore(
+        source, source.data_version, source.data_modified, memory_budget
+    )
+
+
+def test_extend_matches_a_fresh_store(snapshot_dir, daily_files):
+    """A store extended after an ingest serves the same data as a new one."""
+    store = open_store(snapshot_dir)
+    store.get_volume_cube("EUR")
+    store.get_rate_levels("EUR")
+    store.get_frame("EUR", "Trading Data")
+
+    ingest_files(daily_files, snapshot_dir)
+    source = load_snapshot(snapshot_dir, snapshot_dir)
+    extended = store.extend(source)
+    fresh = open_store(snapshot_dir)
+
+    assert extended.data_version == fresh.data_version != store.data_version
+    cube, expected = extended.get_volume_cube("EUR"), fresh.get_volume_cube("EUR")
+    numpy.testing.assert_array_equal(cube.dates, expected.dates)
+    numpy.testing.assert_array_equal(cube.notional, expected.notional)
+    numpy.testing.assert_array_equal(cube.trades, expected.trades)
+    assert extended.get_rate_levels("EUR").query("OIS", ["10"], "1m") == (
+        fresh.get_rate_levels("EUR").query("OIS", ["10"], "1m")
+    )
+
+
+def test_compacted_frames_are_memory_mapped(snapshot_dir, daily_files):
+    """After an ingest, sheets are served from their memory-mapped columns."""
+    ingest_files(daily_files, snapshot_dir)
+
+    frame = open_store(snapshot_dir).get_frame("USD", "Trading Data")
+
+    values = frame["spot_date"].to_numpy()
+    while values.base is not None and not isinstance(values, numpy.memmap):
+        values = values.base
+    assert isinstance(values, numpy.memmap)
+
+
+def test_archive_is_decompressed_once(monkeypatch):
+    """The archive fallback reads the workbook of each currency from one handle."""
+    opened: list = []
+    open_archive = lzma.open
+    monkeypatch.setattr(
+        lzma,
+        "open",
+        lambda *args, **kwargs: opened.append(args[0]) or open_archive(*args, **kwargs),
+    )
+    source = PartitionedArchiveStore(str(store_path))
+
+    for name in ["usd_swaps", "eur_swaps"]:
+        assert len(source.get_store(name, sheet_name="Trading Data")) > 0
+
+    assert len(opened) == 1
+
+
+def test_eviction_while_a_partition_builds(snapshot_dir, monkeypatch):
+    """A partition evicted while another builds is reloaded, and builds run once."""
+    store = open_store(snapshot_dir, memory_budget=1)
+    usd = store.get_frame("USD", "Trading Data")
+    started, proceed = threading.Event(), threading.Event()
+    get_store = store.source.get_store
+
+    def blocking_get_store(name, sheet_name=None):
+        if name == "eur_swaps":
+            started.set()
+            proceed.wait(10)
+        return get_store(name, sheet_name=sheet_name)
+
+    monkeypatch.setattr(store.source, "get_store", blocking_get_store)
+    with ThreadPoolExecutor(2) as pool:
+        builds = [pool.submit(store.get_frame, "EUR", "Trading Data") for _ in range(2)]
+        assert started.wait(10)
+        # Served while EUR builds, then evicted when EUR is admitted.
+        store.get_frame("USD", "Interest Rates")
+        proceed.set()
+        eur = [build.result() for build in builds]
+
+    assert store.misses == 3
+    assert store.evictions == 1
+    assert {key[1] for key in store.cache_keys()} == {"EUR"}
+    assert eur[0].equals(eur[1])
+    assert eur[0].equals(open_store(snapshot_dir).get_frame("EUR", "Trading Data"))
+    assert store.get_frame("USD", "Trading Data").equals(usd)
+
+
+def test_reload_while_a_lease_is_held(snapshot_dir, daily_files, monkeypatch):
+    """A lease keeps its version through a reload, and it is reclaimed on release."""
+    monkeypatch.setattr("openbb_swaps.data.store.snapshot_path", snapshot_dir)
+    handle = SwapsStoreHandle(open_store(snapshot_dir))
+    leased = handle.acquire()
+    rows = len(leased.get_frame("EUR", "Trading Data"))
+
+    ingest_files(daily_files, snapshot_dir)
+    assert handle.reload()
+    assert not handle.reload()
+
+    current = handle.current
+    assert current is not leased
+    assert current.data_version != leased.data_version
+    assert handle.stats()["retired"] == 1
+    assert len(leased.get_frame("EUR", "Trading Data")) == rows
+    assert len(current.get_frame("EUR", "Trading Data")) > rows
+
+    handle.release(leased)
+    assert handle.stats()["retired"] == 0
+    assert not leased.cache_keys()
+    assert current.cache_keys()
@@ -0,0 +1,57 @@
+"""Tests of the synthetic data and the sheets built from trades."""
+
+from numpy.random import default_rng
+
+from openbb_swaps.data.ingest import (
+    CURVE_TENORS,
+    TENOR_TOLERANCE,
+    flag_outliers,
+    rates_sheet,
+)
+from openbb_swaps.data.synthetic import (
+    business_days,
+    curve_factors,
+    synthetic_sheets,
+    synthetic_trades,
+)
+
+
+def test_trade_days_beyond_the_dates_keep_every_day():
+    """The trades sheet keeps every day when `trade_days` exceeds the dates."""
+    rng = default_rng(0)
+    dates = business_days("2025-04-15", 0.05)
+    factors = curve_factors("EUR", len(dates), rng)
+    sheets = synthetic_sheets("EUR", dates, factors, 20, len(dates) + 10, rng)
+    trades = sheets["Trades and Pricing Curve"]
+
+    assert trades["spot_date"].min() == dates[0]
+
+
+def test_rates_are_the_median_strikes_of_each_tenor():
+    """The rates of a day are the median strikes of the trades near each tenor."""
+    rng = default_rng(0)
+    dates = business_days("2025-04-15", 0.05)
+    trades = flag_outliers(
+        synthetic_trades(
+            "USD", dates, curve_factors("USD", len(dates), rng), 200, rng, 0.3
+        )
+    )
+    rates = rates_sheet(trades).set_index(["swap.type", "curve_date", "metric"])
+    priced = trades[
+        trades["cleared"] & ~trades["forward_starting"] & (trades["outlier"] == 0)
+    ]
+
+    expected = {}
+    for (swap_type, date), rows in priced.groupby(["swap.type", "spot_date"]):
+        for tenor in CURVE_TENORS:
+            near = (rows["time.to.mat"] - float(tenor)).abs() <= TENOR_TOLERANCE
+            if near.any():
+                expected[(swap_type, date, tenor)] = rows.loc[near, "strike"].median()
+        if (swap_type, date, "2") in expected and (swap_type, date, "10") in expected:
+            expected[(swap_type, date, "2s10s")] = (
+                expected[(swap_type, date, "10")] - expected[(swap_type, date, "2")]
+            )
+
+    assert expected
+    for key, rate in expected.items():
+        assert rates.loc[key, "rate"] == rate